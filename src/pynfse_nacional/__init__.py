@@ -5,6 +5,8 @@ This library provides tools for integrating with the NFSe Nacional (Padrao Nacio
 API for electronic service invoice issuance in Brazil.
 """
 
+from importlib.util import find_spec
+
 from .client import (
     NFSeClient,
     RawNFSeRecoveryResponse,
@@ -63,23 +65,37 @@ from .utils import (
     format_cpf,
     normalize_document,
     validate_cnpj,
+    validate_cnpj_batch,
     validate_cpf,
 )
 
-# PDF generation (optional dependency)
-try:
-    from . import pdf_generator as _pdf_generator
+# PDF generation (optional dependency). pdf_generator pulls in ReportLab, so it
+# is only imported the first time one of its names is accessed.
+_PDF_EXPORTS = (
+    "HeaderConfig",
+    "NFSeData",
+    "parse_nfse_xml",
+    "generate_danfse_pdf",
+    "generate_danfse_from_xml",
+    "generate_danfse_from_base64",
+    "generate_danfse_batch",
+)
+
+_PDF_AVAILABLE = find_spec("reportlab") is not None and (
+    find_spec("segno") is not None or find_spec("qrcode") is not None
+)
+
+
+def __getattr__(name: str):
+    if _PDF_AVAILABLE and name in _PDF_EXPORTS:
+        from . import pdf_generator
+
+        value = getattr(pdf_generator, name)
+        globals()[name] = value
+        return value
 
-    HeaderConfig = _pdf_generator.HeaderConfig
-    NFSeData = _pdf_generator.NFSeData
-    parse_nfse_xml = _pdf_generator.parse_nfse_xml
-    generate_danfse_pdf = _pdf_generator.generate_danfse_pdf
-    generate_danfse_from_xml = _pdf_generator.generate_danfse_from_xml
-    generate_danfse_from_base64 = _pdf_generator.generate_danfse_from_base64
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-    _PDF_AVAILABLE = True
-except ImportError:
-    _PDF_AVAILABLE = False
 
 __version__ = "0.9.5"
 
@@ -134,6 +150,7 @@ __all__ = [
     "decode_decompress",
     "decode_and_decompress",
     "validate_cnpj",
+    "validate_cnpj_batch",
     "validate_cpf",
     "format_cnpj",
     "format_cpf",
@@ -143,13 +160,4 @@ __all__ = [
 
 # Add PDF exports if available
 if _PDF_AVAILABLE:
-    __all__.extend(
-        [
-            "HeaderConfig",
-            "NFSeData",
-            "parse_nfse_xml",
-            "generate_danfse_pdf",
-            "generate_danfse_from_xml",
-            "generate_danfse_from_base64",
-        ]
-    )
+    __all__.extend(_PDF_EXPORTS)
@@ -36,6 +36,7 @@ from .utils import (
 )
 from .xml_builder import XMLBuilder
 from .xml_signer import XMLSignerService
+from .xml_signer import _load_pkcs12 as _load_pkcs12_bundle
 
 _CHAVE_RE = CHAVE_ACESSO_RE
 _ID_DPS_RE = re.compile(r"^DPS\d{42}$")
@@ -639,7 +640,6 @@ try:
         Encoding,
         NoEncryption,
         PrivateFormat,
-        pkcs12,
     )
 
     CRYPTOGRAPHY_AVAILABLE = True
@@ -704,11 +704,9 @@ class NFSeClient:
                     code=ErrorCode.CERTIFICATE_FILE_NOT_FOUND,
                 )
 
-            with open(cert_path, "rb") as f:
-                pkcs12_data = f.read()
-
-            self._private_key, self._certificate, _ = pkcs12.load_key_and_certificates(
-                pkcs12_data, self.cert_password.encode()
+            # Shared with XMLSignerService, so the bundle is decrypted once.
+            self._private_key, self._certificate = _load_pkcs12_bundle(
+                str(cert_path), self.cert_password
             )
 
             if self._private_key is None:
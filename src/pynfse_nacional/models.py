@@ -14,6 +14,7 @@ from typing import Literal, Optional
 from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
 
 from .models_ibscbs import IBSCBS
+from .utils import _cnpj_digits_valid, _cpf_digits_valid
 
 # Valid Brazilian UF codes
 VALID_UFS = {
@@ -46,39 +47,25 @@ VALID_UFS = {
     "TO",
 }
 
-
-def _validate_cpf_digits(cpf: str) -> bool:
-    """Validate CPF check digits."""
-
-    if len(cpf) != 11 or cpf == cpf[0] * 11:
-        return False
-
-    def calc_digit(cpf_partial: str, weights: list[int]) -> int:
-        total = sum(int(d) * w for d, w in zip(cpf_partial, weights))
-        remainder = total % 11
-        return 0 if remainder < 2 else 11 - remainder
-
-    d1 = calc_digit(cpf[:9], [10, 9, 8, 7, 6, 5, 4, 3, 2])
-    d2 = calc_digit(cpf[:10], [11, 10, 9, 8, 7, 6, 5, 4, 3, 2])
-
-    return cpf[-2:] == f"{d1}{d2}"
-
-
-def _validate_cnpj_digits(cnpj: str) -> bool:
-    """Validate CNPJ check digits."""
-
-    if len(cnpj) != 14 or cnpj == cnpj[0] * 14:
-        return False
-
-    def calc_digit(cnpj_partial: str, weights: list[int]) -> int:
-        total = sum(int(d) * w for d, w in zip(cnpj_partial, weights))
-        remainder = total % 11
-        return 0 if remainder < 2 else 11 - remainder
-
-    d1 = calc_digit(cnpj[:12], [5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2])
-    d2 = calc_digit(cnpj[:13], [6, 5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2])
-
-    return cnpj[-2:] == f"{d1}{d2}"
+_CEP_CPF_PUNCTUATION = re.compile(r"[.\-]")
+_CNPJ_PUNCTUATION = re.compile(r"[.\-/]")
+_FONE_PUNCTUATION = re.compile(r"[+\-() ]")
+_CEP_PATTERN = re.compile(r"^[0-9]{8}$")
+_CPF_PATTERN = re.compile(r"^[0-9]{11}$")
+_CNPJ_PATTERN = re.compile(r"^[0-9]{14}$")
+_FONE_PATTERN = re.compile(r"^[0-9]{6,20}$")
+_LC116_PATTERN = re.compile(r"^\d{1,2}\.\d{2}\.\d{2}$")
+_LC116_DIGITS_PATTERN = re.compile(r"^\d{6}$")
+_LC116_ITEM_PATTERN = re.compile(r"^\d{1,2}\.\d{2}$")
+_LC116_ITEM_DIGITS_PATTERN = re.compile(r"^\d{3,4}$")
+_NBS_PATTERN = re.compile(r"^[0-9]{9}$")
+_CHAVE_NFSE_PATTERN = re.compile(r"^[0-9]{50}$")
+_ID_DPS_PATTERN = re.compile(r"^DPS[0-9]{42}$")
+_COMPETENCIA_PATTERN = re.compile(r"^\d{4}-(0[1-9]|1[0-2])$")
+
+_REGIMES_TRIBUTARIOS = frozenset(
+    {"simples_nacional", "simples_excesso", "normal", "mei"}
+)
 
 
 class Endereco(BaseModel):
@@ -123,9 +110,9 @@ class Endereco(BaseModel):
     def validate_cep(cls, v: str) -> str:
         """Valida CEP (8 digitos)."""
 
-        cep_clean = re.sub(r"[.\-]", "", v)
+        cep_clean = _CEP_CPF_PUNCTUATION.sub("", v)
 
-        if not re.match(r"^[0-9]{8}$", cep_clean):
+        if not _CEP_PATTERN.match(cep_clean):
             raise ValueError("CEP deve conter 8 dígitos numéricos.")
 
         return cep_clean
@@ -155,12 +142,12 @@ class Prestador(BaseModel):
     def validate_cnpj(cls, v: str) -> str:
         """Valida CNPJ (14 digitos com digitos verificadores)."""
 
-        cnpj_clean = re.sub(r"[.\-/]", "", v)
+        cnpj_clean = _CNPJ_PUNCTUATION.sub("", v)
 
-        if not re.match(r"^[0-9]{14}$", cnpj_clean):
+        if not _CNPJ_PATTERN.match(cnpj_clean):
             raise ValueError("CNPJ deve conter 14 dígitos numéricos.")
 
-        if not _validate_cnpj_digits(cnpj_clean):
+        if not _cnpj_digits_valid(cnpj_clean):
             raise ValueError("CNPJ inválido (dígitos verificadores incorretos).")
 
         return cnpj_clean
@@ -173,9 +160,9 @@ class Prestador(BaseModel):
         if v is None:
             return v
 
-        tel_clean = re.sub(r"[+\-() ]", "", v)
+        tel_clean = _FONE_PUNCTUATION.sub("", v)
 
-        if not re.match(r"^[0-9]{6,20}$", tel_clean):
+        if not _FONE_PATTERN.match(tel_clean):
             raise ValueError("Telefone deve conter entre 6 e 20 dígitos.")
 
         return tel_clean
@@ -199,12 +186,12 @@ class Tomador(BaseModel):
         if v is None:
             return v
 
-        cpf_clean = re.sub(r"[.\-]", "", v)
+        cpf_clean = _CEP_CPF_PUNCTUATION.sub("", v)
 
-        if not re.match(r"^[0-9]{11}$", cpf_clean):
+        if not _CPF_PATTERN.match(cpf_clean):
             raise ValueError("CPF deve conter 11 dígitos numéricos.")
 
-        if not _validate_cpf_digits(cpf_clean):
+        if not _cpf_digits_valid(cpf_clean):
             raise ValueError("CPF inválido (dígitos verificadores incorretos).")
 
         return cpf_clean
@@ -217,12 +204,12 @@ class Tomador(BaseModel):
         if v is None:
             return v
 
-        cnpj_clean = re.sub(r"[.\-/]", "", v)
+        cnpj_clean = _CNPJ_PUNCTUATION.sub("", v)
 
-        if not re.match(r"^[0-9]{14}$", cnpj_clean):
+        if not _CNPJ_PATTERN.match(cnpj_clean):
             raise ValueError("CNPJ deve conter 14 dígitos numéricos.")
 
-        if not _validate_cnpj_digits(cnpj_clean):
+        if not _cnpj_digits_valid(cnpj_clean):
             raise ValueError("CNPJ inválido (dígitos verificadores incorretos).")
 
         return cnpj_clean
@@ -235,9 +222,9 @@ class Tomador(BaseModel):
         if v is None:
             return v
 
-        tel_clean = re.sub(r"[+\-() ]", "", v)
+        tel_clean = _FONE_PUNCTUATION.sub("", v)
 
-        if not re.match(r"^[0-9]{6,20}$", tel_clean):
+        if not _FONE_PATTERN.match(tel_clean):
             raise ValueError("Telefone deve conter entre 6 e 20 dígitos.")
 
         return tel_clean
@@ -309,7 +296,7 @@ class Servico(BaseModel):
 
         code_clean = v.replace(".", "")
 
-        if re.match(r"^\d{1,2}\.\d{2}$", v) or re.match(r"^\d{3,4}$", code_clean):
+        if _LC116_ITEM_PATTERN.match(v) or _LC116_ITEM_DIGITS_PATTERN.match(code_clean):
             raise ValueError(
                 "codigo_lc116 deve incluir o subitem completo "
                 f"(ex: '04.03.01'), recebido: '{v}'. "
@@ -317,8 +304,8 @@ class Servico(BaseModel):
                 "Consulte a lista de serviços em: https://www.gov.br/nfse/pt-br/biblioteca/documentacao-tecnica/"
             )
 
-        if not re.match(r"^\d{1,2}\.\d{2}\.\d{2}$", v):
-            if re.match(r"^\d{6}$", code_clean):
+        if not _LC116_PATTERN.match(v):
+            if _LC116_DIGITS_PATTERN.match(code_clean):
                 return v
 
             raise ValueError(
@@ -337,7 +324,7 @@ class Servico(BaseModel):
 
         nbs_clean = v.replace(".", "")
 
-        if not re.match(r"^[0-9]{9}$", nbs_clean):
+        if not _NBS_PATTERN.match(nbs_clean):
             raise ValueError("codigo_nbs deve conter 9 dígitos.")
 
         return v
@@ -382,7 +369,7 @@ class SubstituicaoNFSe(BaseModel):
     def validate_chave_nfse(cls, v: str) -> str:
         """Valida chave de acesso da NFSe (50 digitos)."""
 
-        if not re.match(r"^[0-9]{50}$", v):
+        if not _CHAVE_NFSE_PATTERN.match(v):
             raise ValueError("chave_nfse_substituida deve conter 50 dígitos numéricos.")
 
         return v
@@ -439,7 +426,8 @@ class DPS(BaseModel):
     def validate_serie(cls, v: str) -> str:
         """Valida serie (1-5 digitos numericos)."""
 
-        if not re.match(r"^0{0,4}\d{1,5}$", v):
+        # TSSerieDPS: at most 5 characters, all digits.
+        if not (1 <= len(v) <= 5 and v.isascii() and v.isdigit()):
             raise ValueError("serie deve ser numérica (1-5 dígitos).")
 
         return v
@@ -452,7 +440,7 @@ class DPS(BaseModel):
         if v is None:
             return v
 
-        if not re.match(r"^DPS[0-9]{42}$", v):
+        if not _ID_DPS_PATTERN.match(v):
             raise ValueError("id_dps deve seguir o padrão 'DPS' + 42 dígitos.")
 
         return v
@@ -477,7 +465,7 @@ class DPS(BaseModel):
     def validate_competencia(cls, v: str) -> str:
         """Valida competencia (formato YYYY-MM)."""
 
-        if not re.match(r"^\d{4}-(0[1-9]|1[0-2])$", v):
+        if not _COMPETENCIA_PATTERN.match(v):
             raise ValueError(
                 "competência deve estar no formato YYYY-MM "
                 f"(ex: '2026-01'), recebido: '{v}'."
@@ -490,12 +478,10 @@ class DPS(BaseModel):
     def validate_regime_tributario(cls, v: str) -> str:
         """Valida regime tributario."""
 
-        valid_regimes = {"simples_nacional", "simples_excesso", "normal", "mei"}
-
-        if v not in valid_regimes:
+        if v not in _REGIMES_TRIBUTARIOS:
             raise ValueError(
                 f"regime_tributário inválido: '{v}'. "
-                f"Use um dos valores: {', '.join(sorted(valid_regimes))}"
+                f"Use um dos valores: {', '.join(sorted(_REGIMES_TRIBUTARIOS))}"
             )
 
         return v
@@ -7,11 +7,13 @@ following the official layout pattern.
 
 import io
 import re
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime
 from decimal import Decimal, InvalidOperation
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Sequence
 from xml.etree import ElementTree as ET
 from xml.sax.saxutils import escape
 
@@ -43,12 +45,23 @@ except ImportError:
         "Instale com: pip install pynfse-nacional[pdf]"
     )
 
+# segno encodes the QR PNG itself; qrcode renders it through Pillow. ReportLab
+# still needs Pillow to embed the PNG, so this only speeds up the encoding step.
+try:
+    import segno
+except ImportError:
+    segno = None
+
 try:
     import qrcode
 except ImportError:
+    qrcode = None
+
+if segno is None and qrcode is None:
     raise ImportError(
-        "O pacote qrcode é obrigatório para geração de PDF. "
-        "Instale com: pip install pynfse-nacional[pdf]"
+        "O pacote segno ou qrcode é obrigatório para geração de PDF. "
+        "Instale com: pip install pynfse-nacional[pdf] "
+        "(ou pynfse-nacional[pdf,segno])"
     )
 
 
@@ -58,7 +71,7 @@ NFSE_PORTAL_URL = "https://www.nfse.gov.br/ConsultaPublica"
 NFSE_QR_URL = "https://www.nfse.gov.br/ConsultaPublica/?tpc=1&chave={chave}"
 
 
-@dataclass
+@dataclass(slots=True)
 class HeaderConfig:
     """Configuration for custom header in DANFSE PDF."""
 
@@ -72,7 +85,7 @@ class HeaderConfig:
         return bool(self.image_path or self.title)
 
 
-@dataclass
+@dataclass(slots=True)
 class NFSeData:
     """Parsed NFSe data for PDF generation."""
 
@@ -170,7 +183,7 @@ class NFSeData:
     ibscbs_totals: Optional["IBSCBSTotals"] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class IBSCBSTotals:
     """Parsed IBSCBS totalizer values from the response XML."""
 
@@ -184,6 +197,126 @@ class IBSCBSTotals:
 # XML namespace
 NS = {"nfse": "http://www.sped.fazenda.gov.br/nfse"}
 
+# Table styles are plain command lists that ReportLab only reads while
+# applying them, so every DANFSe shares the same instances.
+_GRID_COMMANDS = (
+    ("BOX", (0, 0), (-1, -1), 0.5, colors.black),
+    ("INNERGRID", (0, 0), (-1, -1), 0.25, colors.grey),
+    ("TOPPADDING", (0, 0), (-1, -1), 0.5 * mm),
+    ("BOTTOMPADDING", (0, 0), (-1, -1), 0.5 * mm),
+    ("LEFTPADDING", (0, 0), (-1, -1), 1 * mm),
+)
+_FIELD_COMMANDS = (*_GRID_COMMANDS, ("VALIGN", (0, 0), (-1, -1), "TOP"))
+
+_HEADER_TABLE_STYLE = TableStyle(
+    [
+        ("VALIGN", (0, 0), (-1, -1), "TOP"),
+        ("ALIGN", (1, 0), (1, 0), "CENTER"),
+        ("ALIGN", (2, 0), (2, 0), "RIGHT"),
+    ]
+)
+_CHAVE_TABLE_STYLE = TableStyle(list(_GRID_COMMANDS))
+_FIELD_TABLE_STYLE = TableStyle(list(_FIELD_COMMANDS))
+_EMIT_TABLE_STYLE = TableStyle(
+    [
+        *_FIELD_COMMANDS,
+        ("SPAN", (0, 1), (1, 1)),
+        ("SPAN", (2, 1), (3, 1)),
+        ("SPAN", (0, 2), (1, 2)),
+        ("SPAN", (0, 3), (1, 3)),
+        ("SPAN", (2, 3), (3, 3)),
+    ]
+)
+_TOMA_TABLE_STYLE = TableStyle([*_FIELD_COMMANDS, ("SPAN", (1, 1), (2, 1))])
+_SERV_TABLE_STYLE = TableStyle([*_FIELD_COMMANDS, ("SPAN", (0, 1), (3, 1))])
+_INFO_TABLE_STYLE = TableStyle([cmd for cmd in _GRID_COMMANDS if cmd[0] != "INNERGRID"])
+
+# Column widths for the 196 mm content area (A4 minus 7 mm margins).
+_HEADER_COL_WIDTHS = (35 * mm, 95 * mm, 66 * mm)
+_FULL_COL_WIDTHS = (196 * mm,)
+_THREE_COL_WIDTHS = (65 * mm, 65 * mm, 66 * mm)
+_FOUR_COL_WIDTHS = (49 * mm,) * 4
+
+# Placeholder for cells covered by a SPAN.
+_EMPTY = ""
+
+# Compact styles for single-page A4, built once per process.
+_SAMPLE_STYLES = getSampleStyleSheet()
+
+_STYLE_TITLE = ParagraphStyle(
+    "Title",
+    parent=_SAMPLE_STYLES["Heading1"],
+    fontSize=11,
+    alignment=1,
+    spaceAfter=0,
+    spaceBefore=0,
+    leading=12,
+)
+
+_STYLE_HEADER_RIGHT = ParagraphStyle(
+    "HeaderRight",
+    parent=_SAMPLE_STYLES["Normal"],
+    fontSize=6,
+    alignment=2,
+    leading=8,
+)
+
+_STYLE_SECTION = ParagraphStyle(
+    "Section",
+    parent=_SAMPLE_STYLES["Heading2"],
+    fontSize=7,
+    fontName="Helvetica-Bold",
+    backColor=colors.lightgrey,
+    spaceBefore=1 * mm,
+    spaceAfter=0,
+    leftIndent=1 * mm,
+    leading=9,
+)
+
+_STYLE_SMALL = ParagraphStyle(
+    "Small",
+    parent=_SAMPLE_STYLES["Normal"],
+    fontSize=5,
+    leading=6,
+)
+
+_STYLE_CHAVE = ParagraphStyle(
+    "Chave",
+    parent=_SAMPLE_STYLES["Normal"],
+    fontSize=6,
+    fontName="Courier",
+    leading=7,
+)
+
+_STYLE_LABEL = ParagraphStyle(
+    "Label",
+    parent=_SAMPLE_STYLES["Normal"],
+    fontSize=5,
+    fontName="Helvetica-Bold",
+    textColor=colors.darkgrey,
+    leading=6,
+)
+
+_STYLE_VALUE = ParagraphStyle(
+    "Value",
+    parent=_SAMPLE_STYLES["Normal"],
+    fontSize=7,
+    leading=8,
+)
+
+
+@lru_cache(maxsize=256)
+def _label_frags(label: str) -> list:
+    """Parse a field label's markup once; labels are fixed strings."""
+
+    return Paragraph(f"<b>{label}</b>", _STYLE_LABEL).frags
+
+
+def _label_paragraph(label: str) -> Paragraph:
+    # Fresh Paragraph per cell (layout state lives on the instance), but the
+    # parsed fragments are shared.
+    return Paragraph(f"<b>{label}</b>", _STYLE_LABEL, frags=_label_frags(label))
+
 
 def _get_text(element: Optional[ET.Element], path: str, default: str = "") -> str:
     """Get text from XML element with namespace handling."""
@@ -211,10 +344,21 @@ def _format_datetime(dt_str: str) -> str:
     if not dt_str:
         return ""
 
+    # SEFIN emits YYYY-MM-DDTHH:MM:SS followed by -03:00 or Z; reorder the
+    # slices directly for those shapes.
+    has_offset = len(dt_str) == 25 and dt_str[-3] == ":"
+    is_utc = len(dt_str) == 20 and dt_str[-1] == "Z"
+
+    if (
+        (has_offset or is_utc)
+        and dt_str[4] == dt_str[7] == "-"
+        and dt_str[10] == "T"
+        and dt_str[13] == dt_str[16] == ":"
+    ):
+        return f"{dt_str[8:10]}/{dt_str[5:7]}/{dt_str[:4]} {dt_str[11:19]}"
+
     try:
-        # Handle timezone offset
-        dt_str = re.sub(r"([+-]\d{2}):(\d{2})$", r"\1\2", dt_str)
-        dt = datetime.fromisoformat(dt_str.replace("Z", "+0000"))
+        dt = datetime.fromisoformat(dt_str.replace("Z", "+00:00"))
         return dt.strftime("%d/%m/%Y %H:%M:%S")
     except (ValueError, TypeError):
         return dt_str
@@ -280,6 +424,47 @@ def _format_percent(value: Decimal | None) -> str:
         return "-"
 
 
+@dataclass(slots=True)
+class _FormattedValues:
+    """Currency and percentage strings shown in the DANFSe value sections."""
+
+    valor_servico: str
+    bc_issqn: str
+    aliquota: str
+    issqn_apurado: str
+    desconto_cond: str
+    desconto_incond: str
+    irrf_cp_csll_retidos: str
+    valor_liquido: str
+
+
+def _format_values(nfse_data: "NFSeData") -> _FormattedValues:
+    """Format every monetary field of the DANFSe in a single pass."""
+
+    return _FormattedValues(
+        valor_servico=_format_currency(nfse_data.valor_servico),
+        bc_issqn=_format_currency(nfse_data.bc_issqn),
+        aliquota=f"{nfse_data.aliquota}%" if nfse_data.aliquota else "-",
+        issqn_apurado=_format_currency(nfse_data.issqn_apurado),
+        desconto_cond=(
+            _format_currency(nfse_data.desconto_cond)
+            if nfse_data.desconto_cond
+            else "R$"
+        ),
+        desconto_incond=(
+            _format_currency(nfse_data.desconto_incond)
+            if nfse_data.desconto_incond
+            else "R$"
+        ),
+        irrf_cp_csll_retidos=(
+            _format_currency(nfse_data.irrf_cp_csll_retidos)
+            if nfse_data.irrf_cp_csll_retidos
+            else "R$ 0,00"
+        ),
+        valor_liquido=_format_currency(nfse_data.valor_liquido),
+    )
+
+
 def _parse_decimal(value: str) -> Optional[Decimal]:
     """Parse a decimal string safely."""
 
@@ -360,6 +545,50 @@ def _get_retencao_issqn_desc(ret: str) -> str:
     return descs.get(ret, "-")
 
 
+# valores leaf tag -> (NFSeData field, optional description mapper)
+_DPS_VALORES_FIELDS = {
+    "vServ": ("valor_servico", None),
+    "tribISSQN": ("trib_issqn", _get_trib_issqn_desc),
+    "tpRetISSQN": ("retencao_issqn", _get_retencao_issqn_desc),
+}
+
+_NFSE_VALORES_FIELDS = {
+    "vBC": ("bc_issqn", None),
+    "pAliqAplic": ("aliquota", None),
+    "vISSQN": ("issqn_apurado", None),
+    "vLiq": ("valor_liquido", None),
+}
+
+
+def _collect_valores(valores: ET.Element, fields: dict, data: NFSeData) -> None:
+    """Fill NFSeData from a valores subtree in a single walk.
+
+    Only the first occurrence of each tag is used, matching ``find`` order.
+    Mapped fields whose tag is missing get their mapper's default.
+    """
+
+    seen = set()
+
+    for el in valores.iter():
+        if not isinstance(el.tag, str):
+            continue
+
+        tag = el.tag.rsplit("}", 1)[-1]
+        field = fields.get(tag)
+
+        if field is None or tag in seen:
+            continue
+
+        seen.add(tag)
+        attr, describe = field
+        value = el.text.strip() if el.text else ""
+        setattr(data, attr, describe(value) if describe else value)
+
+    for tag, (attr, describe) in fields.items():
+        if describe and tag not in seen:
+            setattr(data, attr, describe(""))
+
+
 def _parse_ibscbs_totals(inf_nfse: ET.Element) -> Optional[IBSCBSTotals]:
     """Extract the IBSCBS totalizers when the XML includes them."""
 
@@ -589,42 +818,10 @@ def parse_nfse_xml(xml_content: str) -> NFSeData:
                         data.local_prestacao = c_loc
 
             # Valores
-            valores = inf_dps.find(".//nfse:valores", NS)
-
-            if valores is None:
-                valores = inf_dps.find(
-                    ".//{http://www.sped.fazenda.gov.br/nfse}valores"
-                )
+            valores = inf_dps.find("nfse:valores", NS)
 
             if valores is not None:
-                v_serv_prest = valores.find(".//nfse:vServPrest", NS)
-
-                if v_serv_prest is None:
-                    v_serv_prest = valores.find(
-                        ".//{http://www.sped.fazenda.gov.br/nfse}vServPrest"
-                    )
-
-                if v_serv_prest is not None:
-                    data.valor_servico = _get_text(v_serv_prest, ".//nfse:vServ")
-
-                trib = valores.find(".//nfse:trib", NS)
-
-                if trib is None:
-                    trib = valores.find(".//{http://www.sped.fazenda.gov.br/nfse}trib")
-
-                if trib is not None:
-                    trib_mun = trib.find(".//nfse:tribMun", NS)
-
-                    if trib_mun is None:
-                        trib_mun = trib.find(
-                            ".//{http://www.sped.fazenda.gov.br/nfse}tribMun"
-                        )
-
-                    if trib_mun is not None:
-                        trib_issqn = _get_text(trib_mun, ".//nfse:tribISSQN")
-                        data.trib_issqn = _get_trib_issqn_desc(trib_issqn)
-                        tp_ret = _get_text(trib_mun, ".//nfse:tpRetISSQN")
-                        data.retencao_issqn = _get_retencao_issqn_desc(tp_ret)
+                _collect_valores(valores, _DPS_VALORES_FIELDS, data)
 
     # Emitente from infNFSe (more complete data)
     emit = inf_nfse.find(".//nfse:emit", NS)
@@ -670,17 +867,11 @@ def parse_nfse_xml(xml_content: str) -> NFSeData:
     if not data.local_prestacao:
         data.local_prestacao = _get_text(inf_nfse, ".//nfse:xLocPrestacao")
 
-    # Valores from infNFSe
-    valores_nfse = inf_nfse.find(".//nfse:valores", NS)
-
-    if valores_nfse is None:
-        valores_nfse = inf_nfse.find(".//{http://www.sped.fazenda.gov.br/nfse}valores")
+    # Valores from infNFSe (direct child; the DPS subtree has its own valores)
+    valores_nfse = inf_nfse.find("nfse:valores", NS)
 
     if valores_nfse is not None:
-        data.bc_issqn = _get_text(valores_nfse, ".//nfse:vBC")
-        data.aliquota = _get_text(valores_nfse, ".//nfse:pAliqAplic")
-        data.issqn_apurado = _get_text(valores_nfse, ".//nfse:vISSQN")
-        data.valor_liquido = _get_text(valores_nfse, ".//nfse:vLiq")
+        _collect_valores(valores_nfse, _NFSE_VALORES_FIELDS, data)
 
     # Set default value for valor_liquido if not set
     if not data.valor_liquido and data.valor_servico:
@@ -692,7 +883,22 @@ def parse_nfse_xml(xml_content: str) -> NFSeData:
 def _generate_qr_code(chave_acesso: str) -> io.BytesIO:
     """Generate QR code for NFSe validation."""
 
-    url = NFSE_QR_URL.format(chave=chave_acesso)
+    url = NFSE_QR_URL.replace("{chave}", chave_acesso)
+
+    if segno is not None:
+        # Encode the chave as its own segment: segno would otherwise put the
+        # whole URL in byte mode and pick a larger version than qrcode, whose
+        # optimizer switches the digits to numeric mode. Matching versions
+        # keeps the modules the same size in the fixed 20mm box.
+        prefix = NFSE_QR_URL.removesuffix("{chave}")
+        buffer = io.BytesIO()
+        segno.make([prefix, chave_acesso], error="m", boost_error=False).save(
+            buffer, kind="png", scale=3, border=1
+        )
+        buffer.seek(0)
+
+        return buffer
+
     qr = qrcode.QRCode(
         version=1,
         error_correction=qrcode.constants.ERROR_CORRECT_M,
@@ -714,7 +920,8 @@ def generate_danfse_pdf(
     nfse_data: NFSeData,
     output_path: Optional[str] = None,
     header_config: Optional[HeaderConfig] = None,
-) -> bytes:
+    return_bytes: bool = True,
+) -> Optional[bytes]:
     """
     Generate DANFSE PDF from NFSe data.
 
@@ -722,17 +929,20 @@ def generate_danfse_pdf(
         nfse_data: Parsed NFSe data
         output_path: Optional path to save PDF file
         header_config: Optional custom header configuration
+        return_bytes: When False and output_path is set, write the PDF straight
+            to disk without keeping an in-memory copy and return None
 
     Returns:
-        PDF content as bytes
+        PDF content as bytes, or None when streamed to output_path
     """
 
     if header_config is None:
         header_config = HeaderConfig()
 
-    buffer = io.BytesIO()
+    stream_to_file = bool(output_path) and not return_bytes
+    buffer = None if stream_to_file else io.BytesIO()
     doc = SimpleDocTemplate(
-        buffer,
+        str(output_path) if stream_to_file else buffer,
         pagesize=A4,
         rightMargin=7 * mm,
         leftMargin=7 * mm,
@@ -740,71 +950,8 @@ def generate_danfse_pdf(
         bottomMargin=7 * mm,
     )
 
-    styles = getSampleStyleSheet()
-
-    # Compact styles for single-page A4
-    style_title = ParagraphStyle(
-        "Title",
-        parent=styles["Heading1"],
-        fontSize=11,
-        alignment=1,
-        spaceAfter=0,
-        spaceBefore=0,
-        leading=12,
-    )
-
-    style_header_right = ParagraphStyle(
-        "HeaderRight",
-        parent=styles["Normal"],
-        fontSize=6,
-        alignment=2,
-        leading=8,
-    )
-
-    style_section = ParagraphStyle(
-        "Section",
-        parent=styles["Heading2"],
-        fontSize=7,
-        fontName="Helvetica-Bold",
-        backColor=colors.lightgrey,
-        spaceBefore=1 * mm,
-        spaceAfter=0,
-        leftIndent=1 * mm,
-        leading=9,
-    )
-
-    style_label = ParagraphStyle(
-        "Label",
-        parent=styles["Normal"],
-        fontSize=5,
-        fontName="Helvetica-Bold",
-        textColor=colors.darkgrey,
-        leading=6,
-    )
-
-    style_value = ParagraphStyle(
-        "Value",
-        parent=styles["Normal"],
-        fontSize=7,
-        leading=8,
-    )
-
-    style_small = ParagraphStyle(
-        "Small",
-        parent=styles["Normal"],
-        fontSize=5,
-        leading=6,
-    )
-
-    style_chave = ParagraphStyle(
-        "Chave",
-        parent=styles["Normal"],
-        fontSize=6,
-        fontName="Courier",
-        leading=7,
-    )
-
     elements = []
+    values = _format_values(nfse_data)
 
     # Generate QR code
     qr_buffer = _generate_qr_code(nfse_data.chave_acesso)
@@ -817,7 +964,7 @@ def generate_danfse_pdf(
         if header_config.image_path and Path(header_config.image_path).exists():
             header_img = Image(header_config.image_path, width=30 * mm, height=15 * mm)
         else:
-            header_img = Paragraph("", style_value)
+            header_img = Paragraph("", _STYLE_VALUE)
 
         header_right_text = f"""
         <b>{_escape_pdf_text(header_config.title)}</b><br/>
@@ -829,7 +976,7 @@ def generate_danfse_pdf(
         header_img = Paragraph(
             "<b>NFS</b><font size='6'>e</font><br/>"
             "<font size='6'>Nota Fiscal de<br/>Servico eletronica</font>",
-            style_value,
+            _STYLE_VALUE,
         )
         prefeitura = _escape_pdf_text(nfse_data.emit_municipio or "Manaus")
         header_right_text = f"""
@@ -837,7 +984,7 @@ def generate_danfse_pdf(
         Secretaria Municipal de Financas<br/>
         """
 
-    header_right = Paragraph(header_right_text, style_header_right)
+    header_right = Paragraph(header_right_text, _STYLE_HEADER_RIGHT)
 
     header_table = Table(
         [
@@ -845,7 +992,7 @@ def generate_danfse_pdf(
                 header_img,
                 Paragraph(
                     "<b>DANFSe v1.0</b><br/>Documento Auxiliar da NFS-e",
-                    style_title,
+                    _STYLE_TITLE,
                 ),
                 [
                     header_right,
@@ -854,23 +1001,15 @@ def generate_danfse_pdf(
                         "A autenticidade desta NFS-e pode ser verificada<br/>"
                         "pela leitura deste codigo QR ou pela consulta da<br/>"
                         "chave de acesso no portal nacional da NFS-e",
-                        style_small,
+                        _STYLE_SMALL,
                     ),
                 ],
             ]
         ],
-        colWidths=[35 * mm, 95 * mm, 66 * mm],
+        colWidths=_HEADER_COL_WIDTHS,
     )
 
-    header_table.setStyle(
-        TableStyle(
-            [
-                ("VALIGN", (0, 0), (-1, -1), "TOP"),
-                ("ALIGN", (1, 0), (1, 0), "CENTER"),
-                ("ALIGN", (2, 0), (2, 0), "RIGHT"),
-            ]
-        )
-    )
+    header_table.setStyle(_HEADER_TABLE_STYLE)
 
     elements.append(header_table)
     elements.append(Spacer(1, 1 * mm))
@@ -879,71 +1018,48 @@ def generate_danfse_pdf(
     chave_table = Table(
         [
             [
-                Paragraph("<b>Chave de Acesso da NFS-e</b>", style_label),
+                _label_paragraph("Chave de Acesso da NFS-e"),
             ],
             [
-                Paragraph(_escape_pdf_text(nfse_data.chave_acesso), style_chave),
+                Paragraph(_escape_pdf_text(nfse_data.chave_acesso), _STYLE_CHAVE),
             ],
         ],
-        colWidths=[196 * mm],
+        colWidths=_FULL_COL_WIDTHS,
     )
 
-    chave_table.setStyle(
-        TableStyle(
-            [
-                ("BOX", (0, 0), (-1, -1), 0.5, colors.black),
-                ("INNERGRID", (0, 0), (-1, -1), 0.25, colors.grey),
-                ("TOPPADDING", (0, 0), (-1, -1), 0.5 * mm),
-                ("BOTTOMPADDING", (0, 0), (-1, -1), 0.5 * mm),
-                ("LEFTPADDING", (0, 0), (-1, -1), 1 * mm),
-            ]
-        )
-    )
+    chave_table.setStyle(_CHAVE_TABLE_STYLE)
 
     elements.append(chave_table)
 
     # NFS-e / DPS identification
-    def make_field(label: str, value: str) -> list:
-        return [
-            Paragraph(f"<b>{label}</b>", style_label),
-            Paragraph(_escape_pdf_text(value), style_value),
-        ]
+    # Empty values fall back to "-" inside _escape_pdf_text.
+    def make_field(label: str, value: str) -> tuple:
+        return (
+            _label_paragraph(label),
+            Paragraph(_escape_pdf_text(value), _STYLE_VALUE),
+        )
 
-    id_data = [
-        [
+    id_data = (
+        (
             make_field("Numero da NFS-e", nfse_data.numero_nfse),
             make_field("Competencia da NFS-e", nfse_data.competencia),
             make_field("Data e Hora da emissao da NFS-e", nfse_data.data_hora_emissao),
-        ],
-        [
+        ),
+        (
             make_field("Numero da DPS", nfse_data.numero_dps),
             make_field("Serie da DPS", nfse_data.serie_dps),
             make_field("Data e Hora da emissao da DPS", nfse_data.data_hora_dps),
-        ],
-    ]
-
-    id_table = Table(
-        id_data,
-        colWidths=[65 * mm, 65 * mm, 66 * mm],
+        ),
     )
 
-    id_table.setStyle(
-        TableStyle(
-            [
-                ("BOX", (0, 0), (-1, -1), 0.5, colors.black),
-                ("INNERGRID", (0, 0), (-1, -1), 0.25, colors.grey),
-                ("TOPPADDING", (0, 0), (-1, -1), 0.5 * mm),
-                ("BOTTOMPADDING", (0, 0), (-1, -1), 0.5 * mm),
-                ("LEFTPADDING", (0, 0), (-1, -1), 1 * mm),
-                ("VALIGN", (0, 0), (-1, -1), "TOP"),
-            ]
-        )
-    )
+    id_table = Table(id_data, colWidths=_THREE_COL_WIDTHS)
+
+    id_table.setStyle(_FIELD_TABLE_STYLE)
 
     elements.append(id_table)
 
     # EMITENTE section
-    elements.append(Paragraph("EMITENTE DA NFS-e", style_section))
+    elements.append(Paragraph("EMITENTE DA NFS-e", _STYLE_SECTION))
 
     emit_doc = (
         format_cnpj(nfse_data.emit_cnpj)
@@ -951,22 +1067,22 @@ def generate_danfse_pdf(
         else format_cpf(nfse_data.emit_cpf)
     )
 
-    emit_data = [
-        [
+    emit_data = (
+        (
             make_field("Prestador do Servico", ""),
             make_field("CNPJ / CPF / NIF", emit_doc),
             make_field("Inscricao Municipal", nfse_data.emit_im.strip()),
             make_field("Telefone", nfse_data.emit_telefone),
-        ],
-        [
+        ),
+        (
             make_field("Nome / Nome Empresarial", nfse_data.emit_nome),
-            [],
+            _EMPTY,
             make_field("E-mail", nfse_data.emit_email),
-            [],
-        ],
-        [
+            _EMPTY,
+        ),
+        (
             make_field("Endereco", nfse_data.emit_endereco),
-            [],
+            _EMPTY,
             make_field(
                 "Municipio",
                 f"{nfse_data.emit_municipio} - {nfse_data.emit_uf}"
@@ -974,48 +1090,29 @@ def generate_danfse_pdf(
                 else nfse_data.emit_municipio,
             ),
             make_field("CEP", nfse_data.emit_cep),
-        ],
-        [
+        ),
+        (
             make_field(
                 "Simples Nacional na Data de Competencia",
                 nfse_data.emit_simples_nacional,
             ),
-            [],
+            _EMPTY,
             make_field(
                 "Regime de Apuracao Tributaria pelo SN",
                 nfse_data.emit_regime_apuracao,
             ),
-            [],
-        ],
-    ]
-
-    emit_table = Table(
-        emit_data,
-        colWidths=[49 * mm, 49 * mm, 49 * mm, 49 * mm],
+            _EMPTY,
+        ),
     )
 
-    emit_table.setStyle(
-        TableStyle(
-            [
-                ("BOX", (0, 0), (-1, -1), 0.5, colors.black),
-                ("INNERGRID", (0, 0), (-1, -1), 0.25, colors.grey),
-                ("TOPPADDING", (0, 0), (-1, -1), 0.5 * mm),
-                ("BOTTOMPADDING", (0, 0), (-1, -1), 0.5 * mm),
-                ("LEFTPADDING", (0, 0), (-1, -1), 1 * mm),
-                ("VALIGN", (0, 0), (-1, -1), "TOP"),
-                ("SPAN", (0, 1), (1, 1)),
-                ("SPAN", (2, 1), (3, 1)),
-                ("SPAN", (0, 2), (1, 2)),
-                ("SPAN", (0, 3), (1, 3)),
-                ("SPAN", (2, 3), (3, 3)),
-            ]
-        )
-    )
+    emit_table = Table(emit_data, colWidths=_FOUR_COL_WIDTHS)
+
+    emit_table.setStyle(_EMIT_TABLE_STYLE)
 
     elements.append(emit_table)
 
     # TOMADOR section
-    elements.append(Paragraph("TOMADOR DO SERVICO", style_section))
+    elements.append(Paragraph("TOMADOR DO SERVICO", _STYLE_SECTION))
 
     toma_doc = (
         format_cnpj(nfse_data.toma_cnpj)
@@ -1023,47 +1120,32 @@ def generate_danfse_pdf(
         else format_cpf(nfse_data.toma_cpf)
     )
 
-    toma_data = [
-        [
+    toma_data = (
+        (
             make_field("CNPJ / CPF / NIF", toma_doc),
             make_field("Inscricao Municipal", nfse_data.toma_im),
             make_field("Telefone", nfse_data.toma_telefone),
-        ],
-        [
+        ),
+        (
             make_field("Nome / Nome Empresarial", nfse_data.toma_nome),
             make_field("E-mail", nfse_data.toma_email),
-            [],
-        ],
-        [
-            make_field("Endereco", nfse_data.toma_endereco or "-"),
+            _EMPTY,
+        ),
+        (
+            make_field("Endereco", nfse_data.toma_endereco),
             make_field(
                 "Municipio",
                 f"{nfse_data.toma_municipio} - {nfse_data.toma_uf}"
                 if nfse_data.toma_municipio and nfse_data.toma_uf
-                else (nfse_data.toma_municipio or "-"),
+                else nfse_data.toma_municipio,
             ),
-            make_field("CEP", nfse_data.toma_cep or "-"),
-        ],
-    ]
-
-    toma_table = Table(
-        toma_data,
-        colWidths=[65 * mm, 65 * mm, 66 * mm],
+            make_field("CEP", nfse_data.toma_cep),
+        ),
     )
 
-    toma_table.setStyle(
-        TableStyle(
-            [
-                ("BOX", (0, 0), (-1, -1), 0.5, colors.black),
-                ("INNERGRID", (0, 0), (-1, -1), 0.25, colors.grey),
-                ("TOPPADDING", (0, 0), (-1, -1), 0.5 * mm),
-                ("BOTTOMPADDING", (0, 0), (-1, -1), 0.5 * mm),
-                ("LEFTPADDING", (0, 0), (-1, -1), 1 * mm),
-                ("VALIGN", (0, 0), (-1, -1), "TOP"),
-                ("SPAN", (1, 1), (2, 1)),
-            ]
-        )
-    )
+    toma_table = Table(toma_data, colWidths=_THREE_COL_WIDTHS)
+
+    toma_table.setStyle(_TOMA_TABLE_STYLE)
 
     elements.append(toma_table)
 
@@ -1071,12 +1153,12 @@ def generate_danfse_pdf(
     elements.append(
         Paragraph(
             "INTERMEDIARIO DO SERVICO NAO IDENTIFICADO NA NFS-e",
-            style_section,
+            _STYLE_SECTION,
         )
     )
 
     # SERVICO section
-    elements.append(Paragraph("SERVICO PRESTADO", style_section))
+    elements.append(Paragraph("SERVICO PRESTADO", _STYLE_SECTION))
 
     # Format tributacao codes
     cod_trib_nac_fmt = nfse_data.cod_trib_nac
@@ -1086,266 +1168,151 @@ def generate_danfse_pdf(
             f"{cod_trib_nac_fmt[:2]}.{cod_trib_nac_fmt[2:4]}.{cod_trib_nac_fmt[4:]}"
         )
 
-    serv_data = [
-        [
+    serv_data = (
+        (
             make_field("Codigo de Tributacao Nacional", cod_trib_nac_fmt),
             make_field("Codigo de Tributacao Municipal", nfse_data.cod_trib_mun),
             make_field("Local da Prestacao", nfse_data.local_prestacao),
-            make_field("Pais da Prestacao", nfse_data.pais_prestacao or "-"),
-        ],
-        [
+            make_field("Pais da Prestacao", nfse_data.pais_prestacao),
+        ),
+        (
             make_field("Descricao do Servico", nfse_data.descricao_servico),
-            [],
-            [],
-            [],
-        ],
-    ]
-
-    serv_table = Table(
-        serv_data,
-        colWidths=[49 * mm, 49 * mm, 49 * mm, 49 * mm],
+            _EMPTY,
+            _EMPTY,
+            _EMPTY,
+        ),
     )
 
-    serv_table.setStyle(
-        TableStyle(
-            [
-                ("BOX", (0, 0), (-1, -1), 0.5, colors.black),
-                ("INNERGRID", (0, 0), (-1, -1), 0.25, colors.grey),
-                ("TOPPADDING", (0, 0), (-1, -1), 0.5 * mm),
-                ("BOTTOMPADDING", (0, 0), (-1, -1), 0.5 * mm),
-                ("LEFTPADDING", (0, 0), (-1, -1), 1 * mm),
-                ("VALIGN", (0, 0), (-1, -1), "TOP"),
-                ("SPAN", (0, 1), (3, 1)),
-            ]
-        )
-    )
+    serv_table = Table(serv_data, colWidths=_FOUR_COL_WIDTHS)
+
+    serv_table.setStyle(_SERV_TABLE_STYLE)
 
     elements.append(serv_table)
 
     # TRIBUTACAO MUNICIPAL section
-    elements.append(Paragraph("TRIBUTACAO MUNICIPAL", style_section))
+    elements.append(Paragraph("TRIBUTACAO MUNICIPAL", _STYLE_SECTION))
 
-    trib_mun_data = [
-        [
+    trib_mun_data = (
+        (
             make_field("Tributacao do ISSQN", nfse_data.trib_issqn),
-            make_field("Pais Resultado da Prestacao", nfse_data.pais_resultado or "-"),
+            make_field("Pais Resultado da Prestacao", nfse_data.pais_resultado),
             make_field("Municipio de Incidencia do ISSQN", nfse_data.mun_incidencia),
             make_field(
                 "Regime Especial de Tributacao", nfse_data.regime_especial or "Nenhum"
             ),
-        ],
-        [
-            make_field("Tipo de Imunidade", nfse_data.tipo_imunidade or "-"),
+        ),
+        (
+            make_field("Tipo de Imunidade", nfse_data.tipo_imunidade),
             make_field(
                 "Suspensao da Exigibilidade do ISSQN",
                 nfse_data.suspensao_issqn or "Nao",
             ),
-            make_field(
-                "Numero Processo Suspensao", nfse_data.num_processo_suspensao or "-"
-            ),
-            make_field("Beneficio Municipal", nfse_data.beneficio_municipal or "-"),
-        ],
-        [
-            make_field("Valor do Servico", _format_currency(nfse_data.valor_servico)),
-            make_field("Desconto Incondicionado", nfse_data.desconto_incond or "-"),
-            make_field("Total Deducoes/Reducoes", nfse_data.total_deducoes or "-"),
-            make_field("Calculo do BM", nfse_data.calculo_bm or "-"),
-        ],
-        [
-            make_field(
-                "BC ISSQN",
-                _format_currency(nfse_data.bc_issqn) if nfse_data.bc_issqn else "-",
-            ),
-            make_field(
-                "Aliquota Aplicada",
-                f"{nfse_data.aliquota}%" if nfse_data.aliquota else "-",
-            ),
+            make_field("Numero Processo Suspensao", nfse_data.num_processo_suspensao),
+            make_field("Beneficio Municipal", nfse_data.beneficio_municipal),
+        ),
+        (
+            make_field("Valor do Servico", values.valor_servico),
+            make_field("Desconto Incondicionado", nfse_data.desconto_incond),
+            make_field("Total Deducoes/Reducoes", nfse_data.total_deducoes),
+            make_field("Calculo do BM", nfse_data.calculo_bm),
+        ),
+        (
+            make_field("BC ISSQN", values.bc_issqn),
+            make_field("Aliquota Aplicada", values.aliquota),
             make_field("Retencao do ISSQN", nfse_data.retencao_issqn),
-            make_field(
-                "ISSQN Apurado",
-                _format_currency(nfse_data.issqn_apurado)
-                if nfse_data.issqn_apurado
-                else "-",
-            ),
-        ],
-    ]
-
-    trib_mun_table = Table(
-        trib_mun_data,
-        colWidths=[49 * mm, 49 * mm, 49 * mm, 49 * mm],
+            make_field("ISSQN Apurado", values.issqn_apurado),
+        ),
     )
 
-    trib_mun_table.setStyle(
-        TableStyle(
-            [
-                ("BOX", (0, 0), (-1, -1), 0.5, colors.black),
-                ("INNERGRID", (0, 0), (-1, -1), 0.25, colors.grey),
-                ("TOPPADDING", (0, 0), (-1, -1), 0.5 * mm),
-                ("BOTTOMPADDING", (0, 0), (-1, -1), 0.5 * mm),
-                ("LEFTPADDING", (0, 0), (-1, -1), 1 * mm),
-                ("VALIGN", (0, 0), (-1, -1), "TOP"),
-            ]
-        )
-    )
+    trib_mun_table = Table(trib_mun_data, colWidths=_FOUR_COL_WIDTHS)
+
+    trib_mun_table.setStyle(_FIELD_TABLE_STYLE)
 
     elements.append(trib_mun_table)
 
     ibscbs_totals_rows = _build_ibscbs_totals_rows(nfse_data)
 
     if ibscbs_totals_rows is not None:
-        elements.append(Paragraph("IBS/CBS TOTALIZADORES", style_section))
+        elements.append(Paragraph("IBS/CBS TOTALIZADORES", _STYLE_SECTION))
 
-        ibscbs_totals_data = [
-            [make_field(label, value) for label, value in row]
+        ibscbs_totals_data = tuple(
+            tuple(make_field(label, value) for label, value in row)
             for row in ibscbs_totals_rows
-        ]
-
-        ibscbs_totals_table = Table(
-            ibscbs_totals_data,
-            colWidths=[49 * mm, 49 * mm, 49 * mm, 49 * mm],
         )
 
-        ibscbs_totals_table.setStyle(
-            TableStyle(
-                [
-                    ("BOX", (0, 0), (-1, -1), 0.5, colors.black),
-                    ("INNERGRID", (0, 0), (-1, -1), 0.25, colors.grey),
-                    ("TOPPADDING", (0, 0), (-1, -1), 0.5 * mm),
-                    ("BOTTOMPADDING", (0, 0), (-1, -1), 0.5 * mm),
-                    ("LEFTPADDING", (0, 0), (-1, -1), 1 * mm),
-                    ("VALIGN", (0, 0), (-1, -1), "TOP"),
-                ]
-            )
-        )
+        ibscbs_totals_table = Table(ibscbs_totals_data, colWidths=_FOUR_COL_WIDTHS)
+
+        ibscbs_totals_table.setStyle(_FIELD_TABLE_STYLE)
 
         elements.append(ibscbs_totals_table)
 
     # TRIBUTACAO FEDERAL section
-    elements.append(Paragraph("TRIBUTACAO FEDERAL", style_section))
-
-    trib_fed_data = [
-        [
-            make_field("IRRF", nfse_data.irrf or "-"),
-            make_field("CP", nfse_data.cp or "-"),
-            make_field("CSLL", nfse_data.csll or "-"),
-            [],
-        ],
-        [
-            make_field("PIS", nfse_data.pis or "-"),
-            make_field("COFINS", nfse_data.cofins or "-"),
-            make_field("Retencao do PIS/COFINS", nfse_data.retencao_pis_cofins or "-"),
-            make_field("TOTAL TRIBUTACAO FEDERAL", nfse_data.total_trib_federal or "-"),
-        ],
-    ]
-
-    trib_fed_table = Table(
-        trib_fed_data,
-        colWidths=[49 * mm, 49 * mm, 49 * mm, 49 * mm],
+    elements.append(Paragraph("TRIBUTACAO FEDERAL", _STYLE_SECTION))
+
+    trib_fed_data = (
+        (
+            make_field("IRRF", nfse_data.irrf),
+            make_field("CP", nfse_data.cp),
+            make_field("CSLL", nfse_data.csll),
+            _EMPTY,
+        ),
+        (
+            make_field("PIS", nfse_data.pis),
+            make_field("COFINS", nfse_data.cofins),
+            make_field("Retencao do PIS/COFINS", nfse_data.retencao_pis_cofins),
+            make_field("TOTAL TRIBUTACAO FEDERAL", nfse_data.total_trib_federal),
+        ),
     )
 
-    trib_fed_table.setStyle(
-        TableStyle(
-            [
-                ("BOX", (0, 0), (-1, -1), 0.5, colors.black),
-                ("INNERGRID", (0, 0), (-1, -1), 0.25, colors.grey),
-                ("TOPPADDING", (0, 0), (-1, -1), 0.5 * mm),
-                ("BOTTOMPADDING", (0, 0), (-1, -1), 0.5 * mm),
-                ("LEFTPADDING", (0, 0), (-1, -1), 1 * mm),
-                ("VALIGN", (0, 0), (-1, -1), "TOP"),
-            ]
-        )
-    )
+    trib_fed_table = Table(trib_fed_data, colWidths=_FOUR_COL_WIDTHS)
+
+    trib_fed_table.setStyle(_FIELD_TABLE_STYLE)
 
     elements.append(trib_fed_table)
 
     # VALOR TOTAL section
-    elements.append(Paragraph("VALOR TOTAL DA NFS-E", style_section))
-
-    valor_total_data = [
-        [
-            make_field("Valor do Servico", _format_currency(nfse_data.valor_servico)),
-            make_field(
-                "Desconto Condicionado",
-                _format_currency(nfse_data.desconto_cond)
-                if nfse_data.desconto_cond
-                else "R$",
-            ),
-            make_field(
-                "Desconto Incondicionado",
-                _format_currency(nfse_data.desconto_incond)
-                if nfse_data.desconto_incond
-                else "R$",
-            ),
-            make_field("ISSQN Retido", nfse_data.issqn_retido or "-"),
-        ],
-        [
-            make_field(
-                "IRRF, CP, CSLL - Retidos",
-                _format_currency(nfse_data.irrf_cp_csll_retidos)
-                if nfse_data.irrf_cp_csll_retidos
-                else "R$ 0,00",
-            ),
-            make_field("PIS/COFINS Retidos", nfse_data.pis_cofins_retidos or "-"),
-            [],
-            make_field(
-                "Valor Liquido da NFS-e", _format_currency(nfse_data.valor_liquido)
-            ),
-        ],
-    ]
-
-    valor_total_table = Table(
-        valor_total_data,
-        colWidths=[49 * mm, 49 * mm, 49 * mm, 49 * mm],
+    elements.append(Paragraph("VALOR TOTAL DA NFS-E", _STYLE_SECTION))
+
+    valor_total_data = (
+        (
+            make_field("Valor do Servico", values.valor_servico),
+            make_field("Desconto Condicionado", values.desconto_cond),
+            make_field("Desconto Incondicionado", values.desconto_incond),
+            make_field("ISSQN Retido", nfse_data.issqn_retido),
+        ),
+        (
+            make_field("IRRF, CP, CSLL - Retidos", values.irrf_cp_csll_retidos),
+            make_field("PIS/COFINS Retidos", nfse_data.pis_cofins_retidos),
+            _EMPTY,
+            make_field("Valor Liquido da NFS-e", values.valor_liquido),
+        ),
     )
 
-    valor_total_table.setStyle(
-        TableStyle(
-            [
-                ("BOX", (0, 0), (-1, -1), 0.5, colors.black),
-                ("INNERGRID", (0, 0), (-1, -1), 0.25, colors.grey),
-                ("TOPPADDING", (0, 0), (-1, -1), 0.5 * mm),
-                ("BOTTOMPADDING", (0, 0), (-1, -1), 0.5 * mm),
-                ("LEFTPADDING", (0, 0), (-1, -1), 1 * mm),
-                ("VALIGN", (0, 0), (-1, -1), "TOP"),
-            ]
-        )
-    )
+    valor_total_table = Table(valor_total_data, colWidths=_FOUR_COL_WIDTHS)
+
+    valor_total_table.setStyle(_FIELD_TABLE_STYLE)
 
     elements.append(valor_total_table)
 
     # TOTAIS APROXIMADOS section
-    elements.append(Paragraph("TOTAIS APROXIMADOS DOS TRIBUTOS", style_section))
-
-    totais_data = [
-        [
-            make_field("Federais", nfse_data.trib_federais or "-"),
-            make_field("Estaduais", nfse_data.trib_estaduais or "-"),
-            make_field("Municipais", nfse_data.trib_municipais or "-"),
-        ],
-    ]
-
-    totais_table = Table(
-        totais_data,
-        colWidths=[65 * mm, 65 * mm, 66 * mm],
+    elements.append(Paragraph("TOTAIS APROXIMADOS DOS TRIBUTOS", _STYLE_SECTION))
+
+    totais_data = (
+        (
+            make_field("Federais", nfse_data.trib_federais),
+            make_field("Estaduais", nfse_data.trib_estaduais),
+            make_field("Municipais", nfse_data.trib_municipais),
+        ),
     )
 
-    totais_table.setStyle(
-        TableStyle(
-            [
-                ("BOX", (0, 0), (-1, -1), 0.5, colors.black),
-                ("INNERGRID", (0, 0), (-1, -1), 0.25, colors.grey),
-                ("TOPPADDING", (0, 0), (-1, -1), 0.5 * mm),
-                ("BOTTOMPADDING", (0, 0), (-1, -1), 0.5 * mm),
-                ("LEFTPADDING", (0, 0), (-1, -1), 1 * mm),
-                ("VALIGN", (0, 0), (-1, -1), "TOP"),
-            ]
-        )
-    )
+    totais_table = Table(totais_data, colWidths=_THREE_COL_WIDTHS)
+
+    totais_table.setStyle(_FIELD_TABLE_STYLE)
 
     elements.append(totais_table)
 
     # INFORMACOES COMPLEMENTARES section
-    elements.append(Paragraph("INFORMACOES COMPLEMENTARES", style_section))
+    elements.append(Paragraph("INFORMACOES COMPLEMENTARES", _STYLE_SECTION))
 
     info_text = ""
 
@@ -1362,29 +1329,21 @@ def generate_danfse_pdf(
         info_text = "-"
 
     info_data = [
-        [Paragraph(info_text, style_value)],
+        [Paragraph(info_text, _STYLE_VALUE)],
     ]
 
-    info_table = Table(
-        info_data,
-        colWidths=[196 * mm],
-    )
+    info_table = Table(info_data, colWidths=_FULL_COL_WIDTHS)
 
-    info_table.setStyle(
-        TableStyle(
-            [
-                ("BOX", (0, 0), (-1, -1), 0.5, colors.black),
-                ("TOPPADDING", (0, 0), (-1, -1), 0.5 * mm),
-                ("BOTTOMPADDING", (0, 0), (-1, -1), 0.5 * mm),
-                ("LEFTPADDING", (0, 0), (-1, -1), 1 * mm),
-            ]
-        )
-    )
+    info_table.setStyle(_INFO_TABLE_STYLE)
 
     elements.append(info_table)
 
     # Build PDF
     doc.build(elements)
+
+    if stream_to_file:
+        return None
+
     pdf_content = buffer.getvalue()
     buffer.close()
 
@@ -1398,7 +1357,8 @@ def generate_danfse_from_xml(
     xml_content: str,
     output_path: Optional[str] = None,
     header_config: Optional[HeaderConfig] = None,
-) -> bytes:
+    return_bytes: bool = True,
+) -> Optional[bytes]:
     """
     Generate DANFSE PDF from NFSe XML content.
 
@@ -1406,20 +1366,22 @@ def generate_danfse_from_xml(
         xml_content: NFSe XML string
         output_path: Optional path to save PDF file
         header_config: Optional custom header configuration
+        return_bytes: When False and output_path is set, stream to disk only
 
     Returns:
-        PDF content as bytes
+        PDF content as bytes, or None when streamed to output_path
     """
 
     nfse_data = parse_nfse_xml(xml_content)
-    return generate_danfse_pdf(nfse_data, output_path, header_config)
+    return generate_danfse_pdf(nfse_data, output_path, header_config, return_bytes)
 
 
 def generate_danfse_from_base64(
     nfse_xml_gzip_b64: str,
     output_path: Optional[str] = None,
     header_config: Optional[HeaderConfig] = None,
-) -> bytes:
+    return_bytes: bool = True,
+) -> Optional[bytes]:
     """
     Generate DANFSE PDF from base64-encoded gzipped NFSe XML.
 
@@ -1427,10 +1389,72 @@ def generate_danfse_from_base64(
         nfse_xml_gzip_b64: Base64-encoded gzipped NFSe XML (as returned by API)
         output_path: Optional path to save PDF file
         header_config: Optional custom header configuration
+        return_bytes: When False and output_path is set, stream to disk only
 
     Returns:
-        PDF content as bytes
+        PDF content as bytes, or None when streamed to output_path
     """
 
     xml_content = decode_decompress(nfse_xml_gzip_b64)
-    return generate_danfse_from_xml(xml_content, output_path, header_config)
+    return generate_danfse_from_xml(
+        xml_content, output_path, header_config, return_bytes
+    )
+
+
+def _generate_danfse_batch_item(
+    item: tuple[int, str, Optional[str], Optional[HeaderConfig], bool],
+) -> bytes | str:
+    """Render one batch entry; module-level so worker processes can unpickle it."""
+
+    index, nfse_xml_gzip_b64, output_dir, header_config, return_bytes = item
+    nfse_data = parse_nfse_xml(decode_decompress(nfse_xml_gzip_b64))
+
+    if not output_dir:
+        return generate_danfse_pdf(nfse_data, None, header_config)
+
+    output_path = str(Path(output_dir) / f"{nfse_data.chave_acesso or index}.pdf")
+    pdf_content = generate_danfse_pdf(
+        nfse_data, output_path, header_config, return_bytes
+    )
+
+    # Only the path crosses back to the parent when the caller wants files.
+    return output_path if pdf_content is None else pdf_content
+
+
+def generate_danfse_batch(
+    nfse_xml_gzip_b64_list: Sequence[str],
+    output_dir: Optional[str] = None,
+    header_config: Optional[HeaderConfig] = None,
+    workers: Optional[int] = None,
+    return_bytes: bool = True,
+) -> list[bytes] | list[str]:
+    """
+    Generate DANFSE PDFs for many base64-encoded gzipped NFSe XMLs in parallel.
+
+    Layout is pure Python and holds the GIL, so documents are rendered in a
+    process pool.
+
+    Args:
+        nfse_xml_gzip_b64_list: Base64-encoded gzipped NFSe XMLs (as returned by API)
+        output_dir: Optional directory to save each PDF as ``<chave_acesso>.pdf``
+            (or ``<position>.pdf`` when the access key is missing)
+        header_config: Optional custom header configuration
+        workers: Number of worker processes (defaults to the CPU count)
+        return_bytes: When False and output_dir is set, each worker streams its
+            PDF to disk and only the file path is sent back
+
+    Returns:
+        PDF contents as bytes, or the saved file paths when streamed to
+        output_dir, in input order
+    """
+
+    items = [
+        (index, nfse_xml_gzip_b64, output_dir, header_config, return_bytes)
+        for index, nfse_xml_gzip_b64 in enumerate(nfse_xml_gzip_b64_list)
+    ]
+
+    if workers == 1 or len(items) <= 1:
+        return [_generate_danfse_batch_item(item) for item in items]
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(_generate_danfse_batch_item, items, chunksize=4))
@@ -1,17 +1,40 @@
 import base64
 import binascii
 import gzip
-import io
 import re
+import zlib
+from collections.abc import Iterable
+from functools import lru_cache
 
 from .error_codes import ErrorCode
 from .exceptions import NFSeAPIError
 
+# python-isal's igzip/isal_zlib are drop-in gzip.compress/zlib.decompressobj
+# with a much faster deflate and inflate; the stdlib modules remain the fallback.
+try:
+    from isal import igzip as _gzip
+    from isal import isal_zlib as _zlib
+except ImportError:
+    _gzip = gzip
+    _zlib = zlib
+
 MAX_DECOMPRESSED_BYTES = 8 * 1024 * 1024
 
 # Official TSChaveNFSe: exactly 50 decimal digits.
 CHAVE_ACESSO_RE = re.compile(r"^\d{50}$")
 
+_NON_DIGIT = re.compile(r"[^0-9]")
+
+
+def _only_digits(value: str) -> str:
+    """Strip everything but ASCII digits, skipping the regex for clean input."""
+    # Documents are usually stored unformatted; isdigit alone would also
+    # accept non-ASCII digits, which the regex removes.
+    if value.isascii() and value.isdigit():
+        return value
+
+    return _NON_DIGIT.sub("", value)
+
 
 def is_valid_chave_acesso(chave: str) -> bool:
     """True when ``chave`` is exactly 50 decimal digits (TSChaveNFSe)."""
@@ -21,8 +44,16 @@ def is_valid_chave_acesso(chave: str) -> bool:
 
 def compress_encode(data: str) -> str:
     """Compress with GZip and encode with Base64."""
-    compressed = gzip.compress(data.encode("utf-8"))
-    return base64.b64encode(compressed).decode("ascii")
+    return compress_encode_bytes(data.encode("utf-8"))
+
+
+def compress_encode_bytes(data: bytes) -> str:
+    """Compress already UTF-8 encoded data with GZip and encode with Base64."""
+    # Level 1: DPS/event XML is small and repetitive, so the ratio barely
+    # drops while deflate runs several times faster than the default level.
+    # mtime=0 keeps the header free of the clock, so equal XML encodes equally.
+    compressed = _gzip.compress(data, compresslevel=1, mtime=0)
+    return binascii.b2a_base64(compressed, newline=False).decode("ascii")
 
 
 # Alias for consistency with __init__.py exports
@@ -33,28 +64,38 @@ def decode_decompress(data: str) -> str:
     """Decode Base64 and decompress GZip with a safety cap."""
 
     try:
-        decoded = base64.b64decode(data, validate=True)
-        output = io.BytesIO()
-
-        with gzip.GzipFile(fileobj=io.BytesIO(decoded), mode="rb") as gz_file:
-            while True:
-                chunk = gz_file.read(8192)
-                if not chunk:
-                    break
-
-                output.write(chunk)
-                if output.tell() > MAX_DECOMPRESSED_BYTES:
-                    raise NFSeAPIError(
-                        "Conteúdo NFSe excede o limite permitido de descompressão.",
-                        code=ErrorCode.PAYLOAD_TOO_LARGE,
-                    )
-
-        return output.getvalue().decode("utf-8")
+        remaining = base64.b64decode(data, validate=True)
+        chunks = []
+        total = 0
+
+        # zlib reads the gzip framing itself (wbits=31), skipping the
+        # GzipFile/BufferedReader layers; max_length keeps the cap enforced
+        # without inflating more than one byte past the limit.
+        while remaining:
+            decompressor = _zlib.decompressobj(wbits=31)
+            chunk = decompressor.decompress(
+                remaining, MAX_DECOMPRESSED_BYTES - total + 1
+            )
+            total += len(chunk)
+
+            if total > MAX_DECOMPRESSED_BYTES:
+                raise NFSeAPIError(
+                    "Conteúdo NFSe excede o limite permitido de descompressão.",
+                    code=ErrorCode.PAYLOAD_TOO_LARGE,
+                )
+
+            if not decompressor.eof:
+                raise EOFError("truncated gzip stream")
+
+            chunks.append(chunk)
+            remaining = decompressor.unused_data.lstrip(b"\0")
+
+        return b"".join(chunks).decode("utf-8")
 
     except NFSeAPIError:
         raise
 
-    except (ValueError, OSError, EOFError, gzip.BadGzipFile, binascii.Error):
+    except (ValueError, EOFError, zlib.error, _zlib.error, binascii.Error):
         raise NFSeAPIError(
             "Falha ao decodificar conteúdo NFSe comprimido.",
             code=ErrorCode.DECODE_ERROR,
@@ -74,54 +115,96 @@ def _redacted_repr(label: str, value: str | None) -> str:
 decode_and_decompress = decode_decompress
 
 
+# CNPJs are public company identifiers and batches repeat the same prestador,
+# so the check is memoized on the clean digits; CPFs are personal data and are
+# deliberately not kept in a process-wide cache.
+@lru_cache(maxsize=4096)
+def _cnpj_digits_valid(cnpj: str) -> bool:
+    """Check the verifier digits of an already-clean CNPJ string."""
+    if len(cnpj) != 14 or cnpj == cnpj[0] * 14:
+        return False
+
+    # Work on the ASCII codes; the "- 48 * sum(weights)" term removes the
+    # ord("0") offset in one step instead of converting every digit.
+    b = cnpj.encode("ascii")
+
+    # Check digits with the fixed weights 5..2,9..2 and 6..2,9..2, unrolled.
+    total = (
+        b[0] * 5 + b[1] * 4 + b[2] * 3 + b[3] * 2 + b[4] * 9 + b[5] * 8
+        + b[6] * 7 + b[7] * 6 + b[8] * 5 + b[9] * 4 + b[10] * 3 + b[11] * 2
+        - 48 * 58
+    )  # fmt: skip
+    remainder = total % 11
+    d1 = 0 if remainder < 2 else 11 - remainder
+
+    total = (
+        b[0] * 6 + b[1] * 5 + b[2] * 4 + b[3] * 3 + b[4] * 2 + b[5] * 9
+        + b[6] * 8 + b[7] * 7 + b[8] * 6 + b[9] * 5 + b[10] * 4 + b[11] * 3
+        - 48 * 62 + d1 * 2
+    )  # fmt: skip
+    remainder = total % 11
+    d2 = 0 if remainder < 2 else 11 - remainder
+
+    return b[12] - 48 == d1 and b[13] - 48 == d2
+
+
 def validate_cnpj(cnpj: str) -> bool:
     """Validate Brazilian CNPJ number."""
-    cnpj = re.sub(r"[^0-9]", "", cnpj)
+    return _cnpj_digits_valid(_only_digits(cnpj))
 
-    if len(cnpj) != 14:
-        return False
 
-    if cnpj == cnpj[0] * 14:
-        return False
-
-    def calc_digit(cnpj_partial: str, weights: list) -> int:
-        total = sum(int(c) * w for c, w in zip(cnpj_partial, weights))
-        remainder = total % 11
-        return 0 if remainder < 2 else 11 - remainder
+def validate_cnpj_batch(cnpjs: Iterable[str]) -> list[bool]:
+    """Validate many CNPJs, checking each distinct value only once."""
+    # Bulk imports repeat the same tomador many times; memoize per input.
+    checked: dict[str, bool] = {}
+    results = []
 
-    weights1 = [5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2]
-    weights2 = [6, 5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2]
+    for cnpj in cnpjs:
+        valid = checked.get(cnpj)
 
-    d1 = calc_digit(cnpj[:12], weights1)
-    d2 = calc_digit(cnpj[:12] + str(d1), weights2)
+        if valid is None:
+            valid = checked[cnpj] = validate_cnpj(cnpj)
 
-    return cnpj[-2:] == f"{d1}{d2}"
+        results.append(valid)
 
+    return results
 
-def validate_cpf(cpf: str) -> bool:
-    """Validate Brazilian CPF number."""
-    cpf = re.sub(r"[^0-9]", "", cpf)
 
-    if len(cpf) != 11:
+def _cpf_digits_valid(cpf: str) -> bool:
+    """Check the verifier digits of an already-clean CPF string."""
+    if len(cpf) != 11 or cpf == cpf[0] * 11:
         return False
 
-    if cpf == cpf[0] * 11:
-        return False
+    b = cpf.encode("ascii")
+
+    # Check digits with the fixed weights 10..2 and 11..2, unrolled.
+    total = (
+        b[0] * 10 + b[1] * 9 + b[2] * 8 + b[3] * 7 + b[4] * 6
+        + b[5] * 5 + b[6] * 4 + b[7] * 3 + b[8] * 2
+        - 48 * 54
+    )  # fmt: skip
+    remainder = (total * 10) % 11
+    d1 = 0 if remainder >= 10 else remainder
 
-    def calc_digit(cpf_partial: str, factor: int) -> int:
-        total = sum(int(c) * (factor - i) for i, c in enumerate(cpf_partial))
-        remainder = (total * 10) % 11
-        return 0 if remainder >= 10 else remainder
+    total = (
+        b[0] * 11 + b[1] * 10 + b[2] * 9 + b[3] * 8 + b[4] * 7
+        + b[5] * 6 + b[6] * 5 + b[7] * 4 + b[8] * 3
+        - 48 * 63 + d1 * 2
+    )  # fmt: skip
+    remainder = (total * 10) % 11
+    d2 = 0 if remainder >= 10 else remainder
 
-    d1 = calc_digit(cpf[:9], 10)
-    d2 = calc_digit(cpf[:9] + str(d1), 11)
+    return b[9] - 48 == d1 and b[10] - 48 == d2
 
-    return cpf[-2:] == f"{d1}{d2}"
+
+def validate_cpf(cpf: str) -> bool:
+    """Validate Brazilian CPF number."""
+    return _cpf_digits_valid(_only_digits(cpf))
 
 
 def format_cnpj(cnpj: str) -> str:
     """Format CNPJ with punctuation."""
-    cnpj = re.sub(r"[^0-9]", "", cnpj)
+    cnpj = _only_digits(cnpj)
 
     if len(cnpj) != 14:
         return cnpj
@@ -131,7 +214,7 @@ def format_cnpj(cnpj: str) -> str:
 
 def normalize_document(doc: str) -> str:
     """Remove all non-numeric characters from document."""
-    return re.sub(r"[^0-9]", "", doc)
+    return _only_digits(doc)
 
 
 # Alias for consistency with __init__.py exports
@@ -140,7 +223,7 @@ clean_document = normalize_document
 
 def format_cpf(cpf: str) -> str:
     """Format CPF with punctuation."""
-    cpf = re.sub(r"[^0-9]", "", cpf)
+    cpf = _only_digits(cpf)
 
     if len(cpf) != 11:
         return cpf
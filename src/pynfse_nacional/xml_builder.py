@@ -13,18 +13,27 @@ from importlib.metadata import PackageNotFoundError
 from importlib.metadata import version as _pkg_version
 from typing import TYPE_CHECKING
 from xml.etree import ElementTree as ET
+from xml.sax.saxutils import escape as _escape
 
 from .constants import Ambiente
 from .models import DPS
 
 if TYPE_CHECKING:
-    from .models import Endereco, EnderecoIBSCBS
+    from .models import Endereco
+    from .models_ibscbs import EnderecoIBSCBS
 
 try:
     _VERAPLIC = f"pynfse-{_pkg_version('pynfse-nacional')}"
 except PackageNotFoundError:
     _VERAPLIC = "pynfse-0.5.0"
 
+_XML_DECLARATION = "<?xml version='1.0' encoding='utf-8'?>\n"
+
+_P_TOT_TRIB_ZERO = (
+    "<pTotTrib><pTotTribFed>0</pTotTribFed><pTotTribEst>0</pTotTribEst>"
+    "<pTotTribMun>0</pTotTribMun></pTotTrib>"
+)
+
 
 class XMLBuilder:
     """Build DPS XML for NFSe Nacional submission."""
@@ -53,38 +62,44 @@ class XMLBuilder:
 
     def build_dps(self, dps: DPS) -> str:
         """Build DPS XML from model."""
-        root = ET.Element("DPS", versao="1.01", xmlns=self.NAMESPACE)
-
         # Generate correct DPS ID if not provided or use provided one
         dps_id = dps.id_dps if dps.id_dps else self._build_dps_id(dps)
-        inf_dps = ET.SubElement(root, "infDPS", Id=dps_id)
 
         # DPS tpAmb follows submission environment.
         tp_amb = "1" if self.ambiente == Ambiente.PRODUCAO else "2"
-        ET.SubElement(inf_dps, "tpAmb").text = tp_amb
-        ET.SubElement(inf_dps, "dhEmi").text = dps.data_emissao.strftime(
-            "%Y-%m-%dT%H:%M:%S-03:00"
-        )
-        ET.SubElement(inf_dps, "verAplic").text = _VERAPLIC
-        ET.SubElement(inf_dps, "serie").text = dps.serie
-        ET.SubElement(inf_dps, "nDPS").text = str(dps.numero)
-        ET.SubElement(inf_dps, "dCompet").text = dps.data_emissao.strftime("%Y-%m-%d")
-        ET.SubElement(inf_dps, "tpEmit").text = "1"
-        ET.SubElement(inf_dps, "cLocEmi").text = str(
-            dps.prestador.endereco.codigo_municipio
-        )
+
+        # cLocEmi and cLocPrestacao both carry the provider's municipality.
+        loc_emi = str(dps.prestador.endereco.codigo_municipio)
+
+        parts = [
+            _XML_DECLARATION,
+            f'<DPS versao="1.01" xmlns="{self.NAMESPACE}">',
+            f'<infDPS Id="{_escape(dps_id)}">'
+            f"<tpAmb>{tp_amb}</tpAmb>"
+            f"<dhEmi>{dps.data_emissao:%Y-%m-%dT%H:%M:%S-03:00}</dhEmi>"
+            f"<verAplic>{_escape(_VERAPLIC)}</verAplic>"
+            f"<serie>{_escape(dps.serie)}</serie>"
+            f"<nDPS>{dps.numero}</nDPS>"
+            f"<dCompet>{dps.data_emissao:%Y-%m-%d}</dCompet>"
+            "<tpEmit>1</tpEmit>"
+            f"<cLocEmi>{loc_emi}</cLocEmi>",
+        ]
 
         # Add substitution info if present (must come before prest)
         if dps.substituicao:
-            self._add_substituicao(inf_dps, dps)
+            parts.append(self._substituicao_xml(dps))
 
-        self._add_prestador(inf_dps, dps)
-        self._add_tomador(inf_dps, dps)
-        self._add_servico(inf_dps, dps)
-        self._add_valores(inf_dps, dps)
-        self._add_ibscbs(inf_dps, dps)
+        parts.append(self._prestador_xml(dps))
+        parts.append(self._tomador_xml(dps))
+        parts.append(self._servico_xml(dps, loc_emi))
+        parts.append(self._valores_xml(dps))
 
-        return ET.tostring(root, encoding="unicode", xml_declaration=True)
+        if dps.ibscbs:
+            parts.append(self._ibscbs_xml(dps))
+
+        parts.append("</infDPS></DPS>")
+
+        return "".join(parts)
 
     def build_cancel_event(
         self,
@@ -134,105 +149,100 @@ class XMLBuilder:
 
         return ET.tostring(root, encoding="unicode", xml_declaration=True)
 
-    def _add_substituicao(self, parent: ET.Element, dps: DPS) -> None:
-        """Add substitution information to DPS XML.
+    def _substituicao_xml(self, dps: DPS) -> str:
+        """Build substitution information for the DPS.
 
         This element references the NFSe being substituted and the reason.
         """
         subst = dps.substituicao
 
-        inf_subst = ET.SubElement(parent, "subst")
-        ET.SubElement(inf_subst, "chSubstda").text = subst.chave_nfse_substituida
-        ET.SubElement(inf_subst, "cMotivo").text = str(subst.codigo_motivo)
-        ET.SubElement(inf_subst, "xMotivo").text = subst.motivo
+        return (
+            "<subst>"
+            f"<chSubstda>{_escape(subst.chave_nfse_substituida)}</chSubstda>"
+            f"<cMotivo>{subst.codigo_motivo}</cMotivo>"
+            f"<xMotivo>{_escape(subst.motivo)}</xMotivo>"
+            "</subst>"
+        )
 
-    def _add_prestador(self, parent: ET.Element, dps: DPS) -> None:
-        prest = ET.SubElement(parent, "prest")
-        ET.SubElement(prest, "CNPJ").text = dps.prestador.cnpj
+    def _prestador_xml(self, dps: DPS) -> str:
+        prestador = dps.prestador
+        parts = ["<prest>", f"<CNPJ>{_escape(prestador.cnpj)}</CNPJ>"]
 
         # CNC stores numeric IM values as 15-character identifiers. Remove
         # display whitespace, then preserve alphanumeric municipal formats.
-        if dps.prestador.inscricao_municipal:
-            inscricao_municipal = dps.prestador.inscricao_municipal.strip()
+        if prestador.inscricao_municipal:
+            inscricao_municipal = prestador.inscricao_municipal.strip()
             if inscricao_municipal.isdigit():
                 inscricao_municipal = inscricao_municipal.zfill(15)
-            ET.SubElement(prest, "IM").text = inscricao_municipal
+            parts.append(f"<IM>{_escape(inscricao_municipal)}</IM>")
 
-        if dps.prestador.telefone:
-            ET.SubElement(prest, "fone").text = dps.prestador.telefone
+        if prestador.telefone:
+            parts.append(f"<fone>{_escape(prestador.telefone)}</fone>")
 
-        if dps.prestador.email:
-            ET.SubElement(prest, "email").text = dps.prestador.email
-
-        reg_trib = ET.SubElement(prest, "regTrib")
+        if prestador.email:
+            parts.append(f"<email>{_escape(prestador.email)}</email>")
 
         # opSimpNac: 1=Não Optante, 2=MEI, 3=ME/EPP (official TSOpSimpNac)
-        ET.SubElement(reg_trib, "opSimpNac").text = dps.op_simp_nac
+        parts.append(f"<regTrib><opSimpNac>{dps.op_simp_nac}</opSimpNac>")
 
         # regApTribSN: only valid for opSimpNac 3 (official TCRegTrib)
         if dps.op_simp_nac == "3":
-            ET.SubElement(reg_trib, "regApTribSN").text = dps.reg_ap_trib_sn
+            parts.append(f"<regApTribSN>{dps.reg_ap_trib_sn}</regApTribSN>")
 
-        ET.SubElement(reg_trib, "regEspTrib").text = self._map_regime_especial(
-            dps.regime_tributario
-        )
+        regime_especial = self._map_regime_especial(dps.regime_tributario)
+        parts.append(f"<regEspTrib>{regime_especial}</regEspTrib></regTrib></prest>")
 
-    def _add_tomador(self, parent: ET.Element, dps: DPS) -> None:
-        toma = ET.SubElement(parent, "toma")
+        return "".join(parts)
 
-        if dps.tomador.cpf:
-            ET.SubElement(toma, "CPF").text = dps.tomador.cpf
-        elif dps.tomador.cnpj:
-            ET.SubElement(toma, "CNPJ").text = dps.tomador.cnpj
+    def _tomador_xml(self, dps: DPS) -> str:
+        tomador = dps.tomador
 
-        ET.SubElement(toma, "xNome").text = dps.tomador.razao_social
-
-        if dps.tomador.endereco:
-            self._emit_endereco(toma, dps.tomador.endereco)
+        if tomador.cpf:
+            documento = f"<CPF>{_escape(tomador.cpf)}</CPF>"
+        elif tomador.cnpj:
+            documento = f"<CNPJ>{_escape(tomador.cnpj)}</CNPJ>"
+        else:
+            documento = ""
 
-    def _add_servico(self, parent: ET.Element, dps: DPS) -> None:
-        serv = ET.SubElement(parent, "serv")
+        endereco = self._endereco_xml(tomador.endereco) if tomador.endereco else ""
 
-        loc_prest = ET.SubElement(serv, "locPrest")
-        ET.SubElement(loc_prest, "cLocPrestacao").text = str(
-            dps.prestador.endereco.codigo_municipio
+        return (
+            f"<toma>{documento}<xNome>{_escape(tomador.razao_social)}</xNome>"
+            f"{endereco}</toma>"
         )
 
-        c_serv = ET.SubElement(serv, "cServ")
-        codigo = dps.servico.codigo_lc116.replace(".", "")
-        ET.SubElement(c_serv, "cTribNac").text = codigo.zfill(6)
+    def _servico_xml(self, dps: DPS, loc_prestacao: str) -> str:
+        servico = dps.servico
+        codigo = servico.codigo_lc116.replace(".", "").zfill(6)
+
+        parts = [
+            "<serv><locPrest>"
+            f"<cLocPrestacao>{loc_prestacao}</cLocPrestacao>"
+            "</locPrest>"
+            f"<cServ><cTribNac>{_escape(codigo)}</cTribNac>"
+        ]
 
         # cTribMun - municipal code (optional but used in real NFSe)
-        if dps.servico.codigo_tributacao_municipal:
-            ET.SubElement(
-                c_serv, "cTribMun"
-            ).text = dps.servico.codigo_tributacao_municipal
+        if servico.codigo_tributacao_municipal:
+            parts.append(
+                f"<cTribMun>{_escape(servico.codigo_tributacao_municipal)}</cTribMun>"
+            )
 
-        ET.SubElement(c_serv, "xDescServ").text = dps.servico.discriminacao
+        parts.append(f"<xDescServ>{_escape(servico.discriminacao)}</xDescServ>")
 
         # cNBS - NBS code (optional but used in real NFSe)
-        if dps.servico.codigo_nbs:
-            ET.SubElement(c_serv, "cNBS").text = dps.servico.codigo_nbs
+        if servico.codigo_nbs:
+            parts.append(f"<cNBS>{_escape(servico.codigo_nbs)}</cNBS>")
 
-    def _add_valores(self, parent: ET.Element, dps: DPS) -> None:
-        valores = ET.SubElement(parent, "valores")
-
-        v_serv_prest = ET.SubElement(valores, "vServPrest")
-        ET.SubElement(v_serv_prest, "vServ").text = self._format_decimal(
-            dps.servico.valor_servicos
-        )
+        parts.append("</cServ></serv>")
 
-        trib = ET.SubElement(valores, "trib")
+        return "".join(parts)
 
-        trib_mun = ET.SubElement(trib, "tribMun")
-        ET.SubElement(trib_mun, "tribISSQN").text = "1"
+    def _valores_xml(self, dps: DPS) -> str:
+        v_serv = self._format_decimal(dps.servico.valor_servicos)
 
         # tpRetISSQN: 1=Não Retido, 2=Retido Tomador, 3=Retido Intermediário
-        ET.SubElement(trib_mun, "tpRetISSQN").text = (
-            "2" if dps.servico.iss_retido else "1"
-        )
-
-        tot_trib = ET.SubElement(trib, "totTrib")
+        tp_ret_issqn = "2" if dps.servico.iss_retido else "1"
 
         # For Simples Nacional ME/EPP, use pTotTribSN with estimated tax percentage
         if dps.op_simp_nac == "3":
@@ -250,35 +260,37 @@ class XMLBuilder:
                     stacklevel=3,
                 )
 
-            ET.SubElement(tot_trib, "pTotTribSN").text = self._format_decimal(
-                aliquota_sn
-            )
+            tot_trib = f"<pTotTribSN>{self._format_decimal(aliquota_sn)}</pTotTribSN>"
         else:
             # For non-Simples, use percentage breakdown
-            p_tot_trib = ET.SubElement(tot_trib, "pTotTrib")
-            ET.SubElement(p_tot_trib, "pTotTribFed").text = "0"
-            ET.SubElement(p_tot_trib, "pTotTribEst").text = "0"
-            ET.SubElement(p_tot_trib, "pTotTribMun").text = "0"
-
-    def _emit_endereco(
-        self, parent: ET.Element, endereco: "Endereco | EnderecoIBSCBS"
-    ) -> None:
-        end = ET.SubElement(parent, "end")
-        end_nac = ET.SubElement(end, "endNac")
-        ET.SubElement(end_nac, "cMun").text = str(endereco.codigo_municipio)
-        ET.SubElement(end_nac, "CEP").text = endereco.cep
-        ET.SubElement(end, "xLgr").text = endereco.logradouro
-        ET.SubElement(end, "nro").text = endereco.numero
-        if endereco.complemento:
-            ET.SubElement(end, "xCpl").text = endereco.complemento
-        ET.SubElement(end, "xBairro").text = endereco.bairro
-
-    def _add_ibscbs(self, parent: ET.Element, dps: DPS) -> None:
-        if not dps.ibscbs:
-            return
+            tot_trib = _P_TOT_TRIB_ZERO
 
+        return (
+            f"<valores><vServPrest><vServ>{v_serv}</vServ></vServPrest>"
+            "<trib><tribMun><tribISSQN>1</tribISSQN>"
+            f"<tpRetISSQN>{tp_ret_issqn}</tpRetISSQN></tribMun>"
+            f"<totTrib>{tot_trib}</totTrib></trib></valores>"
+        )
+
+    def _endereco_xml(self, endereco: "Endereco | EnderecoIBSCBS") -> str:
+        complemento = (
+            f"<xCpl>{_escape(endereco.complemento)}</xCpl>"
+            if endereco.complemento
+            else ""
+        )
+
+        return (
+            f"<end><endNac><cMun>{endereco.codigo_municipio}</cMun>"
+            f"<CEP>{_escape(endereco.cep)}</CEP></endNac>"
+            f"<xLgr>{_escape(endereco.logradouro)}</xLgr>"
+            f"<nro>{_escape(endereco.numero)}</nro>"
+            f"{complemento}"
+            f"<xBairro>{_escape(endereco.bairro)}</xBairro></end>"
+        )
+
+    def _ibscbs_xml(self, dps: DPS) -> str:
         ibscbs = dps.ibscbs
-        inf_ibscbs = ET.SubElement(parent, "IBSCBS")
+        inf_ibscbs = ET.Element("IBSCBS")
 
         ET.SubElement(inf_ibscbs, "finNFSe").text = ibscbs.fin_nfse
         if ibscbs.ind_final is not None:
@@ -313,7 +325,7 @@ class XMLBuilder:
             ET.SubElement(dest, "xNome").text = ibscbs.dest.x_nome
 
             if ibscbs.dest.end is not None:
-                self._emit_endereco(dest, ibscbs.dest.end)
+                dest.append(ET.fromstring(self._endereco_xml(ibscbs.dest.end)))
 
             if ibscbs.dest.fone is not None:
                 ET.SubElement(dest, "fone").text = ibscbs.dest.fone
@@ -329,7 +341,7 @@ class XMLBuilder:
             if ibscbs.imovel.c_cib is not None:
                 ET.SubElement(imovel, "cCIB").text = ibscbs.imovel.c_cib
             elif ibscbs.imovel.end is not None:
-                self._emit_endereco(imovel, ibscbs.imovel.end)
+                imovel.append(ET.fromstring(self._endereco_xml(ibscbs.imovel.end)))
 
         valores = ET.SubElement(inf_ibscbs, "valores")
 
@@ -424,6 +436,8 @@ class XMLBuilder:
                 ibscbs.valores.trib.g_ibscbs.g_dif.p_dif_cbs
             )
 
+        return ET.tostring(inf_ibscbs, encoding="unicode")
+
     def _format_decimal(self, value: Decimal) -> str:
         return f"{value:.2f}"
 
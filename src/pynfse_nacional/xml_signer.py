@@ -1,14 +1,23 @@
 import base64
-import gzip
+import copy
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable
+from functools import lru_cache
 
 from lxml import etree
 
 from .error_codes import ErrorCode
 from .error_messages import get_error_message
 from .exceptions import NFSeCertificateError
+from .utils import compress_encode, compress_encode_bytes
 
 try:
-    from cryptography.hazmat.primitives.serialization import pkcs12
+    from cryptography.hazmat.primitives import hashes
+    from cryptography.hazmat.primitives.asymmetric import ec, padding, rsa
+    from cryptography.hazmat.primitives.serialization import Encoding, pkcs12
 
     CRYPTOGRAPHY_AVAILABLE = True
 except ImportError:
@@ -23,6 +32,173 @@ except ImportError:
     SIGNXML_AVAILABLE = False
 
 
+# Parsed PKCS#12 bundles keyed by file identity and password digest, so new
+# signer instances for the same certificate skip the key derivation.
+_PKCS12_CACHE_SIZE = 8
+_pkcs12_cache: OrderedDict[tuple, tuple | ValueError] = OrderedDict()
+_pkcs12_cache_lock = threading.Lock()
+
+
+def _load_pkcs12(cert_path: str, cert_password: str) -> tuple:
+    """Load key and certificate from a PKCS#12 file, reusing parsed results.
+
+    A bundle the password failed to open is remembered too, so retry loops
+    with bad credentials do not repeat the key derivation.
+    """
+
+    stat = os.stat(cert_path)
+    cache_key = (
+        os.path.abspath(cert_path),
+        stat.st_mtime_ns,
+        stat.st_size,
+        hashlib.sha256(cert_password.encode()).digest(),
+    )
+
+    with _pkcs12_cache_lock:
+        cached = _pkcs12_cache.get(cache_key)
+
+        if cached is not None:
+            _pkcs12_cache.move_to_end(cache_key)
+
+    if isinstance(cached, ValueError):
+        raise ValueError(*cached.args)
+
+    if cached is not None:
+        return cached
+
+    with open(cert_path, "rb") as f:
+        cert_data = f.read()
+
+    try:
+        private_key, certificate, _ = pkcs12.load_key_and_certificates(
+            cert_data, cert_password.encode()
+        )
+    except ValueError as e:
+        # Wrong password or corrupt bundle: deterministic for this file state.
+        _remember_pkcs12(cache_key, ValueError(*e.args))
+        raise
+
+    loaded = (private_key, certificate)
+    _remember_pkcs12(cache_key, loaded)
+
+    return loaded
+
+
+def _remember_pkcs12(cache_key: tuple, value) -> None:
+    with _pkcs12_cache_lock:
+        _pkcs12_cache[cache_key] = value
+
+        if len(_pkcs12_cache) > _PKCS12_CACHE_SIZE:
+            _pkcs12_cache.popitem(last=False)
+
+
+# Hardened parser for documents to sign. lxml parsers must not be shared
+# between threads, so each thread builds its own on first use.
+_sign_parser_local = threading.local()
+
+
+def _sign_parser() -> etree.XMLParser:
+    parser = getattr(_sign_parser_local, "parser", None)
+
+    if parser is None:
+        parser = _sign_parser_local.parser = etree.XMLParser(
+            resolve_entities=False,
+            no_network=True,
+            huge_tree=False,
+            collect_ids=False,
+        )
+
+    return parser
+
+
+_NFSE_NS = "http://www.sped.fazenda.gov.br/nfse"
+_INF_DPS_TAG = f"{{{_NFSE_NS}}}infDPS"
+_INF_PED_REG_TAG = f"{{{_NFSE_NS}}}infPedReg"
+
+
+def _find_signed_info(root: etree._Element) -> etree._Element | None:
+    """Return the infDPS or infPedReg element to be signed."""
+
+    # DPS and pedRegEvento documents carry it as the first child of the root.
+    if len(root) and root[0].tag in (_INF_DPS_TAG, _INF_PED_REG_TAG):
+        return root[0]
+
+    signed_info = root.find(f".//{_INF_DPS_TAG}")
+
+    if signed_info is None:
+        signed_info = root.find(f".//{_INF_PED_REG_TAG}")
+
+    return signed_info
+
+
+_DSIG_NS = "http://www.w3.org/2000/09/xmldsig#"
+_EXC_C14N_WITH_COMMENTS = "http://www.w3.org/2001/10/xml-exc-c14n#WithComments"
+
+# Same enveloped RSA-SHA256 layout signxml emits for the NFSe API: unprefixed
+# ds namespace, exclusive C14N with comments, Signature after the info element.
+_SIGNATURE_TEMPLATE = etree.fromstring(
+    f'<Signature xmlns="{_DSIG_NS}"><SignedInfo>'
+    f'<CanonicalizationMethod Algorithm="{_EXC_C14N_WITH_COMMENTS}"/>'
+    '<SignatureMethod Algorithm="http://www.w3.org/2001/04/xmldsig-more#rsa-sha256"/>'
+    "<Reference><Transforms>"
+    f'<Transform Algorithm="{_DSIG_NS}enveloped-signature"/>'
+    f'<Transform Algorithm="{_EXC_C14N_WITH_COMMENTS}"/>'
+    "</Transforms>"
+    '<DigestMethod Algorithm="http://www.w3.org/2001/04/xmlenc#sha256"/>'
+    "<DigestValue/></Reference></SignedInfo><SignatureValue/>"
+    "<KeyInfo><X509Data><X509Certificate/></X509Data></KeyInfo></Signature>"
+)
+
+
+def _exc_c14n(element: etree._Element) -> bytes:
+    return etree.tostring(element, method="c14n", exclusive=True, with_comments=True)
+
+
+@lru_cache(maxsize=_PKCS12_CACHE_SIZE)
+def _x509_certificate_text(certificate) -> str:
+    """Return the X509Certificate text for ``certificate``, built once per cert."""
+
+    # PEM body lines, as signxml writes them.
+    cert_pem = certificate.public_bytes(Encoding.PEM).decode("ascii")
+    return "".join(cert_pem.splitlines(keepends=True)[1:-1])
+
+
+def _sign_enveloped_rsa(
+    root: etree._Element,
+    referenced: etree._Element,
+    reference_id: str,
+    private_key,
+    certificate,
+) -> etree._Element:
+    """Append an RSA-SHA256 enveloped signature over ``referenced`` to ``root``."""
+
+    signature = copy.deepcopy(_SIGNATURE_TEMPLATE)
+    signed_info = signature[0]
+    reference = signed_info[2]
+    reference.set("URI", f"#{reference_id}")
+
+    digest = hashlib.sha256(_exc_c14n(referenced)).digest()
+    reference[2].text = base64.b64encode(digest).decode("ascii")
+
+    signature[2][0][0].text = _x509_certificate_text(certificate)
+
+    root.append(signature)
+
+    signature_value = private_key.sign(
+        _exc_c14n(signed_info), padding.PKCS1v15(), hashes.SHA256()
+    )
+    signature[1].text = base64.b64encode(signature_value).decode("ascii")
+
+    return root
+
+
+def _sign_failed() -> NFSeCertificateError:
+    return NFSeCertificateError(
+        get_error_message(ErrorCode.CERTIFICATE_SIGN_FAILED),
+        code=ErrorCode.CERTIFICATE_SIGN_FAILED,
+    )
+
+
 class XMLSignerService:
     """Sign XML documents with ICP-Brasil certificate."""
 
@@ -31,6 +207,8 @@ class XMLSignerService:
         self.cert_password = cert_password
         self._private_key = None
         self._certificate = None
+        self._signxml_signer = None
+        self._signxml_lock = threading.Lock()
 
     def _load_certificate(self) -> None:
         """Load certificate from file."""
@@ -44,11 +222,8 @@ class XMLSignerService:
             return
 
         try:
-            with open(self.cert_path, "rb") as f:
-                cert_data = f.read()
-
-            self._private_key, self._certificate, _ = pkcs12.load_key_and_certificates(
-                cert_data, self.cert_password.encode()
+            self._private_key, self._certificate = _load_pkcs12(
+                self.cert_path, self.cert_password
             )
 
             if self._certificate is None:
@@ -80,6 +255,26 @@ class XMLSignerService:
         Per the XSD schema, the Signature element is a sibling of the info element.
         """
 
+        return self.sign_bytes(xml.encode("utf-8")).decode("utf-8")
+
+    def sign_batch(self, xmls: Iterable[str]) -> list[str]:
+        """Sign several XML documents with the same certificate, in order.
+
+        The dependency check and certificate load run once for the whole batch.
+        """
+
+        self._prepare_signing()
+
+        return [self._sign_loaded(xml.encode("utf-8")).decode("utf-8") for xml in xmls]
+
+    def sign_bytes(self, xml: bytes) -> bytes:
+        """Sign UTF-8 encoded XML and return the signed document as bytes."""
+
+        self._prepare_signing()
+
+        return self._sign_loaded(xml)
+
+    def _prepare_signing(self) -> None:
         if not SIGNXML_AVAILABLE:
             raise NFSeCertificateError(
                 "Biblioteca signxml não instalada.",
@@ -88,72 +283,88 @@ class XMLSignerService:
 
         self._load_certificate()
 
+    def _sign_loaded(self, xml: bytes) -> bytes:
+        """Sign ``xml`` once the certificate is loaded; see ``sign_bytes``."""
+
         try:
-            parser = etree.XMLParser(
-                resolve_entities=False, no_network=True, huge_tree=False
+            xml_element = etree.fromstring(xml, parser=_sign_parser())
+        except Exception as e:
+            raise _sign_failed() from e
+
+        signed_info = _find_signed_info(xml_element)
+
+        if signed_info is None:
+            raise NFSeCertificateError(
+                "Elemento assinado (infDPS ou infPedReg) não encontrado no XML.",
+                code=ErrorCode.RESPONSE_INVALID_XML,
             )
-            xml_element = etree.fromstring(xml.encode("utf-8"), parser=parser)
 
-            ns = "http://www.sped.fazenda.gov.br/nfse"
-            signed_info = xml_element.find(f".//{{{ns}}}infDPS")
+        inf_dps_id = signed_info.get("Id")
 
-            if signed_info is None:
-                signed_info = xml_element.find(f".//{{{ns}}}infPedReg")
+        if not inf_dps_id:
+            raise NFSeCertificateError(
+                "Atributo Id do infDPS não encontrado.",
+                code=ErrorCode.RESPONSE_INVALID_XML,
+            )
 
-            if signed_info is None:
-                raise NFSeCertificateError(
-                    "Elemento assinado (infDPS ou infPedReg) não encontrado no XML.",
-                    code=ErrorCode.RESPONSE_INVALID_XML,
+        try:
+            if isinstance(self._private_key, rsa.RSAPrivateKey):
+                signed_xml = _sign_enveloped_rsa(
+                    xml_element,
+                    signed_info,
+                    inf_dps_id,
+                    self._private_key,
+                    self._certificate,
                 )
+            else:
+                signed_xml = self._sign_with_signxml(xml_element, inf_dps_id)
 
-            inf_dps_id = signed_info.get("Id")
+            return etree.tostring(signed_xml, encoding="utf-8", xml_declaration=True)
 
-            if not inf_dps_id:
-                raise NFSeCertificateError(
-                    "Atributo Id do infDPS não encontrado.",
-                    code=ErrorCode.RESPONSE_INVALID_XML,
+        except Exception as e:
+            raise _sign_failed() from e
+
+    def _sign_with_signxml(
+        self, xml_element: etree._Element, reference_id: str
+    ) -> etree._Element:
+        """Sign non-RSA keys through signxml's generic implementation."""
+
+        # signxml keeps a lazily created lxml parser on the signer, so the
+        # instance is reused across documents but never used concurrently.
+        with self._signxml_lock:
+            if self._signxml_signer is None:
+                # The key never changes for an instance, so neither does this.
+                if isinstance(self._private_key, ec.EllipticCurvePrivateKey):
+                    signature_algorithm = "ecdsa-sha256"
+                else:
+                    signature_algorithm = "rsa-sha256"
+
+                # Use exclusive canonicalization with comments as seen in real NFSe
+                signer = XMLSigner(
+                    method=methods.enveloped,
+                    signature_algorithm=signature_algorithm,
+                    digest_algorithm="sha256",
+                    c14n_algorithm=_EXC_C14N_WITH_COMMENTS,
                 )
 
-            # Use exclusive canonicalization with comments as seen in real NFSe
-            signer = XMLSigner(
-                method=methods.enveloped,
-                signature_algorithm="rsa-sha256",
-                digest_algorithm="sha256",
-                c14n_algorithm="http://www.w3.org/2001/10/xml-exc-c14n#WithComments",
-            )
-
-            # Remove ds: prefix from signature namespace (NFSe API requires unprefixed)
-            signer.namespaces = {None: signxml_namespaces.ds}
+                # Remove ds: prefix from signature namespace (NFSe API requires
+                # unprefixed)
+                signer.namespaces = {None: signxml_namespaces.ds}
+                self._signxml_signer = signer
 
-            signed_xml = signer.sign(
+            return self._signxml_signer.sign(
                 xml_element,
                 key=self._private_key,
                 cert=[self._certificate],
-                reference_uri=f"#{inf_dps_id}",
+                reference_uri=f"#{reference_id}",
             )
 
-            xml_bytes = etree.tostring(
-                signed_xml, encoding="utf-8", xml_declaration=True
-            )
-
-            return xml_bytes.decode("utf-8")
-
-        except NFSeCertificateError:
-            raise
-
-        except Exception as e:
-            raise NFSeCertificateError(
-                get_error_message(ErrorCode.CERTIFICATE_SIGN_FAILED),
-                code=ErrorCode.CERTIFICATE_SIGN_FAILED,
-            ) from e
-
     def sign_and_encode(self, xml: str) -> str:
         """Sign XML, compress with GZip, and encode with Base64."""
-        signed_xml = self.sign(xml)
-        return self.compress_encode(signed_xml)
+        # Stay in bytes from signing to gzip, skipping a decode/encode pass.
+        return compress_encode_bytes(self.sign_bytes(xml.encode("utf-8")))
 
     @staticmethod
     def compress_encode(data: str) -> str:
         """Compress with GZip and encode with Base64."""
-        compressed = gzip.compress(data.encode("utf-8"))
-        return base64.b64encode(compressed).decode("ascii")
+        return compress_encode(data)
@@ -0,0 +1,65 @@
+"""Builders for the synthetic sample models shared across test modules."""
+
+from decimal import Decimal
+
+from pynfse_nacional.models import Endereco, Prestador, Servico, Tomador
+
+# Decimal is immutable, so every sample Servico can share these instances.
+_VALOR_SERVICOS = Decimal("500.00")
+_ALIQUOTA_ISS = Decimal("2.00")
+_ALIQUOTA_SIMPLES = Decimal("15.50")
+_ZERO = Decimal("0.00")
+
+
+def make_endereco() -> Endereco:
+    return Endereco(
+        logradouro="Rua Teste",
+        numero="100",
+        complemento="Sala 1",
+        bairro="Centro",
+        codigo_municipio=3509502,
+        uf="SP",
+        cep="13000000",
+    )
+
+
+def make_prestador(endereco: Endereco) -> Prestador:
+    return Prestador(
+        cnpj="11222333000181",
+        inscricao_municipal="12345",
+        razao_social="Clinica Teste LTDA",
+        nome_fantasia="Clinica Teste",
+        endereco=endereco,
+        email="contato@clinica.com",
+        telefone="1999999999",
+    )
+
+
+def make_tomador(endereco: Endereco) -> Tomador:
+    return Tomador(
+        cpf="52998224725",
+        razao_social="Joao Silva",
+        email="paciente@email.com",
+        telefone="1988888888",
+        endereco=endereco,
+    )
+
+
+def make_servico() -> Servico:
+    return Servico(
+        codigo_cnae="8630503",
+        codigo_lc116="04.03.03",
+        codigo_tributacao_municipal="123456",
+        codigo_nbs="101010100",
+        discriminacao="Consulta medica",
+        valor_servicos=_VALOR_SERVICOS,
+        iss_retido=False,
+        aliquota_iss=_ALIQUOTA_ISS,
+        aliquota_simples=_ALIQUOTA_SIMPLES,
+        valor_deducoes=_ZERO,
+        valor_pis=_ZERO,
+        valor_cofins=_ZERO,
+        valor_inss=_ZERO,
+        valor_ir=_ZERO,
+        valor_csll=_ZERO,
+    )
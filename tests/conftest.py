@@ -1,10 +1,17 @@
-from copy import deepcopy
-from decimal import Decimal
+from unittest.mock import patch
 
 import pytest
 
 import tests._cert_credentials as cert_credentials
+from pynfse_nacional import NFSeClient
 from pynfse_nacional.models import Endereco, Prestador, Servico, Tomador
+from tests._helpers.certificates import FakeCertificate, FakePrivateKey
+from tests._helpers.models import (
+    make_endereco,
+    make_prestador,
+    make_servico,
+    make_tomador,
+)
 
 
 def pytest_addoption(parser: pytest.Parser) -> None:
@@ -38,65 +45,22 @@ def pytest_configure(config: pytest.Config) -> None:
 
 @pytest.fixture
 def sample_endereco() -> Endereco:
-    return Endereco(
-        logradouro="Rua Teste",
-        numero="100",
-        complemento="Sala 1",
-        bairro="Centro",
-        codigo_municipio=3509502,
-        uf="SP",
-        cep="13000000",
-    )
+    return make_endereco()
 
 
 @pytest.fixture
 def sample_prestador(sample_endereco: Endereco) -> Prestador:
-    return Prestador(
-        cnpj="11222333000181",
-        inscricao_municipal="12345",
-        razao_social="Clinica Teste LTDA",
-        nome_fantasia="Clinica Teste",
-        endereco=sample_endereco,
-        email="contato@clinica.com",
-        telefone="1999999999",
-    )
+    return make_prestador(sample_endereco)
 
 
 @pytest.fixture
 def sample_tomador(sample_endereco: Endereco) -> Tomador:
-    return Tomador(
-        cpf="52998224725",
-        razao_social="Joao Silva",
-        email="paciente@email.com",
-        telefone="1988888888",
-        endereco=sample_endereco,
-    )
-
-
-@pytest.fixture
-def shared_sample_servico() -> Servico:
-    return Servico(
-        codigo_cnae="8630503",
-        codigo_lc116="04.03.03",
-        codigo_tributacao_municipal="123456",
-        codigo_nbs="101010100",
-        discriminacao="Consulta medica",
-        valor_servicos=Decimal("500.00"),
-        iss_retido=False,
-        aliquota_iss=Decimal("2.00"),
-        aliquota_simples=Decimal("15.50"),
-        valor_deducoes=Decimal("0.00"),
-        valor_pis=Decimal("0.00"),
-        valor_cofins=Decimal("0.00"),
-        valor_inss=Decimal("0.00"),
-        valor_ir=Decimal("0.00"),
-        valor_csll=Decimal("0.00"),
-    )
+    return make_tomador(sample_endereco)
 
 
 @pytest.fixture
-def sample_servico(shared_sample_servico: Servico) -> Servico:
-    return deepcopy(shared_sample_servico)
+def sample_servico() -> Servico:
+    return make_servico()
 
 
 @pytest.fixture(scope="session")
@@ -107,3 +71,24 @@ def cert_path() -> str:
 @pytest.fixture(scope="session")
 def cert_password() -> str:
     return cert_credentials.cert_password()
+
+
+@pytest.fixture(scope="session")
+def mock_client() -> NFSeClient:
+    """Create one NFSeClient for the session without certificate loading.
+
+    Tests only patch the client's attributes through context managers and
+    never assign to it, so a single instance is shared by every module.
+    """
+    client = NFSeClient(
+        cert_path="/fake/cert.pfx",
+        cert_password="fake_password",
+        ambiente="homologacao",
+    )
+
+    with patch.object(
+        client,
+        "_load_pkcs12",
+        return_value=(FakePrivateKey(), FakeCertificate()),
+    ):
+        yield client
@@ -4,140 +4,136 @@ These tests mock HTTP responses to test the client logic without
 making real API calls.
 """
 
-from unittest.mock import MagicMock, patch
+from contextlib import contextmanager
+from unittest.mock import patch
 
+import httpx
 import pytest
 
 from pynfse_nacional import NFSeAPIError, NFSeClient
 from pynfse_nacional.models import ConvenioMunicipal
 
+# Reply bodies are JSON-encoded by the MockTransport on every request, so the
+# tests share them read-only.
+_CONVENIO_OK = {
+    "parametrosConvenio": {
+        "aderenteAmbienteNacional": 1,
+        "aderenteEmissorNacional": 1,
+    },
+    "mensagem": "Parametros do convenio recuperados com sucesso.",
+}
+_ERRO_500 = {"codigo": "ERRO500", "mensagem": "Erro interno do servidor"}
 
-class MockResponse:
-    """Mock httpx.Response for testing."""
 
-    def __init__(self, status_code: int, json_data=None, text: str = ""):
-        self.status_code = status_code
-        self._json_data = json_data
-        self.text = text
+@pytest.fixture(scope="module")
+def http_transport(mock_client):
+    """Patch ``_get_client`` once per module onto an httpx MockTransport.
 
-    def json(self):
-        if self._json_data is None:
-            raise ValueError("No JSON data")
+    Every call yields the same ``httpx.Client``, which is closed at module
+    teardown. Yields the ``(reply, requests)`` state the transport reads and
+    appends to.
+    """
+    reply = {}
+    requests = []
 
-        return self._json_data
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(reply["status_code"], json=reply["json_data"])
+
+    with httpx.Client(transport=httpx.MockTransport(handler)) as http:
+
+        @contextmanager
+        def _client():
+            yield http
+
+        with patch.object(mock_client, "_get_client", side_effect=_client):
+            yield reply, requests
+
+
+@pytest.fixture(autouse=True)
+def _reset_http_transport(http_transport):
+    """Clear the shared transport's reply and recorded requests after each test."""
+    yield
+    reply, requests = http_transport
+    reply.clear()
+    requests.clear()
 
 
 @pytest.fixture
-def mock_client():
-    """Create a mock NFSeClient without certificate loading."""
-    with patch.object(NFSeClient, "_load_pkcs12") as mock_load:
-        mock_load.return_value = (MagicMock(), MagicMock())
+def http_get(http_transport):
+    """Set the reply for the client's GETs and return the requests seen."""
+    reply, requests = http_transport
 
-        client = NFSeClient(
-            cert_path="/fake/cert.pfx",
-            cert_password="fake_password",
-            ambiente="homologacao",
-        )
+    def _set(status_code, json_data=None):
+        reply.update(status_code=status_code, json_data=json_data)
+        return requests
 
-        yield client
+    return _set
 
 
 class TestQueryConvenioMunicipal:
     """Tests for query_convenio_municipal method."""
 
-    def test_municipio_com_convenio(self, mock_client):
+    def test_municipio_com_convenio(self, mock_client, http_get):
         """Test successful query for municipality with convenio."""
-        mock_response = MockResponse(
-            status_code=200,
-            json_data={
-                "parametrosConvenio": {
-                    "aderenteAmbienteNacional": 1,
-                    "aderenteEmissorNacional": 1,
-                },
-                "mensagem": "Parametros do convenio recuperados com sucesso.",
-            },
-        )
-
-        with patch.object(mock_client, "_get_client") as mock_get_client:
-            mock_http = MagicMock()
-            mock_http.get.return_value = mock_response
-            mock_get_client.return_value.__enter__ = MagicMock(return_value=mock_http)
-            mock_get_client.return_value.__exit__ = MagicMock(return_value=False)
+        http_get(200, _CONVENIO_OK)
 
-            result = mock_client.query_convenio_municipal(1302603)
+        result = mock_client.query_convenio_municipal(1302603)
 
-            assert isinstance(result, ConvenioMunicipal)
-            assert result.codigo_municipio == 1302603
-            assert result.aderido is True
-            assert result.raw_data is not None
-            assert "parametrosConvenio" in result.raw_data
+        assert isinstance(result, ConvenioMunicipal)
+        assert result.codigo_municipio == 1302603
+        assert result.aderido is True
+        assert result.raw_data is not None
+        assert "parametrosConvenio" in result.raw_data
 
-    def test_municipio_sem_convenio_404(self, mock_client):
+    def test_municipio_sem_convenio_404(self, mock_client, http_get):
         """Test 404 response for municipality without convenio."""
-        mock_response = MockResponse(status_code=404)
+        http_get(404)
 
-        with patch.object(mock_client, "_get_client") as mock_get_client:
-            mock_http = MagicMock()
-            mock_http.get.return_value = mock_response
-            mock_get_client.return_value.__enter__ = MagicMock(return_value=mock_http)
-            mock_get_client.return_value.__exit__ = MagicMock(return_value=False)
+        result = mock_client.query_convenio_municipal(9999999)
 
-            result = mock_client.query_convenio_municipal(9999999)
+        assert result.codigo_municipio == 9999999
+        assert result.aderido is False
 
-            assert result.codigo_municipio == 9999999
-            assert result.aderido is False
-
-    def test_url_format_correct(self, mock_client):
+    def test_url_format_correct(self, mock_client, http_get):
         """Test that URL is formatted correctly."""
-        mock_response = MockResponse(status_code=404)
-
-        with patch.object(mock_client, "_get_client") as mock_get_client:
-            mock_http = MagicMock()
-            mock_http.get.return_value = mock_response
-            mock_get_client.return_value.__enter__ = MagicMock(return_value=mock_http)
-            mock_get_client.return_value.__exit__ = MagicMock(return_value=False)
-
-            mock_client.query_convenio_municipal(1302603)
-
-            call_args = mock_http.get.call_args[0][0]
-            assert "/1302603/convenio" in call_args
-
-    def test_url_homologacao(self, mock_client):
-        """Test that homologacao URL is used correctly."""
-        assert "producaorestrita" in mock_client.parametrizacao_url
-        assert "adn.producaorestrita.nfse.gov.br" in mock_client.parametrizacao_url
-
-    def test_url_producao(self):
-        """Test that producao URL is used correctly."""
-        with patch.object(NFSeClient, "_load_pkcs12") as mock_load:
-            mock_load.return_value = (MagicMock(), MagicMock())
-
-            client = NFSeClient(
-                cert_path="/fake/cert.pfx",
-                cert_password="fake_password",
-                ambiente="producao",
-            )
-
-            assert "producaorestrita" not in client.parametrizacao_url
-            assert "adn.nfse.gov.br" in client.parametrizacao_url
+        requests = http_get(404)
+
+        mock_client.query_convenio_municipal(1302603)
+
+        assert len(requests) == 1
+        assert requests[0].method == "GET"
+        assert str(requests[0].url).endswith("/1302603/convenio")
+
+    @pytest.mark.parametrize(
+        "ambiente, host",
+        [
+            ("homologacao", "adn.producaorestrita.nfse.gov.br"),
+            ("producao", "adn.nfse.gov.br"),
+        ],
+    )
+    def test_url_por_ambiente(self, ambiente, host):
+        """Test that each ambiente uses its own parametrizacao host."""
+        # URLs are resolved in __init__; the certificate is only read lazily.
+        client = NFSeClient(
+            cert_path="/fake/cert.pfx",
+            cert_password="fake_password",
+            ambiente=ambiente,
+        )
 
-    def test_erro_api_500(self, mock_client):
-        """Test API error handling for 500 response."""
-        mock_response = MockResponse(
-            status_code=500,
-            json_data={"codigo": "ERRO500", "mensagem": "Erro interno do servidor"},
+        assert host in client.parametrizacao_url
+        assert ("producaorestrita" in client.parametrizacao_url) == (
+            ambiente == "homologacao"
         )
 
-        with patch.object(mock_client, "_get_client") as mock_get_client:
-            mock_http = MagicMock()
-            mock_http.get.return_value = mock_response
-            mock_get_client.return_value.__enter__ = MagicMock(return_value=mock_http)
-            mock_get_client.return_value.__exit__ = MagicMock(return_value=False)
+    def test_erro_api_500(self, mock_client, http_get):
+        """Test API error handling for 500 response."""
+        http_get(500, _ERRO_500)
 
-            with pytest.raises(NFSeAPIError) as exc_info:
-                mock_client.query_convenio_municipal(1302603)
+        with pytest.raises(NFSeAPIError) as exc_info:
+            mock_client.query_convenio_municipal(1302603)
 
-            assert exc_info.value.code == "ERRO500"
+        assert exc_info.value.code == "ERRO500"
 
 
 class TestConvenioMunicipalModel:
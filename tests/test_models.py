@@ -15,13 +15,19 @@ from pynfse_nacional.models import (
     SubstituicaoNFSe,
     Tomador,
 )
+from pynfse_nacional.utils import _cnpj_digits_valid
 
 # =============================================================================
 # Fixtures
 # =============================================================================
 
+_DATA_EMISSAO = datetime(2026, 1, 15, 12, 0, 0)
 
-@pytest.fixture
+# Module-scoped: each model is validated once and shared, so tests must not
+# mutate these instances.
+
+
+@pytest.fixture(scope="module")
 def valid_endereco():
     """Endereco valido para testes."""
     return Endereco(
@@ -34,7 +40,7 @@ def valid_endereco():
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def valid_prestador(valid_endereco):
     """Prestador valido para testes."""
     return Prestador(
@@ -45,7 +51,7 @@ def valid_prestador(valid_endereco):
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def valid_tomador():
     """Tomador valido para testes."""
     return Tomador(
@@ -54,7 +60,7 @@ def valid_tomador():
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def valid_servico():
     """Servico valido para testes."""
     return Servico(
@@ -69,137 +75,50 @@ def valid_servico():
 # =============================================================================
 
 
-class TestEnderecoCodigoMunicipio:
-    """Testes para validacao do codigo_municipio."""
-
-    def test_accepts_valid_7_digit_code(self):
-        """Deve aceitar codigo IBGE com 7 digitos."""
-        endereco = Endereco(
-            logradouro="Rua Teste",
-            numero="100",
-            bairro="Centro",
-            codigo_municipio=3550308,
-            uf="SP",
-            cep="01310100",
-        )
-
-        assert endereco.codigo_municipio == 3550308
-
-    def test_rejects_code_with_less_than_7_digits(self):
-        """Deve rejeitar codigo com menos de 7 digitos."""
-        with pytest.raises(ValidationError) as exc_info:
-            Endereco(
-                logradouro="Rua Teste",
-                numero="100",
-                bairro="Centro",
-                codigo_municipio=7221,
-                uf="RN",
-                cep="59000000",
-            )
-
-        assert "codigo_municipio deve ter 7 dígitos" in str(exc_info.value)
-
-    def test_rejects_code_with_more_than_7_digits(self):
-        """Deve rejeitar codigo com mais de 7 digitos."""
-        with pytest.raises(ValidationError) as exc_info:
-            Endereco(
-                logradouro="Rua Teste",
-                numero="100",
-                bairro="Centro",
-                codigo_municipio=35503080,
-                uf="SP",
-                cep="01310100",
-            )
-
-        assert "codigo_municipio deve ter 7 dígitos" in str(exc_info.value)
-
-
-class TestEnderecoUF:
-    """Testes para validacao da UF."""
-
-    def test_accepts_valid_uf(self):
-        """Deve aceitar UF valida."""
-        endereco = Endereco(
-            logradouro="Rua Teste",
-            numero="100",
-            bairro="Centro",
-            codigo_municipio=3550308,
-            uf="SP",
-            cep="01310100",
-        )
-
-        assert endereco.uf == "SP"
-
-    def test_accepts_lowercase_uf(self):
-        """Deve aceitar UF em minusculo e converter para maiusculo."""
-        endereco = Endereco(
-            logradouro="Rua Teste",
-            numero="100",
-            bairro="Centro",
-            codigo_municipio=3550308,
-            uf="sp",
-            cep="01310100",
-        )
-
-        assert endereco.uf == "SP"
-
-    def test_rejects_invalid_uf(self):
-        """Deve rejeitar UF invalida."""
-        with pytest.raises(ValidationError) as exc_info:
-            Endereco(
-                logradouro="Rua Teste",
-                numero="100",
-                bairro="Centro",
-                codigo_municipio=3550308,
-                uf="XX",
-                cep="01310100",
-            )
-
-        assert "UF inválida" in str(exc_info.value)
-
-
-class TestEnderecoCEP:
-    """Testes para validacao do CEP."""
-
-    def test_accepts_8_digit_cep(self):
-        """Deve aceitar CEP com 8 digitos."""
-        endereco = Endereco(
-            logradouro="Rua Teste",
-            numero="100",
-            bairro="Centro",
-            codigo_municipio=3550308,
-            uf="SP",
-            cep="01310100",
-        )
-
-        assert endereco.cep == "01310100"
-
-    def test_accepts_formatted_cep(self):
-        """Deve aceitar CEP formatado e limpar."""
-        endereco = Endereco(
-            logradouro="Rua Teste",
-            numero="100",
-            bairro="Centro",
-            codigo_municipio=3550308,
-            uf="SP",
-            cep="01310-100",
-        )
-
-        assert endereco.cep == "01310100"
-
-    def test_rejects_cep_with_wrong_length(self):
-        """Deve rejeitar CEP com tamanho errado."""
+_ENDERECO_KWARGS = {
+    "logradouro": "Rua Teste",
+    "numero": "100",
+    "bairro": "Centro",
+    "codigo_municipio": 3550308,
+    "uf": "SP",
+    "cep": "01310100",
+}
+
+
+class TestEnderecoFields:
+    """Testes para validacao de codigo_municipio, UF e CEP."""
+
+    @pytest.mark.parametrize(
+        "field, value, expected",
+        [
+            ("codigo_municipio", 3550308, 3550308),
+            ("uf", "SP", "SP"),
+            ("uf", "sp", "SP"),
+            ("cep", "01310100", "01310100"),
+            ("cep", "01310-100", "01310100"),
+        ],
+    )
+    def test_accepts_and_normalizes(self, field, value, expected):
+        """Deve aceitar valores validos e normalizar UF e CEP."""
+        endereco = Endereco(**{**_ENDERECO_KWARGS, field: value})
+
+        assert getattr(endereco, field) == expected
+
+    @pytest.mark.parametrize(
+        "field, value, message",
+        [
+            ("codigo_municipio", 7221, "codigo_municipio deve ter 7 dígitos"),
+            ("codigo_municipio", 35503080, "codigo_municipio deve ter 7 dígitos"),
+            ("uf", "XX", "UF inválida"),
+            ("cep", "1234567", "CEP deve conter 8 dígitos"),
+        ],
+    )
+    def test_rejects_invalid_value(self, field, value, message):
+        """Deve rejeitar codigo IBGE, UF ou CEP invalidos."""
         with pytest.raises(ValidationError) as exc_info:
-            Endereco(
-                logradouro="Rua Teste",
-                numero="100",
-                bairro="Centro",
-                codigo_municipio=3550308,
-                uf="SP",
-                cep="1234567",
-            )
+            Endereco(**{**_ENDERECO_KWARGS, field: value})
 
-        assert "CEP deve conter 8 dígitos" in str(exc_info.value)
+        assert message in str(exc_info.value)
 
 
 # =============================================================================
@@ -260,6 +179,22 @@ class TestPrestadorCNPJ:
         assert "1122233300018" not in str(exc_info.value)
         assert "1122233300018" not in str(exc_info.value)
 
+    def test_repeated_cnpj_reuses_cached_check(self, valid_endereco):
+        """Deve reaproveitar a verificacao de um CNPJ ja validado."""
+        _cnpj_digits_valid("11222333000181")
+        hits = _cnpj_digits_valid.cache_info().hits
+
+        Prestador(
+            cnpj="11.222.333/0001-81",
+            inscricao_municipal="12345",
+            razao_social="Empresa Teste",
+            endereco=valid_endereco,
+        )
+
+        assert _cnpj_digits_valid.cache_info().hits == hits + 1
+        assert _cnpj_digits_valid("11222333000199") is False
+        assert _cnpj_digits_valid("11222333000199") is False
+
 
 class TestPrestadorTelefone:
     """Testes para validacao do telefone do prestador."""
@@ -480,210 +415,81 @@ class TestServicoValorServicos:
 # =============================================================================
 
 
-class TestDPSSerie:
-    """Testes para validacao da serie."""
-
-    def test_accepts_numeric_serie(self, valid_prestador, valid_tomador, valid_servico):
-        """Deve aceitar serie numerica."""
-        dps = DPS(
-            serie="900",
-            numero=1,
-            competencia="2026-01",
-            data_emissao=datetime.now(),
-            prestador=valid_prestador,
-            tomador=valid_tomador,
-            servico=valid_servico,
-            regime_tributario="simples_nacional",
-        )
-
-        assert dps.serie == "900"
-
-    def test_rejects_alphabetic_serie(
-        self, valid_prestador, valid_tomador, valid_servico
-    ):
-        """Deve rejeitar serie alfabetica."""
-        with pytest.raises(ValidationError) as exc_info:
-            DPS(
-                serie="NF",
-                numero=1,
-                competencia="2026-01",
-                data_emissao=datetime.now(),
-                prestador=valid_prestador,
-                tomador=valid_tomador,
-                servico=valid_servico,
-                regime_tributario="simples_nacional",
-            )
-
-        assert "serie deve ser numérica" in str(exc_info.value)
-        assert "NF" not in str(exc_info.value)
-        assert "NF" not in str(exc_info.value)
-
-
-class TestDPSCompetencia:
-    """Testes para validacao da competencia."""
-
-    def test_accepts_valid_competencia(
-        self, valid_prestador, valid_tomador, valid_servico
-    ):
-        """Deve aceitar competencia valida."""
-        dps = DPS(
-            serie="900",
-            numero=1,
-            competencia="2026-01",
-            data_emissao=datetime.now(),
-            prestador=valid_prestador,
-            tomador=valid_tomador,
-            servico=valid_servico,
-            regime_tributario="simples_nacional",
-        )
-
-        assert dps.competencia == "2026-01"
-
-    def test_rejects_invalid_month(self, valid_prestador, valid_tomador, valid_servico):
-        """Deve rejeitar mes invalido."""
-        with pytest.raises(ValidationError) as exc_info:
-            DPS(
-                serie="900",
-                numero=1,
-                competencia="2026-13",
-                data_emissao=datetime.now(),
-                prestador=valid_prestador,
-                tomador=valid_tomador,
-                servico=valid_servico,
-                regime_tributario="simples_nacional",
-            )
-
-        assert "competência deve estar no formato YYYY-MM" in str(exc_info.value)
-
-    def test_rejects_wrong_format(self, valid_prestador, valid_tomador, valid_servico):
-        """Deve rejeitar formato errado."""
-        with pytest.raises(ValidationError) as exc_info:
-            DPS(
-                serie="900",
-                numero=1,
-                competencia="01/2026",
-                data_emissao=datetime.now(),
-                prestador=valid_prestador,
-                tomador=valid_tomador,
-                servico=valid_servico,
-                regime_tributario="simples_nacional",
-            )
-
-        assert "competência deve estar no formato YYYY-MM" in str(exc_info.value)
-
-
-class TestDPSRegimeTributario:
-    """Testes para validacao do regime_tributario."""
-
-    def test_accepts_valid_regime(self, valid_prestador, valid_tomador, valid_servico):
-        """Deve aceitar regime valido."""
-        dps = DPS(
-            serie="900",
-            numero=1,
-            competencia="2026-01",
-            data_emissao=datetime.now(),
-            prestador=valid_prestador,
-            tomador=valid_tomador,
-            servico=valid_servico,
-            regime_tributario="simples_nacional",
-        )
-
-        assert dps.regime_tributario == "simples_nacional"
-
-    def test_rejects_invalid_regime(
-        self, valid_prestador, valid_tomador, valid_servico
-    ):
-        """Deve rejeitar regime invalido."""
-        with pytest.raises(ValidationError) as exc_info:
-            DPS(
-                serie="900",
-                numero=1,
-                competencia="2026-01",
-                data_emissao=datetime.now(),
-                prestador=valid_prestador,
-                tomador=valid_tomador,
-                servico=valid_servico,
-                regime_tributario="invalido",
-            )
-
-        assert "regime_tributário inválido" in str(exc_info.value)
-
-
-class TestDPSIdDps:
-    """Testes para validacao do id_dps."""
-
-    def test_accepts_none(self, valid_prestador, valid_tomador, valid_servico):
-        """Deve aceitar id_dps None (auto-gerado)."""
-        dps = DPS(
-            serie="900",
-            numero=1,
-            competencia="2026-01",
-            data_emissao=datetime.now(),
-            prestador=valid_prestador,
-            tomador=valid_tomador,
-            servico=valid_servico,
-            regime_tributario="simples_nacional",
-        )
-
-        assert dps.id_dps is None
-
-    def test_accepts_valid_format(self, valid_prestador, valid_tomador, valid_servico):
-        """Deve aceitar formato valido de 45 caracteres."""
-        valid_id = "DPS350950221122233300018100900000000000000001"
-
-        dps = DPS(
-            id_dps=valid_id,
-            serie="900",
-            numero=1,
-            competencia="2026-01",
-            data_emissao=datetime.now(),
-            prestador=valid_prestador,
-            tomador=valid_tomador,
-            servico=valid_servico,
-            regime_tributario="simples_nacional",
-        )
-
-        assert dps.id_dps == valid_id
-
-    def test_rejects_missing_prefix(
-        self, valid_prestador, valid_tomador, valid_servico
+_VALID_ID_DPS = "DPS350950221122233300018100900000000000000001"
+
+
+@pytest.fixture(scope="module")
+def dps_kwargs(valid_prestador, valid_tomador, valid_servico):
+    """Argumentos de um DPS valido; os testes variam um campo por vez."""
+    return {
+        "serie": "900",
+        "numero": 1,
+        "competencia": "2026-01",
+        "data_emissao": _DATA_EMISSAO,
+        "prestador": valid_prestador,
+        "tomador": valid_tomador,
+        "servico": valid_servico,
+        "regime_tributario": "simples_nacional",
+    }
+
+
+class TestDPSFields:
+    """Testes para validacao de serie, competencia, regime_tributario e id_dps."""
+
+    @pytest.mark.parametrize(
+        "field, value",
+        [
+            ("serie", "900"),
+            ("competencia", "2026-01"),
+            ("regime_tributario", "simples_nacional"),
+            ("id_dps", None),
+            ("id_dps", _VALID_ID_DPS),
+        ],
+    )
+    def test_accepts_valid_value(self, dps_kwargs, field, value):
+        """Deve aceitar valores validos (id_dps None e auto-gerado)."""
+        dps = DPS(**{**dps_kwargs, field: value})
+
+        assert getattr(dps, field) == value
+
+    @pytest.mark.parametrize(
+        "field, value, message, hides_value",
+        [
+            ("serie", "NF", "serie deve ser numérica", True),
+            ("serie", "000900", "serie deve ser numérica (1-5 dígitos)", True),
+            (
+                "competencia",
+                "2026-13",
+                "competência deve estar no formato YYYY-MM",
+                False,
+            ),
+            (
+                "competencia",
+                "01/2026",
+                "competência deve estar no formato YYYY-MM",
+                False,
+            ),
+            ("regime_tributario", "invalido", "regime_tributário inválido", False),
+            (
+                "id_dps",
+                "350950221122233300018100900000000000000001",
+                "id_dps deve seguir o padrão",
+                True,
+            ),
+            ("id_dps", "DPS12345", "id_dps deve seguir o padrão", True),
+        ],
+    )
+    def test_rejects_invalid_value(
+        self, dps_kwargs, field, value, message, hides_value
     ):
-        """Deve rejeitar id sem prefixo DPS."""
+        """Deve rejeitar valores invalidos, sem ecoar documentos e ids."""
         with pytest.raises(ValidationError) as exc_info:
-            DPS(
-                id_dps="350950221122233300018100900000000000000001",
-                serie="900",
-                numero=1,
-                competencia="2026-01",
-                data_emissao=datetime.now(),
-                prestador=valid_prestador,
-                tomador=valid_tomador,
-                servico=valid_servico,
-                regime_tributario="simples_nacional",
-            )
+            DPS(**{**dps_kwargs, field: value})
 
-        assert "id_dps deve seguir o padrão" in str(exc_info.value)
-        assert "350950221122233300018100900000000000000001" not in str(exc_info.value)
-        assert "350950221122233300018100900000000000000001" not in str(exc_info.value)
-
-    def test_rejects_wrong_length(self, valid_prestador, valid_tomador, valid_servico):
-        """Deve rejeitar id com tamanho errado."""
-        with pytest.raises(ValidationError) as exc_info:
-            DPS(
-                id_dps="DPS12345",
-                serie="900",
-                numero=1,
-                competencia="2026-01",
-                data_emissao=datetime.now(),
-                prestador=valid_prestador,
-                tomador=valid_tomador,
-                servico=valid_servico,
-                regime_tributario="simples_nacional",
-            )
+        assert message in str(exc_info.value)
 
-        assert "id_dps deve seguir o padrão" in str(exc_info.value)
-        assert "DPS12345" not in str(exc_info.value)
-        assert "DPS12345" not in str(exc_info.value)
+        if hides_value:
+            assert value not in str(exc_info.value)
 
 
 class TestDPSOpSimpNac:
@@ -697,7 +503,7 @@ class TestDPSOpSimpNac:
                 serie="900",
                 numero=1,
                 competencia="2026-01",
-                data_emissao=datetime.now(),
+                data_emissao=_DATA_EMISSAO,
                 prestador=valid_prestador,
                 tomador=valid_tomador,
                 servico=valid_servico,
@@ -715,7 +521,7 @@ class TestDPSOpSimpNac:
             serie="900",
             numero=1,
             competencia="2026-01",
-            data_emissao=datetime.now(),
+            data_emissao=_DATA_EMISSAO,
             prestador=valid_prestador,
             tomador=valid_tomador,
             servico=valid_servico,
@@ -734,14 +540,14 @@ class TestDPSOpSimpNac:
             serie="900",
             numero=1,
             competencia="2026-01",
-            data_emissao=datetime.now(),
+            data_emissao=_DATA_EMISSAO,
             prestador=valid_prestador,
             tomador=valid_tomador,
             servico=valid_servico,
             regime_tributario="simples_nacional",
         )
 
-        assert dps.build_dps_id() == "DPS350950221122233300018100900000000000000001"
+        assert dps.build_dps_id() == _VALID_ID_DPS
 
     def test_build_dps_id_rejects_numero_overflow(
         self, valid_prestador, valid_tomador, valid_servico
@@ -750,7 +556,7 @@ class TestDPSOpSimpNac:
             serie="900",
             numero=10**15,
             competencia="2026-01",
-            data_emissao=datetime.now(),
+            data_emissao=_DATA_EMISSAO,
             prestador=valid_prestador,
             tomador=valid_tomador,
             servico=valid_servico,
@@ -767,7 +573,7 @@ class TestDPSOpSimpNac:
             serie="900",
             numero=999_999_999_999_999,
             competencia="2026-01",
-            data_emissao=datetime.now(),
+            data_emissao=_DATA_EMISSAO,
             prestador=valid_prestador,
             tomador=valid_tomador,
             servico=valid_servico,
@@ -784,7 +590,7 @@ class TestDPSOpSimpNac:
             serie="900",
             numero=1,
             competencia="2026-01",
-            data_emissao=datetime.now(),
+            data_emissao=_DATA_EMISSAO,
             prestador=valid_prestador,
             tomador=valid_tomador,
             servico=valid_servico,
@@ -801,7 +607,7 @@ class TestDPSOpSimpNac:
             serie="900",
             numero=1,
             competencia="2026-01",
-            data_emissao=datetime.now(),
+            data_emissao=_DATA_EMISSAO,
             prestador=valid_prestador,
             tomador=valid_tomador,
             servico=valid_servico,
@@ -819,7 +625,7 @@ class TestDPSOpSimpNac:
                 serie="900",
                 numero=1,
                 competencia="2026-01",
-                data_emissao=datetime.now(),
+                data_emissao=_DATA_EMISSAO,
                 prestador=valid_prestador,
                 tomador=valid_tomador,
                 servico=valid_servico,
@@ -837,7 +643,7 @@ class TestDPSOpSimpNac:
                 serie="900",
                 numero=1,
                 competencia="2026-01",
-                data_emissao=datetime.now(),
+                data_emissao=_DATA_EMISSAO,
                 prestador=valid_prestador,
                 tomador=valid_tomador,
                 servico=valid_servico,
@@ -857,7 +663,7 @@ class TestDPSOpSimpNac:
                 serie="900",
                 numero=1,
                 competencia="2026-01",
-                data_emissao=datetime.now(),
+                data_emissao=_DATA_EMISSAO,
                 prestador=valid_prestador,
                 tomador=valid_tomador,
                 servico=valid_servico,
@@ -878,7 +684,7 @@ class TestDPSOpSimpNac:
                 serie="900",
                 numero=1,
                 competencia="2026-01",
-                data_emissao=datetime.now(),
+                data_emissao=_DATA_EMISSAO,
                 prestador=valid_prestador,
                 tomador=valid_tomador,
                 servico=valid_servico,
@@ -894,7 +700,7 @@ class TestDPSOpSimpNac:
                 serie="900",
                 numero=1,
                 competencia="2026-01",
-                data_emissao=datetime.now(),
+                data_emissao=_DATA_EMISSAO,
                 prestador=valid_prestador,
                 tomador=valid_tomador,
                 servico=valid_servico,
@@ -1064,7 +870,7 @@ class TestDPSSubstituicao:
             serie="900",
             numero=2,
             competencia="2026-01",
-            data_emissao=datetime.now(),
+            data_emissao=_DATA_EMISSAO,
             prestador=valid_prestador,
             tomador=valid_tomador,
             servico=valid_servico,
@@ -1086,7 +892,7 @@ class TestDPSSubstituicao:
             serie="900",
             numero=1,
             competencia="2026-01",
-            data_emissao=datetime.now(),
+            data_emissao=_DATA_EMISSAO,
             prestador=valid_prestador,
             tomador=valid_tomador,
             servico=valid_servico,
@@ -6,6 +6,8 @@ Note: Some tests require the optional [pdf] dependencies (reportlab, qrcode).
 
 import base64
 import gzip
+import subprocess
+import sys
 from decimal import Decimal
 from unittest.mock import patch
 
@@ -27,9 +29,11 @@ try:
         _format_datetime,
         _format_percent,
         _format_phone,
+        _generate_qr_code,
         _get_retencao_issqn_desc,
         _get_simples_nacional_desc,
         _get_trib_issqn_desc,
+        generate_danfse_batch,
         generate_danfse_from_base64,
         generate_danfse_from_xml,
         generate_danfse_pdf,
@@ -205,6 +209,13 @@ class TestHeaderConfig:
 
         assert config.has_custom_header() is True
 
+    def test_rejects_unknown_attributes(self):
+        """Should use slots, so typos in field names fail loudly."""
+        config = HeaderConfig()
+
+        with pytest.raises(AttributeError):
+            config.tittle = "My Company"
+
 
 # =============================================================================
 # Tests: NFSeData
@@ -262,6 +273,18 @@ class TestFormatDatetime:
 
         assert "15/01/2026" in result
 
+    def test_handles_fractional_seconds(self):
+        """Should fall back to full parsing for less common shapes."""
+        result = _format_datetime("2026-01-15T10:30:00.123-03:00")
+
+        assert result == "15/01/2026 10:30:00"
+
+    def test_returns_unparseable_input_unchanged(self):
+        """Should return the original text when it is not a datetime."""
+        result = _format_datetime("not-a-date")
+
+        assert result == "not-a-date"
+
 
 class TestFormatDate:
     """Tests for _format_date function."""
@@ -577,6 +600,41 @@ class TestParseNfseXml:
 
         assert data.valor_servico == "500.00"
 
+    def test_parses_dps_tributacao(self):
+        """Should describe the DPS ISSQN tributation and retention codes."""
+        data = parse_nfse_xml(SAMPLE_NFSE_XML)
+
+        assert data.trib_issqn == "Operacao Tributavel"
+        assert data.retencao_issqn == "Nao Retido"
+
+    def test_dps_tributacao_defaults_when_missing(self):
+        """Should show "-" when tribISSQN and tpRetISSQN are absent."""
+        xml_content = SAMPLE_NFSE_XML.replace(
+            "<tribISSQN>1</tribISSQN>", ""
+        ).replace("<tpRetISSQN>1</tpRetISSQN>", "")
+        data = parse_nfse_xml(xml_content)
+
+        assert data.trib_issqn == "-"
+        assert data.retencao_issqn == "-"
+
+    def test_dps_tributacao_uses_first_tag_even_if_empty(self):
+        """Should not let a later tribISSQN override an empty first one."""
+        xml_content = SAMPLE_NFSE_XML.replace(
+            "<tribISSQN>1</tribISSQN>", "<tribISSQN/>"
+        ).replace("</trib>", "<tribISSQN>2</tribISSQN></trib>", 1)
+        data = parse_nfse_xml(xml_content)
+
+        assert data.trib_issqn == "-"
+
+    def test_parses_nfse_valores_after_dps(self):
+        """Should read infNFSe valores even when the DPS subtree comes first."""
+        data = parse_nfse_xml(SAMPLE_NFSE_XML)
+
+        assert data.bc_issqn == "500.00"
+        assert data.aliquota == "2.00"
+        assert data.issqn_apurado == "10.00"
+        assert data.valor_liquido == "500.00"
+
     def test_parses_cod_trib_nac(self):
         """Should extract national tributation code."""
         data = parse_nfse_xml(SAMPLE_NFSE_XML)
@@ -631,6 +689,41 @@ class TestParseNfseXml:
 # =============================================================================
 
 
+class TestGenerateQrCode:
+    """Tests for _generate_qr_code function."""
+
+    def test_returns_png_buffer(self):
+        """Should return a rewound PNG buffer."""
+        buffer = _generate_qr_code("1" * 50)
+
+        assert buffer.tell() == 0
+        assert buffer.read(8) == b"\x89PNG\r\n\x1a\n"
+
+    def test_falls_back_to_qrcode_without_segno(self):
+        """Should use qrcode when segno is not installed."""
+        pytest.importorskip("qrcode")
+
+        with patch("pynfse_nacional.pdf_generator.segno", None):
+            buffer = _generate_qr_code("1" * 50)
+
+        assert buffer.read(8) == b"\x89PNG\r\n\x1a\n"
+
+    def test_segno_and_qrcode_produce_same_version(self):
+        """Should render the same symbol size with either QR backend."""
+        pytest.importorskip("segno")
+        pytest.importorskip("qrcode")
+        from PIL import Image
+
+        chave = "35095022211222333000181000000000000124010000000011"
+        with Image.open(_generate_qr_code(chave)) as segno_img:
+            segno_size = segno_img.size
+        with patch("pynfse_nacional.pdf_generator.segno", None):
+            with Image.open(_generate_qr_code(chave)) as qrcode_img:
+                qrcode_size = qrcode_img.size
+
+        assert segno_size == qrcode_size
+
+
 class TestGenerateDanfsePdf:
     """Tests for generate_danfse_pdf function."""
 
@@ -678,6 +771,20 @@ class TestGenerateDanfsePdf:
         assert isinstance(result, bytes)
         assert len(result) > 0
 
+    def test_streams_to_output_path_without_bytes(self, tmp_path):
+        """Should write straight to output_path when bytes are not requested."""
+        data = NFSeData(
+            chave_acesso="12345678901234567890123456789012345678901234567890",
+        )
+        output_path = tmp_path / "danfse.pdf"
+
+        result = generate_danfse_pdf(
+            data, output_path=str(output_path), return_bytes=False
+        )
+
+        assert result is None
+        assert output_path.read_bytes()[:4] == b"%PDF"
+
 
 class TestGenerateDanfseFromXml:
     """Tests for generate_danfse_from_xml function."""
@@ -720,3 +827,76 @@ class TestGenerateDanfseFromBase64:
 
         assert isinstance(result, bytes)
         assert len(result) > 1000  # Should be a reasonable PDF size
+
+
+class TestGenerateDanfseBatch:
+    """Tests for generate_danfse_batch function."""
+
+    @staticmethod
+    def _encode(xml_content):
+        return base64.b64encode(gzip.compress(xml_content.encode("utf-8"))).decode()
+
+    def test_generates_pdfs_in_input_order(self):
+        """Should render every document in parallel, keeping input order."""
+        encoded = [
+            self._encode(SAMPLE_NFSE_XML),
+            self._encode(SAMPLE_NFSE_XML_WITH_TOTALS),
+        ]
+
+        result = generate_danfse_batch(encoded, workers=2)
+
+        assert len(result) == 2
+        assert all(pdf[:4] == b"%PDF" for pdf in result)
+        # PDFs embed a timestamp, so compare sizes to check ordering.
+        assert [len(pdf) for pdf in result] == [
+            len(generate_danfse_from_base64(item)) for item in encoded
+        ]
+
+    def test_saves_pdfs_named_by_chave_acesso(self, tmp_path):
+        """Should save each PDF under output_dir named by its access key."""
+        chave = parse_nfse_xml(SAMPLE_NFSE_XML).chave_acesso
+
+        result = generate_danfse_batch(
+            [self._encode(SAMPLE_NFSE_XML)], output_dir=str(tmp_path), workers=1
+        )
+
+        assert (tmp_path / f"{chave}.pdf").read_bytes() == result[0]
+
+    def test_streams_to_output_dir_and_returns_paths(self, tmp_path):
+        """Should send back only file paths when return_bytes is False."""
+        other_xml = SAMPLE_NFSE_XML.replace('Id="NFS1', 'Id="NFS9')
+        xmls = [SAMPLE_NFSE_XML, other_xml]
+        paths = [tmp_path / f"{parse_nfse_xml(xml).chave_acesso}.pdf" for xml in xmls]
+
+        result = generate_danfse_batch(
+            [self._encode(xml) for xml in xmls],
+            output_dir=str(tmp_path),
+            workers=2,
+            return_bytes=False,
+        )
+
+        assert result == [str(path) for path in paths]
+        assert all(path.read_bytes()[:4] == b"%PDF" for path in paths)
+
+
+class TestLazyPackageExports:
+    """Tests for the lazily imported PDF names on the package."""
+
+    def test_package_import_does_not_load_reportlab(self):
+        """Should defer ReportLab until a PDF name is accessed."""
+        code = (
+            "import sys, pynfse_nacional as p\n"
+            "assert 'reportlab' not in sys.modules\n"
+            "p.generate_danfse_pdf\n"
+            "assert 'reportlab' in sys.modules\n"
+        )
+
+        subprocess.run([sys.executable, "-c", code], check=True)
+
+    def test_package_exports_resolve_to_pdf_generator(self):
+        """Should expose the same objects as pynfse_nacional.pdf_generator."""
+        import pynfse_nacional
+
+        assert pynfse_nacional.generate_danfse_pdf is generate_danfse_pdf
+        assert pynfse_nacional.NFSeData is NFSeData
+        assert "generate_danfse_batch" in pynfse_nacional.__all__
@@ -1,13 +1,19 @@
 """Tests for utils module."""
 
+import base64
+import gzip
+import zlib
+
 import pytest
 
 from pynfse_nacional import ErrorCode
 from pynfse_nacional.exceptions import NFSeAPIError
 from pynfse_nacional.utils import (
+    _cnpj_digits_valid,
     clean_document,
     compress_and_encode,
     compress_encode,
+    compress_encode_bytes,
     decode_and_decompress,
     decode_decompress,
     format_cnpj,
@@ -15,10 +21,25 @@ from pynfse_nacional.utils import (
     is_valid_chave_acesso,
     normalize_document,
     validate_cnpj,
+    validate_cnpj_batch,
     validate_cpf,
 )
 
 
+@pytest.fixture(params=["stdlib", "isal"])
+def compression_backend(request, monkeypatch):
+    """Run against stdlib gzip/zlib and, when installed, python-isal."""
+    if request.param == "isal":
+        gzip_module = pytest.importorskip("isal.igzip")
+        zlib_module = pytest.importorskip("isal.isal_zlib")
+    else:
+        gzip_module, zlib_module = gzip, zlib
+
+    monkeypatch.setattr("pynfse_nacional.utils._gzip", gzip_module)
+    monkeypatch.setattr("pynfse_nacional.utils._zlib", zlib_module)
+    return request.param
+
+
 class TestCompression:
     """Tests for GZip compression and Base64 encoding."""
 
@@ -30,6 +51,30 @@ class TestCompression:
         assert isinstance(encoded, str)
         assert encoded != data
 
+    def test_compress_encode_is_deterministic(self):
+        """Test that equal input always encodes to the same payload."""
+        data = "<DPS>" * 50
+
+        assert compress_encode(data) == compress_encode(data)
+        assert base64.b64decode(compress_encode(data))[4:8] == b"\x00\x00\x00\x00"
+
+    def test_compress_encode_bytes_matches_str_variant(self):
+        """Test that pre-encoded input yields the same payload."""
+        data = "Serviço de consultoria"
+
+        assert compress_encode_bytes(data.encode("utf-8")) == compress_encode(data)
+
+    def test_compress_encode_roundtrip_per_backend(self, compression_backend):
+        """Test that each backend emits deterministic, standard GZip."""
+        data = "<DPS>Serviço de consultoria</DPS>" * 20
+        encoded = compress_encode(data)
+        compressed = base64.b64decode(encoded)
+
+        assert compressed[4:8] == b"\x00\x00\x00\x00"
+        assert gzip.decompress(compressed).decode("utf-8") == data
+        assert decode_decompress(encoded) == data
+        assert compress_encode(data) == encoded
+
     def test_decode_decompress_basic(self):
         """Test basic decoding and decompression."""
         original = "Hello, World!"
@@ -67,7 +112,9 @@ class TestCompression:
 
         assert decoded == data
 
-    def test_decode_decompress_rejects_oversized_payload(self, monkeypatch):
+    def test_decode_decompress_rejects_oversized_payload(
+        self, monkeypatch, compression_backend
+    ):
         """Test that decompression stops before exceeding the safety cap."""
         monkeypatch.setattr(
             "pynfse_nacional.utils.MAX_DECOMPRESSED_BYTES",
@@ -81,6 +128,40 @@ class TestCompression:
         assert exc_info.value.code == ErrorCode.PAYLOAD_TOO_LARGE
         assert "Conteúdo NFSe excede" in str(exc_info.value)
 
+    def test_decode_decompress_rejects_truncated_payload(self, compression_backend):
+        """Test that a gzip stream cut short is reported as a decode error."""
+        compressed = base64.b64decode(compress_encode("<NFSe>" * 100))
+        encoded = base64.b64encode(compressed[:-12]).decode("ascii")
+
+        with pytest.raises(NFSeAPIError) as exc_info:
+            decode_decompress(encoded)
+
+        assert exc_info.value.code == ErrorCode.DECODE_ERROR
+
+    def test_decode_decompress_concatenated_members(self, compression_backend):
+        """Test that multi-member gzip payloads are fully decoded."""
+        payload = gzip.compress(b"<a>") + gzip.compress(b"</a>")
+        encoded = base64.b64encode(payload).decode("ascii")
+
+        assert decode_decompress(encoded) == "<a></a>"
+
+    def test_decode_decompress_ignores_trailing_zero_padding(self, compression_backend):
+        """Test that NUL padding after the last member is accepted."""
+        payload = gzip.compress(b"<a/>") + b"\0\0\0\0"
+        encoded = base64.b64encode(payload).decode("ascii")
+
+        assert decode_decompress(encoded) == "<a/>"
+
+    def test_decode_decompress_rejects_trailing_garbage(self, compression_backend):
+        """Test that non-gzip bytes after a member are a decode error."""
+        payload = gzip.compress(b"<a/>") + b"garbage"
+        encoded = base64.b64encode(payload).decode("ascii")
+
+        with pytest.raises(NFSeAPIError) as exc_info:
+            decode_decompress(encoded)
+
+        assert exc_info.value.code == ErrorCode.DECODE_ERROR
+
 
 class TestChaveAcessoValidation:
     """Tests for shared 50-digit chave_acesso helper."""
@@ -119,6 +200,26 @@ class TestCNPJValidation:
         assert validate_cnpj("1122233300018") is False
         assert validate_cnpj("112223330001811") is False
 
+    def test_validate_cnpj_batch(self):
+        """Test batch validation keeps input order and repeated entries."""
+        cnpjs = [
+            "11222333000181",
+            "11222333000182",
+            "11.222.333/0001-81",
+            "11222333000181",
+        ]
+
+        assert validate_cnpj_batch(cnpjs) == [True, False, True, True]
+        assert validate_cnpj_batch(iter([])) == []
+
+    def test_formatted_and_clean_cnpj_share_cache_entry(self):
+        """Test the check-digit cache is keyed on the normalized digits."""
+        validate_cnpj("11222333000181")
+        hits = _cnpj_digits_valid.cache_info().hits
+
+        assert validate_cnpj("11.222.333/0001-81") is True
+        assert _cnpj_digits_valid.cache_info().hits == hits + 1
+
 
 class TestCPFValidation:
     """Tests for CPF validation."""
@@ -191,3 +292,7 @@ class TestNormalizeDocument:
     def test_normalize_already_clean(self):
         """Test normalizing already clean document."""
         assert normalize_document("11222333000181") == "11222333000181"
+
+    def test_normalize_drops_non_ascii_digits(self):
+        """Test that only ASCII digits survive normalization."""
+        assert normalize_document("11 222–333 ١") == "11222333"
@@ -5,29 +5,59 @@
 import warnings
 from datetime import datetime
 from decimal import Decimal
-from xml.etree import ElementTree as ET
 
 import pytest
+from lxml import etree
 
 from pynfse_nacional.constants import Ambiente
 from pynfse_nacional.models import DPS, SubstituicaoNFSe
 from pynfse_nacional.models_ibscbs import (
     GIBSCBS,
     IBSCBS,
+    DestIBSCBS,
+    EnderecoIBSCBS,
+    ImovelIBSCBS,
     RefNFSe,
     TribIBSCBS,
     ValoresIBSCBS,
 )
 from pynfse_nacional.xml_builder import XMLBuilder
 
+from ._helpers.models import make_endereco, make_prestador, make_servico, make_tomador
+
 NS = {"nfse": "http://www.sped.fazenda.gov.br/nfse"}
 
 # Structurally valid 50-digit chave (no real NFSe — used for XML structure tests only)
 SAMPLE_CHAVE = "99999999999999999999999999999999999999999999999999"
 
+# Id the sample_dps fixture generates (serie 900, numero 1)
+SAMPLE_DPS_ID = "DPS350950221122233300018100900000000000000001"
 
-@pytest.fixture
-def sample_ibscbs():
+_DATA_EMISSAO = datetime(2026, 1, 15, 10, 30, 0)
+
+# XMLBuilder only holds the ambiente, so tests share one per environment.
+_HOMOLOG_BUILDER = XMLBuilder(ambiente=Ambiente.HOMOLOGACAO)
+_PROD_BUILDER = XMLBuilder(ambiente=Ambiente.PRODUCAO)
+
+
+def _parse(xml_str: str) -> etree._Element:
+    """Parse builder output; lxml rejects str input with an encoding prolog."""
+    return etree.fromstring(xml_str.encode("utf-8"))
+
+
+def _compile_fields(fields: list[tuple[str, str]]) -> list:
+    """Compile each (path, expected) row once into an XPath selecting its text."""
+    return [
+        pytest.param(
+            etree.XPath(f"{path}/text()", namespaces=NS),
+            expected,
+            id=path.replace("nfse:", ""),
+        )
+        for path, expected in fields
+    ]
+
+
+def _make_ibscbs() -> IBSCBS:
     return IBSCBS(
         fin_nfse="0",
         c_ind_op="020101",
@@ -43,25 +73,43 @@ def sample_ibscbs():
     )
 
 
-@pytest.fixture
-def sample_dps(sample_prestador, sample_tomador, sample_servico, sample_ibscbs):
-    """Sample DPS for testing."""
+def _make_dps() -> DPS:
+    endereco = make_endereco()
     return DPS(
         serie="900",
         numero=1,
         competencia="2026-01",
-        data_emissao=datetime(2026, 1, 15, 10, 30, 0),
-        prestador=sample_prestador,
-        tomador=sample_tomador,
-        servico=sample_servico,
+        data_emissao=_DATA_EMISSAO,
+        prestador=make_prestador(endereco),
+        tomador=make_tomador(endereco),
+        servico=make_servico(),
         regime_tributario="simples_nacional",
         op_simp_nac="3",
         reg_ap_trib_sn="1",
-        ibscbs=sample_ibscbs,
+        ibscbs=_make_ibscbs(),
         incentivador_cultural=False,
     )
 
 
+@pytest.fixture
+def sample_dps():
+    """Sample DPS built fresh per test, so tests may mutate it."""
+    return _make_dps()
+
+
+@pytest.fixture(scope="module")
+def shared_dps():
+    """Sample DPS shared by the read-only tests of this module; never mutate it."""
+    return _make_dps()
+
+
+@pytest.fixture(scope="module")
+def default_built_root(shared_dps):
+    """shared_dps built once with the default builder, as (xml_str, root)."""
+    xml_str = _HOMOLOG_BUILDER.build_dps(shared_dps)
+    return xml_str, _parse(xml_str)
+
+
 class TestXMLBuilderInit:
     """Tests for XMLBuilder initialization."""
 
@@ -81,11 +129,9 @@ class TestXMLBuilderInit:
 class TestXMLBuilderBuildDPSId:
     """Tests for _build_dps_id method."""
 
-    def test_build_dps_id_format(self, sample_dps):
+    def test_build_dps_id_format(self, shared_dps):
         """_build_dps_id should return correct format."""
-        builder = XMLBuilder()
-
-        dps_id = builder._build_dps_id(sample_dps)
+        dps_id = _HOMOLOG_BUILDER._build_dps_id(shared_dps)
 
         # Format: DPS + cLocEmi(7) + tpInsc(1) + CNPJ(14) + serie(5) + nDPS(15)
         # cLocEmi: 3509502 (7 digits)
@@ -93,7 +139,7 @@ class TestXMLBuilderBuildDPSId:
         # CNPJ: 11222333000181 (14 digits)
         # serie: 00900 (5 digits, zero-padded)
         # nDPS: 000000000000001 (15 digits, zero-padded)
-        expected = "DPS350950221122233300018100900000000000000001"
+        expected = SAMPLE_DPS_ID
 
         assert dps_id == expected
         assert len(dps_id) == 45
@@ -102,55 +148,50 @@ class TestXMLBuilderBuildDPSId:
         """_build_dps_id should handle different values."""
         sample_dps.numero = 12345
         sample_dps.serie = "123"
-        builder = XMLBuilder()
 
-        dps_id = builder._build_dps_id(sample_dps)
+        dps_id = _HOMOLOG_BUILDER._build_dps_id(sample_dps)
 
         assert "00123" in dps_id
         assert "000000000012345" in dps_id
 
 
+_INF_DPS_FIELDS = [
+    ("nfse:infDPS/nfse:tpAmb", "2"),
+    ("nfse:infDPS/nfse:dhEmi", "2026-01-15T10:30:00-03:00"),
+    ("nfse:infDPS/nfse:serie", "900"),
+    ("nfse:infDPS/nfse:nDPS", "1"),
+    ("nfse:infDPS/nfse:dCompet", "2026-01-15"),
+    ("nfse:infDPS/nfse:cLocEmi", "3509502"),
+]
+
+
 class TestXMLBuilderBuildDPS:
     """Tests for build_dps method."""
 
-    def test_build_dps_returns_valid_xml(self, sample_dps):
-        """build_dps should return valid XML string."""
-        builder = XMLBuilder()
+    @pytest.mark.parametrize("xpath,expected", _compile_fields(_INF_DPS_FIELDS))
+    def test_build_dps_includes_field(self, default_built_root, xpath, expected):
+        """infDPS header fields should reflect the sample DPS."""
+        _, root = default_built_root
 
-        xml_str = builder.build_dps(sample_dps)
+        assert xpath(root) == [expected]
 
-        assert xml_str.startswith("<?xml version='1.0' encoding='utf-8'?>")
-
-        root = ET.fromstring(xml_str)
+    def test_build_dps_returns_valid_xml(self, default_built_root):
+        """build_dps should return valid XML string."""
+        xml_str, root = default_built_root
 
+        assert xml_str.startswith("<?xml version='1.0' encoding='utf-8'?>")
         assert root.tag == "{http://www.sped.fazenda.gov.br/nfse}DPS"
 
-    def test_build_dps_includes_namespace(self, sample_dps):
+    def test_build_dps_includes_namespace(self, default_built_root):
         """build_dps should include correct namespace."""
-        builder = XMLBuilder()
-
-        xml_str = builder.build_dps(sample_dps)
+        xml_str, _ = default_built_root
 
         assert "http://www.sped.fazenda.gov.br/nfse" in xml_str
 
-    def test_build_dps_sets_homolog_ambiente(self, sample_dps):
-        """build_dps should set tpAmb=2 for homologacao."""
-        builder = XMLBuilder(ambiente=Ambiente.HOMOLOGACAO)
-
-        xml_str = builder.build_dps(sample_dps)
-        root = ET.fromstring(xml_str)
-
-        infDPS = root.find("nfse:infDPS", NS)
-        tpAmb = infDPS.find("nfse:tpAmb", NS)
-
-        assert tpAmb.text == "2"
-
-    def test_build_dps_sets_prod_ambiente(self, sample_dps):
+    def test_build_dps_sets_prod_ambiente(self, shared_dps):
         """build_dps should set tpAmb=1 for producao."""
-        builder = XMLBuilder(ambiente=Ambiente.PRODUCAO)
-
-        xml_str = builder.build_dps(sample_dps)
-        root = ET.fromstring(xml_str)
+        xml_str = _PROD_BUILDER.build_dps(shared_dps)
+        root = _parse(xml_str)
 
         infDPS = root.find("nfse:infDPS", NS)
         tpAmb = infDPS.find("nfse:tpAmb", NS)
@@ -160,10 +201,9 @@ class TestXMLBuilderBuildDPS:
     def test_build_dps_generates_id_when_not_provided(self, sample_dps):
         """infDPS should have auto-generated Id when id_dps is None."""
         sample_dps.id_dps = None
-        builder = XMLBuilder()
 
-        xml_str = builder.build_dps(sample_dps)
-        root = ET.fromstring(xml_str)
+        xml_str = _HOMOLOG_BUILDER.build_dps(sample_dps)
+        root = _parse(xml_str)
 
         infDPS = root.find("nfse:infDPS", NS)
 
@@ -172,102 +212,42 @@ class TestXMLBuilderBuildDPS:
 
     def test_build_dps_uses_provided_id(self, sample_dps):
         """infDPS should use provided id_dps when set."""
-        sample_dps.id_dps = "DPS350950221122233300018100900000000000000001"
-        builder = XMLBuilder()
-
-        xml_str = builder.build_dps(sample_dps)
-        root = ET.fromstring(xml_str)
-
-        infDPS = root.find("nfse:infDPS", NS)
-
-        assert (
-            infDPS.attrib.get("Id") == "DPS350950221122233300018100900000000000000001"
-        )
-
-    def test_build_dps_includes_emission_date_with_timezone(self, sample_dps):
-        """build_dps should include dhEmi with ISO format and timezone."""
-        builder = XMLBuilder()
-
-        xml_str = builder.build_dps(sample_dps)
-        root = ET.fromstring(xml_str)
-
-        infDPS = root.find("nfse:infDPS", NS)
-        dhEmi = infDPS.find("nfse:dhEmi", NS)
-
-        assert dhEmi.text == "2026-01-15T10:30:00-03:00"
-
-    def test_build_dps_includes_serie_and_numero(self, sample_dps):
-        """build_dps should include serie and nDPS."""
-        builder = XMLBuilder()
-
-        xml_str = builder.build_dps(sample_dps)
-        root = ET.fromstring(xml_str)
-
-        infDPS = root.find("nfse:infDPS", NS)
-        serie = infDPS.find("nfse:serie", NS)
-        nDPS = infDPS.find("nfse:nDPS", NS)
-
-        assert serie.text == "900"
-        assert nDPS.text == "1"
-
-    def test_build_dps_includes_dcompet_as_date(self, sample_dps):
-        """build_dps should include dCompet as YYYY-MM-DD."""
-        builder = XMLBuilder()
+        sample_dps.id_dps = SAMPLE_DPS_ID
 
-        xml_str = builder.build_dps(sample_dps)
-        root = ET.fromstring(xml_str)
+        xml_str = _HOMOLOG_BUILDER.build_dps(sample_dps)
+        root = _parse(xml_str)
 
         infDPS = root.find("nfse:infDPS", NS)
-        dCompet = infDPS.find("nfse:dCompet", NS)
 
-        assert dCompet.text == "2026-01-15"
+        assert infDPS.attrib.get("Id") == SAMPLE_DPS_ID
 
-    def test_build_dps_includes_cloc_emi(self, sample_dps):
-        """build_dps should include cLocEmi with municipality code."""
-        builder = XMLBuilder()
-
-        xml_str = builder.build_dps(sample_dps)
-        root = ET.fromstring(xml_str)
-
-        infDPS = root.find("nfse:infDPS", NS)
-        cLocEmi = infDPS.find("nfse:cLocEmi", NS)
 
-        assert cLocEmi.text == "3509502"
+_PRESTADOR_FIELDS = [
+    ("nfse:infDPS/nfse:prest/nfse:CNPJ", "11222333000181"),
+    ("nfse:infDPS/nfse:prest/nfse:IM", "000000000012345"),
+    ("nfse:infDPS/nfse:prest/nfse:fone", "1999999999"),
+    ("nfse:infDPS/nfse:prest/nfse:email", "contato@clinica.com"),
+    ("nfse:infDPS/nfse:prest/nfse:regTrib/nfse:opSimpNac", "3"),
+    ("nfse:infDPS/nfse:prest/nfse:regTrib/nfse:regApTribSN", "1"),
+]
 
 
 class TestXMLBuilderPrestador:
     """Tests for prestador (service provider) section."""
 
-    def test_build_dps_includes_prestador_cnpj(self, sample_dps):
-        """Prestador section should include CNPJ."""
-        builder = XMLBuilder()
-
-        xml_str = builder.build_dps(sample_dps)
-        root = ET.fromstring(xml_str)
-
-        prest = root.find("nfse:infDPS/nfse:prest", NS)
-        cnpj = prest.find("nfse:CNPJ", NS)
+    @pytest.mark.parametrize("xpath,expected", _compile_fields(_PRESTADOR_FIELDS))
+    def test_build_dps_includes_field(self, default_built_root, xpath, expected):
+        """Prestador section should carry the sample prestador fields."""
+        _, root = default_built_root
 
-        assert cnpj.text == "11222333000181"
-
-    def test_build_dps_includes_prestador_im_zero_padded(self, sample_dps):
-        """Numeric prestador IM should use the CNC 15-character representation."""
-        builder = XMLBuilder()
-
-        xml_str = builder.build_dps(sample_dps)
-        root = ET.fromstring(xml_str)
-
-        prest = root.find("nfse:infDPS/nfse:prest", NS)
-        im = prest.find("nfse:IM", NS)
-
-        assert im.text == "000000000012345"
+        assert xpath(root) == [expected]
 
     def test_build_dps_strips_prestador_im_whitespace(self, sample_dps):
         """Submitted IM must not contain leading/trailing lookup whitespace."""
         sample_dps.prestador.inscricao_municipal = " 12345 "
 
-        xml_str = XMLBuilder().build_dps(sample_dps)
-        root = ET.fromstring(xml_str)
+        xml_str = _HOMOLOG_BUILDER.build_dps(sample_dps)
+        root = _parse(xml_str)
         im = root.find("nfse:infDPS/nfse:prest/nfse:IM", NS)
 
         assert im.text == "000000000012345"
@@ -275,63 +255,15 @@ class TestXMLBuilderPrestador:
     def test_build_dps_omits_im_when_missing(self, sample_dps):
         """Prestador section should omit IM when inscricao_municipal is not provided."""
         sample_dps.prestador.inscricao_municipal = None
-        builder = XMLBuilder()
 
-        xml_str = builder.build_dps(sample_dps)
-        root = ET.fromstring(xml_str)
+        xml_str = _HOMOLOG_BUILDER.build_dps(sample_dps)
+        root = _parse(xml_str)
 
         prest = root.find("nfse:infDPS/nfse:prest", NS)
         im = prest.find("nfse:IM", NS)
 
         assert im is None
 
-    def test_build_dps_includes_prestador_fone(self, sample_dps):
-        """Prestador section should include fone."""
-        builder = XMLBuilder()
-
-        xml_str = builder.build_dps(sample_dps)
-        root = ET.fromstring(xml_str)
-
-        prest = root.find("nfse:infDPS/nfse:prest", NS)
-        fone = prest.find("nfse:fone", NS)
-
-        assert fone.text == "1999999999"
-
-    def test_build_dps_includes_prestador_email(self, sample_dps):
-        """Prestador section should include email."""
-        builder = XMLBuilder()
-
-        xml_str = builder.build_dps(sample_dps)
-        root = ET.fromstring(xml_str)
-
-        prest = root.find("nfse:infDPS/nfse:prest", NS)
-        email = prest.find("nfse:email", NS)
-
-        assert email.text == "contato@clinica.com"
-
-    def test_build_dps_includes_regtrib(self, sample_dps):
-        """Prestador section should include regTrib element."""
-        builder = XMLBuilder()
-
-        xml_str = builder.build_dps(sample_dps)
-        root = ET.fromstring(xml_str)
-
-        prest = root.find("nfse:infDPS/nfse:prest", NS)
-        regTrib = prest.find("nfse:regTrib", NS)
-
-        assert regTrib is not None
-
-    def test_build_dps_opsimpnac_for_simples(self, sample_dps):
-        """opSimpNac should be 3 for optante simples (ME/EPP)."""
-        builder = XMLBuilder()
-
-        xml_str = builder.build_dps(sample_dps)
-        root = ET.fromstring(xml_str)
-
-        opSimpNac = root.find("nfse:infDPS/nfse:prest/nfse:regTrib/nfse:opSimpNac", NS)
-
-        assert opSimpNac.text == "3"
-
     def test_build_dps_opsimpnac_for_non_simples(self, sample_dps):
         """opSimpNac should be 1 for non-optante."""
         sample_dps = DPS(
@@ -341,34 +273,17 @@ class TestXMLBuilderPrestador:
                 "reg_ap_trib_sn": None,
             }
         )
-        builder = XMLBuilder()
 
-        xml_str = builder.build_dps(sample_dps)
-        root = ET.fromstring(xml_str)
+        xml_str = _HOMOLOG_BUILDER.build_dps(sample_dps)
+        root = _parse(xml_str)
 
         opSimpNac = root.find("nfse:infDPS/nfse:prest/nfse:regTrib/nfse:opSimpNac", NS)
 
         assert opSimpNac.text == "1"
 
-    def test_build_dps_regaptribsn_for_simples(self, sample_dps):
-        """regApTribSN should be 1 for Simples Nacional."""
-        builder = XMLBuilder()
-
-        xml_str = builder.build_dps(sample_dps)
-        root = ET.fromstring(xml_str)
-
-        regApTribSN = root.find(
-            "nfse:infDPS/nfse:prest/nfse:regTrib/nfse:regApTribSN", NS
-        )
-
-        assert regApTribSN.text == "1"
-
-    def test_build_dps_regapibscbssn_never_emitted(self, sample_dps):
+    def test_build_dps_regapibscbssn_never_emitted(self, default_built_root):
         """regApIBSCBSSN must never appear; official TCRegTrib rejects it."""
-        builder = XMLBuilder()
-
-        xml_str = builder.build_dps(sample_dps)
-        root = ET.fromstring(xml_str)
+        _, root = default_built_root
 
         regApIBSCBSSN = root.find(
             "nfse:infDPS/nfse:prest/nfse:regTrib/nfse:regApIBSCBSSN", NS
@@ -385,10 +300,9 @@ class TestXMLBuilderPrestador:
                 "reg_ap_trib_sn": None,
             }
         )
-        builder = XMLBuilder()
 
-        xml_str = builder.build_dps(sample_dps)
-        root = ET.fromstring(xml_str)
+        xml_str = _HOMOLOG_BUILDER.build_dps(sample_dps)
+        root = _parse(xml_str)
 
         regApTribSN = root.find(
             "nfse:infDPS/nfse:prest/nfse:regTrib/nfse:regApTribSN", NS
@@ -399,10 +313,9 @@ class TestXMLBuilderPrestador:
     def test_build_dps_regesptrib_default(self, sample_dps):
         """regEspTrib should default to 0."""
         sample_dps = sample_dps.model_copy(update={"regime_tributario": "unknown"})
-        builder = XMLBuilder()
 
-        xml_str = builder.build_dps(sample_dps)
-        root = ET.fromstring(xml_str)
+        xml_str = _HOMOLOG_BUILDER.build_dps(sample_dps)
+        root = _parse(xml_str)
 
         regEspTrib = root.find(
             "nfse:infDPS/nfse:prest/nfse:regTrib/nfse:regEspTrib", NS
@@ -413,10 +326,9 @@ class TestXMLBuilderPrestador:
     def test_build_dps_regesptrib_mei(self, sample_dps):
         """regEspTrib should be 4 for MEI."""
         sample_dps.regime_tributario = "mei"
-        builder = XMLBuilder()
 
-        xml_str = builder.build_dps(sample_dps)
-        root = ET.fromstring(xml_str)
+        xml_str = _HOMOLOG_BUILDER.build_dps(sample_dps)
+        root = _parse(xml_str)
 
         regEspTrib = root.find(
             "nfse:infDPS/nfse:prest/nfse:regTrib/nfse:regEspTrib", NS
@@ -425,29 +337,35 @@ class TestXMLBuilderPrestador:
         assert regEspTrib.text == "4"
 
 
+_TOMADOR_FIELDS = [
+    ("nfse:infDPS/nfse:toma/nfse:CPF", "52998224725"),
+    ("nfse:infDPS/nfse:toma/nfse:xNome", "Joao Silva"),
+    ("nfse:infDPS/nfse:toma/nfse:end/nfse:endNac/nfse:cMun", "3509502"),
+    ("nfse:infDPS/nfse:toma/nfse:end/nfse:endNac/nfse:CEP", "13000000"),
+    ("nfse:infDPS/nfse:toma/nfse:end/nfse:xLgr", "Rua Teste"),
+    ("nfse:infDPS/nfse:toma/nfse:end/nfse:nro", "100"),
+    ("nfse:infDPS/nfse:toma/nfse:end/nfse:xCpl", "Sala 1"),
+    ("nfse:infDPS/nfse:toma/nfse:end/nfse:xBairro", "Centro"),
+]
+
+
 class TestXMLBuilderTomador:
     """Tests for tomador (service taker) section."""
 
-    def test_build_dps_includes_tomador_cpf(self, sample_dps):
-        """Tomador section should include CPF when provided."""
-        builder = XMLBuilder()
+    @pytest.mark.parametrize("xpath,expected", _compile_fields(_TOMADOR_FIELDS))
+    def test_build_dps_includes_field(self, default_built_root, xpath, expected):
+        """Tomador section should carry the sample tomador and its address."""
+        _, root = default_built_root
 
-        xml_str = builder.build_dps(sample_dps)
-        root = ET.fromstring(xml_str)
-
-        toma = root.find("nfse:infDPS/nfse:toma", NS)
-        cpf = toma.find("nfse:CPF", NS)
-
-        assert cpf.text == "52998224725"
+        assert xpath(root) == [expected]
 
     def test_build_dps_includes_tomador_cnpj(self, sample_dps):
         """Tomador section should include CNPJ when CPF is None."""
         sample_dps.tomador.cpf = None
         sample_dps.tomador.cnpj = "11222333000181"
-        builder = XMLBuilder()
 
-        xml_str = builder.build_dps(sample_dps)
-        root = ET.fromstring(xml_str)
+        xml_str = _HOMOLOG_BUILDER.build_dps(sample_dps)
+        root = _parse(xml_str)
 
         toma = root.find("nfse:infDPS/nfse:toma", NS)
         cnpj = toma.find("nfse:CNPJ", NS)
@@ -456,42 +374,12 @@ class TestXMLBuilderTomador:
         assert cnpj.text == "11222333000181"
         assert cpf is None
 
-    def test_build_dps_includes_tomador_xnome(self, sample_dps):
-        """Tomador section should include xNome."""
-        builder = XMLBuilder()
-
-        xml_str = builder.build_dps(sample_dps)
-        root = ET.fromstring(xml_str)
-
-        toma = root.find("nfse:infDPS/nfse:toma", NS)
-        xNome = toma.find("nfse:xNome", NS)
-
-        assert xNome.text == "Joao Silva"
-
-    def test_build_dps_includes_tomador_address(self, sample_dps):
-        """Tomador section should include address with endNac."""
-        builder = XMLBuilder()
-
-        xml_str = builder.build_dps(sample_dps)
-        root = ET.fromstring(xml_str)
-
-        end = root.find("nfse:infDPS/nfse:toma/nfse:end", NS)
-        endNac = end.find("nfse:endNac", NS)
-
-        assert endNac.find("nfse:cMun", NS).text == "3509502"
-        assert endNac.find("nfse:CEP", NS).text == "13000000"
-        assert end.find("nfse:xLgr", NS).text == "Rua Teste"
-        assert end.find("nfse:nro", NS).text == "100"
-        assert end.find("nfse:xCpl", NS).text == "Sala 1"
-        assert end.find("nfse:xBairro", NS).text == "Centro"
-
     def test_build_dps_omits_tomador_address_if_none(self, sample_dps):
         """Tomador should omit end if address is None."""
         sample_dps.tomador.endereco = None
-        builder = XMLBuilder()
 
-        xml_str = builder.build_dps(sample_dps)
-        root = ET.fromstring(xml_str)
+        xml_str = _HOMOLOG_BUILDER.build_dps(sample_dps)
+        root = _parse(xml_str)
 
         toma = root.find("nfse:infDPS/nfse:toma", NS)
         end = toma.find("nfse:end", NS)
@@ -499,93 +387,58 @@ class TestXMLBuilderTomador:
         assert end is None
 
 
-class TestXMLBuilderServico:
-    """Tests for servico section."""
-
-    def test_build_dps_includes_loc_prest(self, sample_dps):
-        """Servico section should include locPrest."""
-        builder = XMLBuilder()
-
-        xml_str = builder.build_dps(sample_dps)
-        root = ET.fromstring(xml_str)
-
-        locPrest = root.find("nfse:infDPS/nfse:serv/nfse:locPrest", NS)
-        cLocPrestacao = locPrest.find("nfse:cLocPrestacao", NS)
+_SERVICO_FIELDS = [
+    ("nfse:infDPS/nfse:serv/nfse:locPrest/nfse:cLocPrestacao", "3509502"),
+    ("nfse:infDPS/nfse:serv/nfse:cServ/nfse:cTribNac", "040303"),
+    # "04.03.03" -> "40303" -> "040303" (6 digits)
+    ("nfse:infDPS/nfse:serv/nfse:cServ/nfse:cTribMun", "123456"),
+    ("nfse:infDPS/nfse:serv/nfse:cServ/nfse:xDescServ", "Consulta medica"),
+    ("nfse:infDPS/nfse:serv/nfse:cServ/nfse:cNBS", "101010100"),
+]
 
-        assert cLocPrestacao.text == "3509502"
 
-    def test_build_dps_includes_ctribnac(self, sample_dps):
-        """Servico section should include cTribNac.
-
-        LC116 code without dots, 6 digits.
-        """
-        builder = XMLBuilder()
-
-        xml_str = builder.build_dps(sample_dps)
-        root = ET.fromstring(xml_str)
-
-        cServ = root.find("nfse:infDPS/nfse:serv/nfse:cServ", NS)
-        cTribNac = cServ.find("nfse:cTribNac", NS)
-
-        # "4.03.03" -> "40303" -> "040303" (6 digits)
-        assert cTribNac.text == "040303"
-
-    def test_build_dps_includes_ctribmun(self, sample_dps):
-        """Servico section should include cTribMun when provided."""
-        builder = XMLBuilder()
+class TestXMLBuilderServico:
+    """Tests for servico section."""
 
-        xml_str = builder.build_dps(sample_dps)
-        root = ET.fromstring(xml_str)
+    @pytest.mark.parametrize("xpath,expected", _compile_fields(_SERVICO_FIELDS))
+    def test_build_dps_includes_field(self, default_built_root, xpath, expected):
+        """Servico section should carry the sample servico fields."""
+        _, root = default_built_root
 
-        cServ = root.find("nfse:infDPS/nfse:serv/nfse:cServ", NS)
-        cTribMun = cServ.find("nfse:cTribMun", NS)
-
-        assert cTribMun.text == "123456"
+        assert xpath(root) == [expected]
 
     def test_build_dps_omits_ctribmun_when_none(self, sample_dps):
         """Servico section should omit cTribMun when not provided."""
         sample_dps.servico.codigo_tributacao_municipal = None
-        builder = XMLBuilder()
 
-        xml_str = builder.build_dps(sample_dps)
-        root = ET.fromstring(xml_str)
+        xml_str = _HOMOLOG_BUILDER.build_dps(sample_dps)
+        root = _parse(xml_str)
 
         cServ = root.find("nfse:infDPS/nfse:serv/nfse:cServ", NS)
         cTribMun = cServ.find("nfse:cTribMun", NS)
 
         assert cTribMun is None
 
-    def test_build_dps_includes_xdescserv(self, sample_dps):
-        """Servico section should include xDescServ."""
-        builder = XMLBuilder()
-
-        xml_str = builder.build_dps(sample_dps)
-        root = ET.fromstring(xml_str)
-
-        cServ = root.find("nfse:infDPS/nfse:serv/nfse:cServ", NS)
-        xDescServ = cServ.find("nfse:xDescServ", NS)
-
-        assert xDescServ.text == "Consulta medica"
-
-    def test_build_dps_includes_cnbs(self, sample_dps):
-        """Servico section should include cNBS when provided."""
-        builder = XMLBuilder()
+    def test_build_dps_escapes_free_text(self, sample_dps):
+        """Markup characters in free-text fields should be escaped."""
+        sample_dps.servico.discriminacao = "Consulta <retorno> & exames"
+        sample_dps.tomador.razao_social = "Silva & Filhos <ME>"
 
-        xml_str = builder.build_dps(sample_dps)
-        root = ET.fromstring(xml_str)
+        xml_str = _HOMOLOG_BUILDER.build_dps(sample_dps)
+        root = _parse(xml_str)
 
-        cServ = root.find("nfse:infDPS/nfse:serv/nfse:cServ", NS)
-        cNBS = cServ.find("nfse:cNBS", NS)
+        xDescServ = root.find("nfse:infDPS/nfse:serv/nfse:cServ/nfse:xDescServ", NS)
+        xNome = root.find("nfse:infDPS/nfse:toma/nfse:xNome", NS)
 
-        assert cNBS.text == "101010100"
+        assert xDescServ.text == "Consulta <retorno> & exames"
+        assert xNome.text == "Silva & Filhos <ME>"
 
     def test_build_dps_omits_cnbs_when_none(self, sample_dps):
         """Servico section should omit cNBS when not provided."""
         sample_dps.servico.codigo_nbs = None
-        builder = XMLBuilder()
 
-        xml_str = builder.build_dps(sample_dps)
-        root = ET.fromstring(xml_str)
+        xml_str = _HOMOLOG_BUILDER.build_dps(sample_dps)
+        root = _parse(xml_str)
 
         cServ = root.find("nfse:infDPS/nfse:serv/nfse:cServ", NS)
         cNBS = cServ.find("nfse:cNBS", NS)
@@ -593,40 +446,28 @@ class TestXMLBuilderServico:
         assert cNBS is None
 
 
-class TestXMLBuilderValores:
-    """Tests for valores (values) section."""
-
-    def test_build_dps_includes_vserv(self, sample_dps):
-        """Valores section should include vServ."""
-        builder = XMLBuilder()
+_VALORES_FIELDS = [
+    ("nfse:infDPS/nfse:valores/nfse:vServPrest/nfse:vServ", "500.00"),
+    ("nfse:infDPS/nfse:valores/nfse:trib/nfse:tribMun/nfse:tribISSQN", "1"),
+]
 
-        xml_str = builder.build_dps(sample_dps)
-        root = ET.fromstring(xml_str)
 
-        vServPrest = root.find("nfse:infDPS/nfse:valores/nfse:vServPrest", NS)
-        vServ = vServPrest.find("nfse:vServ", NS)
-
-        assert vServ.text == "500.00"
-
-    def test_build_dps_includes_tribissqn(self, sample_dps):
-        """Valores section should include tribISSQN=1."""
-        builder = XMLBuilder()
-
-        xml_str = builder.build_dps(sample_dps)
-        root = ET.fromstring(xml_str)
+class TestXMLBuilderValores:
+    """Tests for valores (values) section."""
 
-        tribMun = root.find("nfse:infDPS/nfse:valores/nfse:trib/nfse:tribMun", NS)
-        tribISSQN = tribMun.find("nfse:tribISSQN", NS)
+    @pytest.mark.parametrize("xpath,expected", _compile_fields(_VALORES_FIELDS))
+    def test_build_dps_includes_field(self, default_built_root, xpath, expected):
+        """Valores section should carry the sample values."""
+        _, root = default_built_root
 
-        assert tribISSQN.text == "1"
+        assert xpath(root) == [expected]
 
     def test_build_dps_tpretissqn_not_retained(self, sample_dps):
         """tpRetISSQN should be 1 when ISS not retained."""
         sample_dps.servico.iss_retido = False
-        builder = XMLBuilder()
 
-        xml_str = builder.build_dps(sample_dps)
-        root = ET.fromstring(xml_str)
+        xml_str = _HOMOLOG_BUILDER.build_dps(sample_dps)
+        root = _parse(xml_str)
 
         tribMun = root.find("nfse:infDPS/nfse:valores/nfse:trib/nfse:tribMun", NS)
         tpRetISSQN = tribMun.find("nfse:tpRetISSQN", NS)
@@ -636,10 +477,9 @@ class TestXMLBuilderValores:
     def test_build_dps_tpretissqn_retained(self, sample_dps):
         """tpRetISSQN should be 2 when ISS retained."""
         sample_dps.servico.iss_retido = True
-        builder = XMLBuilder()
 
-        xml_str = builder.build_dps(sample_dps)
-        root = ET.fromstring(xml_str)
+        xml_str = _HOMOLOG_BUILDER.build_dps(sample_dps)
+        root = _parse(xml_str)
 
         tribMun = root.find("nfse:infDPS/nfse:valores/nfse:trib/nfse:tribMun", NS)
         tpRetISSQN = tribMun.find("nfse:tpRetISSQN", NS)
@@ -650,10 +490,9 @@ class TestXMLBuilderValores:
         """pTotTribSN should be set for Simples Nacional."""
         sample_dps.op_simp_nac = "3"
         sample_dps.servico.aliquota_simples = Decimal("15.50")
-        builder = XMLBuilder()
 
-        xml_str = builder.build_dps(sample_dps)
-        root = ET.fromstring(xml_str)
+        xml_str = _HOMOLOG_BUILDER.build_dps(sample_dps)
+        root = _parse(xml_str)
 
         totTrib = root.find("nfse:infDPS/nfse:valores/nfse:trib/nfse:totTrib", NS)
         pTotTribSN = totTrib.find("nfse:pTotTribSN", NS)
@@ -664,13 +503,12 @@ class TestXMLBuilderValores:
         """pTotTribSN should default to 18.83 with warning when not provided."""
         sample_dps.op_simp_nac = "3"
         sample_dps.servico.aliquota_simples = None
-        builder = XMLBuilder()
 
         with warnings.catch_warnings(record=True) as w:
             warnings.simplefilter("always")
 
-            xml_str = builder.build_dps(sample_dps)
-            root = ET.fromstring(xml_str)
+            xml_str = _HOMOLOG_BUILDER.build_dps(sample_dps)
+            root = _parse(xml_str)
 
             totTrib = root.find("nfse:infDPS/nfse:valores/nfse:trib/nfse:totTrib", NS)
             pTotTribSN = totTrib.find("nfse:pTotTribSN", NS)
@@ -688,10 +526,9 @@ class TestXMLBuilderValores:
                 "reg_ap_trib_sn": None,
             }
         )
-        builder = XMLBuilder()
 
-        xml_str = builder.build_dps(sample_dps)
-        root = ET.fromstring(xml_str)
+        xml_str = _HOMOLOG_BUILDER.build_dps(sample_dps)
+        root = _parse(xml_str)
 
         totTrib = root.find("nfse:infDPS/nfse:valores/nfse:trib/nfse:totTrib", NS)
         pTotTrib = totTrib.find("nfse:pTotTrib", NS)
@@ -702,11 +539,8 @@ class TestXMLBuilderValores:
 
 
 class TestXMLBuilderIBSCBS:
-    def test_build_dps_includes_ibscbs_after_valores(self, sample_dps):
-        builder = XMLBuilder()
-
-        xml_str = builder.build_dps(sample_dps)
-        root = ET.fromstring(xml_str)
+    def test_build_dps_includes_ibscbs_after_valores(self, default_built_root):
+        _, root = default_built_root
 
         infDPS = root.find("nfse:infDPS", NS)
         children = list(infDPS)
@@ -714,11 +548,8 @@ class TestXMLBuilderIBSCBS:
         assert children[-2].tag.endswith("valores")
         assert children[-1].tag.endswith("IBSCBS")
 
-    def test_build_dps_includes_ibscbs_core_fields(self, sample_dps):
-        builder = XMLBuilder()
-
-        xml_str = builder.build_dps(sample_dps)
-        root = ET.fromstring(xml_str)
+    def test_build_dps_includes_ibscbs_core_fields(self, default_built_root):
+        _, root = default_built_root
 
         ibscbs = root.find("nfse:infDPS/nfse:IBSCBS", NS)
 
@@ -734,10 +565,9 @@ class TestXMLBuilderIBSCBS:
                 "12345678901234567890123456789012345678901234567890",
             ]
         )
-        builder = XMLBuilder()
 
-        xml_str = builder.build_dps(sample_dps)
-        root = ET.fromstring(xml_str)
+        xml_str = _HOMOLOG_BUILDER.build_dps(sample_dps)
+        root = _parse(xml_str)
 
         gRefNFSe = root.find("nfse:infDPS/nfse:IBSCBS/nfse:gRefNFSe", NS)
         refs = gRefNFSe.findall("nfse:refNFSe", NS)
@@ -745,6 +575,38 @@ class TestXMLBuilderIBSCBS:
         assert len(refs) == 1
         assert refs[0].text == "12345678901234567890123456789012345678901234567890"
 
+    def test_build_dps_ibscbs_end_matches_tomador_end(self, sample_dps):
+        endereco = make_endereco().model_copy(
+            update={"logradouro": "Rua A & B <Fundos>"}
+        )
+        endereco_ibscbs = EnderecoIBSCBS(
+            **endereco.model_dump(
+                include={
+                    "logradouro",
+                    "numero",
+                    "complemento",
+                    "bairro",
+                    "codigo_municipio",
+                    "cep",
+                }
+            )
+        )
+        sample_dps.tomador.endereco = endereco
+        sample_dps.ibscbs.dest = DestIBSCBS(
+            cpf="52998224725", x_nome="Joao Silva", end=endereco_ibscbs
+        )
+        sample_dps.ibscbs.imovel = ImovelIBSCBS(end=endereco_ibscbs)
+
+        root = _parse(_HOMOLOG_BUILDER.build_dps(sample_dps))
+        expected = etree.tostring(root.find("nfse:infDPS/nfse:toma/nfse:end", NS))
+
+        for path in (
+            "nfse:IBSCBS/nfse:dest/nfse:end",
+            "nfse:IBSCBS/nfse:imovel/nfse:end",
+        ):
+            end = root.find(f"nfse:infDPS/{path}", NS)
+            assert etree.tostring(end) == expected
+
 
 class TestXMLBuilderSubstituicao:
     """Tests for substituicao (substitution) section."""
@@ -763,10 +625,9 @@ class TestXMLBuilderSubstituicao:
     ):
         """DPS should include subst element when substituicao is present."""
         sample_dps.substituicao = sample_substituicao
-        builder = XMLBuilder()
 
-        xml_str = builder.build_dps(sample_dps)
-        root = ET.fromstring(xml_str)
+        xml_str = _HOMOLOG_BUILDER.build_dps(sample_dps)
+        root = _parse(xml_str)
 
         subst = root.find("nfse:infDPS/nfse:subst", NS)
 
@@ -775,10 +636,9 @@ class TestXMLBuilderSubstituicao:
     def test_build_dps_includes_chsubstda(self, sample_dps, sample_substituicao):
         """subst should include chSubstda with original NFSe access key."""
         sample_dps.substituicao = sample_substituicao
-        builder = XMLBuilder()
 
-        xml_str = builder.build_dps(sample_dps)
-        root = ET.fromstring(xml_str)
+        xml_str = _HOMOLOG_BUILDER.build_dps(sample_dps)
+        root = _parse(xml_str)
 
         chSubstda = root.find("nfse:infDPS/nfse:subst/nfse:chSubstda", NS)
 
@@ -787,10 +647,9 @@ class TestXMLBuilderSubstituicao:
     def test_build_dps_includes_cmotivo(self, sample_dps, sample_substituicao):
         """subst should include cMotivo with reason code."""
         sample_dps.substituicao = sample_substituicao
-        builder = XMLBuilder()
 
-        xml_str = builder.build_dps(sample_dps)
-        root = ET.fromstring(xml_str)
+        xml_str = _HOMOLOG_BUILDER.build_dps(sample_dps)
+        root = _parse(xml_str)
 
         cMotivo = root.find("nfse:infDPS/nfse:subst/nfse:cMotivo", NS)
 
@@ -799,10 +658,9 @@ class TestXMLBuilderSubstituicao:
     def test_build_dps_includes_xmotivo(self, sample_dps, sample_substituicao):
         """subst should include xMotivo with reason description."""
         sample_dps.substituicao = sample_substituicao
-        builder = XMLBuilder()
 
-        xml_str = builder.build_dps(sample_dps)
-        root = ET.fromstring(xml_str)
+        xml_str = _HOMOLOG_BUILDER.build_dps(sample_dps)
+        root = _parse(xml_str)
 
         xMotivo = root.find("nfse:infDPS/nfse:subst/nfse:xMotivo", NS)
 
@@ -811,10 +669,9 @@ class TestXMLBuilderSubstituicao:
     def test_build_dps_subst_comes_before_prest(self, sample_dps, sample_substituicao):
         """subst element should come before prest in XML structure."""
         sample_dps.substituicao = sample_substituicao
-        builder = XMLBuilder()
 
-        xml_str = builder.build_dps(sample_dps)
-        root = ET.fromstring(xml_str)
+        xml_str = _HOMOLOG_BUILDER.build_dps(sample_dps)
+        root = _parse(xml_str)
 
         infDPS = root.find("nfse:infDPS", NS)
         children = list(infDPS)
@@ -836,10 +693,9 @@ class TestXMLBuilderSubstituicao:
     def test_build_dps_omits_subst_when_no_substituicao(self, sample_dps):
         """DPS should not include subst when substituicao is None."""
         sample_dps.substituicao = None
-        builder = XMLBuilder()
 
-        xml_str = builder.build_dps(sample_dps)
-        root = ET.fromstring(xml_str)
+        xml_str = _HOMOLOG_BUILDER.build_dps(sample_dps)
+        root = _parse(xml_str)
 
         subst = root.find("nfse:infDPS/nfse:subst", NS)
 
@@ -852,10 +708,9 @@ class TestXMLBuilderSubstituicao:
             codigo_motivo=1,
             motivo="Alteração de valor do serviço",
         )
-        builder = XMLBuilder()
 
-        xml_str = builder.build_dps(sample_dps)
-        root = ET.fromstring(xml_str)
+        xml_str = _HOMOLOG_BUILDER.build_dps(sample_dps)
+        root = _parse(xml_str)
 
         cMotivo = root.find("nfse:infDPS/nfse:subst/nfse:cMotivo", NS)
 
@@ -867,20 +722,16 @@ class TestXMLBuilderCancelEvent:
 
     def test_returns_valid_xml(self):
         """build_cancel_event should return parseable XML."""
-        builder = XMLBuilder()
-
-        xml_str = builder.build_cancel_event(SAMPLE_CHAVE, "Erro na emissão")
+        xml_str = _HOMOLOG_BUILDER.build_cancel_event(SAMPLE_CHAVE, "Erro na emissão")
 
         assert xml_str.startswith("<?xml")
-        root = ET.fromstring(xml_str)
+        root = _parse(xml_str)
         assert root.tag == "{http://www.sped.fazenda.gov.br/nfse}pedRegEvento"
 
     def test_infpedreg_has_id(self):
         """infPedReg must have Id attribute for signing."""
-        builder = XMLBuilder()
-
-        xml_str = builder.build_cancel_event(SAMPLE_CHAVE, "Erro na emissão")
-        root = ET.fromstring(xml_str)
+        xml_str = _HOMOLOG_BUILDER.build_cancel_event(SAMPLE_CHAVE, "Erro na emissão")
+        root = _parse(xml_str)
 
         infPedReg = root.find("nfse:infPedReg", NS)
         assert infPedReg is not None
@@ -888,10 +739,8 @@ class TestXMLBuilderCancelEvent:
 
     def test_chNFSe_present(self):
         """chNFSe must contain the access key."""
-        builder = XMLBuilder()
-
-        xml_str = builder.build_cancel_event(SAMPLE_CHAVE, "Erro na emissão")
-        root = ET.fromstring(xml_str)
+        xml_str = _HOMOLOG_BUILDER.build_cancel_event(SAMPLE_CHAVE, "Erro na emissão")
+        root = _parse(xml_str)
 
         chNFSe = root.find("nfse:infPedReg/nfse:chNFSe", NS)
         assert chNFSe is not None
@@ -899,10 +748,8 @@ class TestXMLBuilderCancelEvent:
 
     def test_default_codigo_motivo_is_1(self):
         """cMotivo should default to 1 (erro na emissão)."""
-        builder = XMLBuilder()
-
-        xml_str = builder.build_cancel_event(SAMPLE_CHAVE, "Erro na emissão")
-        root = ET.fromstring(xml_str)
+        xml_str = _HOMOLOG_BUILDER.build_cancel_event(SAMPLE_CHAVE, "Erro na emissão")
+        root = _parse(xml_str)
 
         cMotivo = root.find("nfse:infPedReg/nfse:e101101/nfse:cMotivo", NS)
         assert cMotivo is not None
@@ -910,22 +757,20 @@ class TestXMLBuilderCancelEvent:
 
     def test_custom_codigo_motivo(self):
         """cMotivo should reflect the provided value."""
-        builder = XMLBuilder()
-
-        xml_str = builder.build_cancel_event(
+        xml_str = _HOMOLOG_BUILDER.build_cancel_event(
             SAMPLE_CHAVE, "Duplicidade", codigo_motivo=4
         )
-        root = ET.fromstring(xml_str)
+        root = _parse(xml_str)
 
         cMotivo = root.find("nfse:infPedReg/nfse:e101101/nfse:cMotivo", NS)
         assert cMotivo.text == "4"
 
     def test_xMotivo_present(self):
         """xMotivo must contain the reason text."""
-        builder = XMLBuilder()
-
-        xml_str = builder.build_cancel_event(SAMPLE_CHAVE, "Serviço não prestado")
-        root = ET.fromstring(xml_str)
+        xml_str = _HOMOLOG_BUILDER.build_cancel_event(
+            SAMPLE_CHAVE, "Serviço não prestado"
+        )
+        root = _parse(xml_str)
 
         xMotivo = root.find("nfse:infPedReg/nfse:e101101/nfse:xMotivo", NS)
         assert xMotivo is not None
@@ -933,41 +778,34 @@ class TestXMLBuilderCancelEvent:
 
     def test_xMotivo_truncated_to_255(self):
         """xMotivo must not exceed 255 characters."""
-        builder = XMLBuilder()
         long_reason = "X" * 300
 
-        xml_str = builder.build_cancel_event(SAMPLE_CHAVE, long_reason)
-        root = ET.fromstring(xml_str)
+        xml_str = _HOMOLOG_BUILDER.build_cancel_event(SAMPLE_CHAVE, long_reason)
+        root = _parse(xml_str)
 
         xMotivo = root.find("nfse:infPedReg/nfse:e101101/nfse:xMotivo", NS)
         assert len(xMotivo.text) == 255
 
     def test_tpAmb_homologacao(self):
         """tpAmb should be 2 for homologacao."""
-        builder = XMLBuilder(ambiente=Ambiente.HOMOLOGACAO)
-
-        xml_str = builder.build_cancel_event(SAMPLE_CHAVE, "Motivo")
-        root = ET.fromstring(xml_str)
+        xml_str = _HOMOLOG_BUILDER.build_cancel_event(SAMPLE_CHAVE, "Motivo")
+        root = _parse(xml_str)
 
         tpAmb = root.find("nfse:infPedReg/nfse:tpAmb", NS)
         assert tpAmb.text == "2"
 
     def test_tpAmb_producao(self):
         """tpAmb should be 1 for producao."""
-        builder = XMLBuilder(ambiente=Ambiente.PRODUCAO)
-
-        xml_str = builder.build_cancel_event(SAMPLE_CHAVE, "Motivo")
-        root = ET.fromstring(xml_str)
+        xml_str = _PROD_BUILDER.build_cancel_event(SAMPLE_CHAVE, "Motivo")
+        root = _parse(xml_str)
 
         tpAmb = root.find("nfse:infPedReg/nfse:tpAmb", NS)
         assert tpAmb.text == "1"
 
     def test_e101101_xdesc(self):
         """e101101 must have fixed xDesc."""
-        builder = XMLBuilder()
-
-        xml_str = builder.build_cancel_event(SAMPLE_CHAVE, "Motivo")
-        root = ET.fromstring(xml_str)
+        xml_str = _HOMOLOG_BUILDER.build_cancel_event(SAMPLE_CHAVE, "Motivo")
+        root = _parse(xml_str)
 
         xDesc = root.find("nfse:infPedReg/nfse:e101101/nfse:xDesc", NS)
         assert xDesc is not None
@@ -975,12 +813,10 @@ class TestXMLBuilderCancelEvent:
 
     def test_cnpj_autor_included_when_provided(self):
         """CNPJAutor should appear when cnpj_prestador is given."""
-        builder = XMLBuilder()
-
-        xml_str = builder.build_cancel_event(
+        xml_str = _HOMOLOG_BUILDER.build_cancel_event(
             SAMPLE_CHAVE, "Motivo", cnpj_prestador="27139240000185"
         )
-        root = ET.fromstring(xml_str)
+        root = _parse(xml_str)
 
         cnpj = root.find("nfse:infPedReg/nfse:CNPJAutor", NS)
         assert cnpj is not None
@@ -988,17 +824,13 @@ class TestXMLBuilderCancelEvent:
 
     def test_cnpj_autor_omitted_when_empty(self):
         """CNPJAutor should be omitted when cnpj_prestador is empty."""
-        builder = XMLBuilder()
-
-        xml_str = builder.build_cancel_event(SAMPLE_CHAVE, "Motivo")
-        root = ET.fromstring(xml_str)
+        xml_str = _HOMOLOG_BUILDER.build_cancel_event(SAMPLE_CHAVE, "Motivo")
+        root = _parse(xml_str)
 
         cnpj = root.find("nfse:infPedReg/nfse:CNPJAutor", NS)
         assert cnpj is None
 
     def test_includes_namespace(self):
         """XML must include the NFSe namespace."""
-        builder = XMLBuilder()
-
-        xml_str = builder.build_cancel_event(SAMPLE_CHAVE, "Motivo")
+        xml_str = _HOMOLOG_BUILDER.build_cancel_event(SAMPLE_CHAVE, "Motivo")
         assert "http://www.sped.fazenda.gov.br/nfse" in xml_str
@@ -44,8 +44,10 @@ DS_NS = "http://www.w3.org/2000/09/xmldsig#"
 
 
 @pytest.fixture
-def sample_servico(shared_sample_servico):
-    servico = deepcopy(shared_sample_servico)
+def sample_servico(sample_servico):
+    # Overrides the conftest fixture; it is built fresh per test, so the
+    # fields can be adjusted in place.
+    servico = sample_servico
     servico.codigo_lc116 = "04.03.01"
     servico.codigo_tributacao_municipal = "123"
     servico.discriminacao = "Consulta medica"
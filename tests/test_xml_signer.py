@@ -4,6 +4,8 @@ import base64
 import gzip
 import os
 import tempfile
+import threading
+from datetime import datetime
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -11,11 +13,13 @@ from lxml import etree
 from lxml.etree import XMLParser as RealXMLParser
 
 import tests._cert_credentials as cert_credentials
+from pynfse_nacional.error_codes import ErrorCode
 from pynfse_nacional.exceptions import NFSeCertificateError
 from pynfse_nacional.xml_signer import (
     CRYPTOGRAPHY_AVAILABLE,
     SIGNXML_AVAILABLE,
     XMLSignerService,
+    _find_signed_info,
 )
 
 SAMPLE_XML = """<?xml version='1.0' encoding='utf-8'?>
@@ -157,6 +161,65 @@ class TestXMLSignerServiceLoadCertificate:
 
         assert signer._private_key is mock_key
 
+    @pytest.mark.skipif(not CRYPTOGRAPHY_AVAILABLE, reason="cryptography not installed")
+    def test_load_certificate_shares_parsed_bundle_across_instances(self, tmp_path):
+        """Instances for the same file and password should parse it once."""
+        cert_file = tmp_path / "cert.pfx"
+        cert_file.write_bytes(b"synthetic bundle")
+        loaded = (MagicMock(), MagicMock(), [])
+
+        with patch(
+            "pynfse_nacional.xml_signer.pkcs12.load_key_and_certificates",
+            return_value=loaded,
+        ) as mock_load:
+            first = XMLSignerService(str(cert_file), "secret")
+            second = XMLSignerService(str(cert_file), "secret")
+            first._load_certificate()
+            second._load_certificate()
+
+            assert mock_load.call_count == 1
+            assert second._private_key is loaded[0]
+
+            XMLSignerService(str(cert_file), "other")._load_certificate()
+
+            assert mock_load.call_count == 2
+
+    @pytest.mark.skipif(not CRYPTOGRAPHY_AVAILABLE, reason="cryptography not installed")
+    def test_load_certificate_remembers_rejected_password(self, tmp_path):
+        """A rejected password should fail again without re-deriving keys."""
+        cert_file = tmp_path / "cert.pfx"
+        cert_file.write_bytes(b"synthetic bundle")
+
+        with patch(
+            "pynfse_nacional.xml_signer.pkcs12.load_key_and_certificates",
+            side_effect=ValueError("Invalid password or PKCS12 data"),
+        ) as mock_load:
+            for _ in range(2):
+                with pytest.raises(NFSeCertificateError) as exc_info:
+                    XMLSignerService(str(cert_file), "errada")._load_certificate()
+
+                assert exc_info.value.code == ErrorCode.CERTIFICATE_LOAD_FAILED
+                assert isinstance(exc_info.value.__cause__, ValueError)
+
+            assert mock_load.call_count == 1
+
+    @pytest.mark.skipif(not CRYPTOGRAPHY_AVAILABLE, reason="cryptography not installed")
+    def test_load_certificate_reloads_replaced_file(self, tmp_path):
+        """A replaced certificate file should be parsed again."""
+        cert_file = tmp_path / "cert.pfx"
+        cert_file.write_bytes(b"synthetic bundle")
+        loaded = (MagicMock(), MagicMock(), [])
+
+        with patch(
+            "pynfse_nacional.xml_signer.pkcs12.load_key_and_certificates",
+            return_value=loaded,
+        ) as mock_load:
+            XMLSignerService(str(cert_file), "secret")._load_certificate()
+            cert_file.write_bytes(b"renewed synthetic bundle")
+            XMLSignerService(str(cert_file), "secret")._load_certificate()
+
+            assert mock_load.call_count == 2
+
 
 class TestXMLSignerServiceSign:
     """Tests for sign method."""
@@ -194,7 +257,7 @@ class TestXMLSignerServiceSign:
     @patch("pynfse_nacional.xml_signer.XMLSigner")
     @patch("pynfse_nacional.xml_signer.etree.XMLParser")
     def test_sign_uses_hardened_xml_parser(self, mock_xmlparser, mock_xmlsigner):
-        """sign should parse XML with external entities disabled."""
+        """sign should parse XML with a reused, entity-hardened parser."""
         signer = XMLSignerService(cert_path="/path/to/cert.pfx", cert_password="secret")
         signer._private_key = MagicMock()
         signer._certificate = MagicMock()
@@ -205,37 +268,188 @@ class TestXMLSignerServiceSign:
         mock_signer_instance.sign.return_value = signed_root
         mock_xmlsigner.return_value = mock_signer_instance
 
-        with patch.object(signer, "_load_certificate"):
+        with (
+            patch.object(signer, "_load_certificate"),
+            patch("pynfse_nacional.xml_signer._sign_parser_local", threading.local()),
+        ):
+            signer.sign(SAMPLE_XML)
             signer.sign(SAMPLE_XML)
 
         mock_xmlparser.assert_called_once_with(
             resolve_entities=False,
             no_network=True,
             huge_tree=False,
+            collect_ids=False,
         )
 
+    @pytest.mark.skipif(
+        not (CRYPTOGRAPHY_AVAILABLE and SIGNXML_AVAILABLE),
+        reason="cryptography or signxml not installed",
+    )
+    @patch("pynfse_nacional.xml_signer.XMLSigner")
+    def test_sign_reuses_signxml_signer(self, mock_xmlsigner):
+        """sign should build the signxml signer once per service instance."""
+        signer = XMLSignerService(cert_path="/path/to/cert.pfx", cert_password="secret")
+        signer._private_key = MagicMock()
+        signer._certificate = MagicMock()
+        mock_xmlsigner.return_value.sign.side_effect = lambda root, **kwargs: root
+
+        with patch.object(signer, "_load_certificate"):
+            signer.sign(SAMPLE_XML)
+            signer.sign(SAMPLE_XML)
+
+        mock_xmlsigner.assert_called_once()
+        assert mock_xmlsigner.return_value.sign.call_count == 2
+
+    @pytest.mark.skipif(
+        not (CRYPTOGRAPHY_AVAILABLE and SIGNXML_AVAILABLE),
+        reason="cryptography or signxml not installed",
+    )
+    def test_sign_maps_parse_and_lookup_errors(self):
+        """Malformed XML fails signing; a missing infDPS is an XML error."""
+        signer = XMLSignerService(cert_path="/path/to/cert.pfx", cert_password="secret")
+
+        with patch.object(signer, "_load_certificate"):
+            with pytest.raises(NFSeCertificateError) as exc_info:
+                signer.sign("<DPS><infDPS>")
+
+            assert exc_info.value.code == ErrorCode.CERTIFICATE_SIGN_FAILED
+
+            with pytest.raises(NFSeCertificateError) as exc_info:
+                signer.sign("<DPS/>")
+
+            assert exc_info.value.code == ErrorCode.RESPONSE_INVALID_XML
+
+    @pytest.mark.skipif(
+        not (CRYPTOGRAPHY_AVAILABLE and SIGNXML_AVAILABLE),
+        reason="cryptography or signxml not installed",
+    )
+    def test_sign_rsa_matches_signxml_output(self):
+        """The RSA fast path should produce signxml's exact signature."""
+        from cryptography import x509
+        from cryptography.hazmat.primitives import hashes
+        from cryptography.hazmat.primitives.asymmetric import rsa
+        from cryptography.hazmat.primitives.serialization import Encoding
+        from cryptography.x509.oid import NameOID
+        from signxml import XMLVerifier
+
+        key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "Teste Sintetico")])
+        certificate = (
+            x509.CertificateBuilder()
+            .subject_name(name)
+            .issuer_name(name)
+            .public_key(key.public_key())
+            .serial_number(1)
+            .not_valid_before(datetime(2025, 1, 1))
+            .not_valid_after(datetime(2030, 1, 1))
+            .sign(key, hashes.SHA256())
+        )
+
+        signer = XMLSignerService(cert_path="/path/to/cert.pfx", cert_password="secret")
+        signer._private_key = key
+        signer._certificate = certificate
+
+        signed = signer.sign(SAMPLE_XML)
+        expected = signer._sign_with_signxml(
+            etree.fromstring(SAMPLE_XML.encode("utf-8")),
+            "11222333000181NF0000000001",
+        )
+
+        assert signed == etree.tostring(
+            expected, encoding="utf-8", xml_declaration=True
+        ).decode("utf-8")
+
+        XMLVerifier().verify(
+            signed.encode("utf-8"), x509_cert=certificate.public_bytes(Encoding.PEM)
+        )
+
+    @pytest.mark.skipif(
+        not (CRYPTOGRAPHY_AVAILABLE and SIGNXML_AVAILABLE),
+        reason="cryptography or signxml not installed",
+    )
+    def test_sign_ec_key_uses_ecdsa(self):
+        """EC keys should be signed through signxml with ECDSA-SHA256."""
+        from cryptography import x509
+        from cryptography.hazmat.primitives import hashes
+        from cryptography.hazmat.primitives.asymmetric import ec
+        from cryptography.hazmat.primitives.serialization import Encoding
+        from cryptography.x509.oid import NameOID
+        from signxml import XMLVerifier
+
+        key = ec.generate_private_key(ec.SECP256R1())
+        name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "Teste Sintetico")])
+        certificate = (
+            x509.CertificateBuilder()
+            .subject_name(name)
+            .issuer_name(name)
+            .public_key(key.public_key())
+            .serial_number(1)
+            .not_valid_before(datetime(2025, 1, 1))
+            .not_valid_after(datetime(2030, 1, 1))
+            .sign(key, hashes.SHA256())
+        )
+
+        signer = XMLSignerService(cert_path="/path/to/cert.pfx", cert_password="secret")
+        signer._private_key = key
+        signer._certificate = certificate
+
+        signed = signer.sign(SAMPLE_XML)
+        root = etree.fromstring(signed.encode("utf-8"))
+        method = root.find(".//{http://www.w3.org/2000/09/xmldsig#}SignatureMethod")
+
+        assert method.get("Algorithm").endswith("#ecdsa-sha256")
+
+        XMLVerifier().verify(
+            signed.encode("utf-8"), x509_cert=certificate.public_bytes(Encoding.PEM)
+        )
+
+
+class TestFindSignedInfo:
+    """Tests for locating the element referenced by the signature."""
+
+    def test_finds_inf_dps_as_first_child(self):
+        root = etree.fromstring(SAMPLE_XML.encode("utf-8"))
+
+        assert _find_signed_info(root) is root[0]
+
+    def test_finds_nested_inf_ped_reg(self):
+        root = etree.fromstring(
+            b'<envelope xmlns="http://www.sped.fazenda.gov.br/nfse"><!-- x -->'
+            b'<pedRegEvento><infPedReg Id="PRE1"/></pedRegEvento></envelope>'
+        )
+
+        assert _find_signed_info(root).get("Id") == "PRE1"
+
+    def test_returns_none_without_signed_element(self):
+        root = etree.fromstring(b"<DPS><outro/></DPS>")
+
+        assert _find_signed_info(root) is None
+
 
 class TestXMLSignerServiceSignAndEncode:
     """Tests for sign_and_encode method."""
 
-    def test_sign_and_encode_calls_sign(self):
-        """sign_and_encode should call sign method."""
+    def test_sign_and_encode_calls_sign_bytes(self):
+        """sign_and_encode should sign the UTF-8 encoded XML."""
         signer = XMLSignerService(cert_path="/path/to/cert.pfx", cert_password="secret")
 
-        signed_xml = "<signed>content</signed>"
+        signed_xml = b"<signed>content</signed>"
 
-        with patch.object(signer, "sign", return_value=signed_xml) as mock_sign:
+        with patch.object(
+            signer, "sign_bytes", return_value=signed_xml
+        ) as mock_sign_bytes:
             signer.sign_and_encode(SAMPLE_XML)
 
-            mock_sign.assert_called_once_with(SAMPLE_XML)
+            mock_sign_bytes.assert_called_once_with(SAMPLE_XML.encode("utf-8"))
 
     def test_sign_and_encode_compresses_result(self):
         """sign_and_encode should compress and encode the signed XML."""
         signer = XMLSignerService(cert_path="/path/to/cert.pfx", cert_password="secret")
 
-        signed_xml = "<signed>content</signed>"
+        signed_xml = "<signed>conteúdo</signed>"
 
-        with patch.object(signer, "sign", return_value=signed_xml):
+        with patch.object(signer, "sign_bytes", return_value=signed_xml.encode()):
             result = signer.sign_and_encode(SAMPLE_XML)
 
             decoded = base64.b64decode(result)
@@ -247,11 +461,52 @@ class TestXMLSignerServiceSignAndEncode:
         """sign_and_encode should return a string."""
         signer = XMLSignerService(cert_path="/path/to/cert.pfx", cert_password="secret")
 
-        with patch.object(signer, "sign", return_value="<signed/>"):
+        with patch.object(signer, "sign_bytes", return_value=b"<signed/>"):
             result = signer.sign_and_encode(SAMPLE_XML)
 
             assert isinstance(result, str)
 
+    def test_sign_batch_keeps_order(self):
+        """sign_batch should load the certificate once and keep input order."""
+        signer = XMLSignerService(cert_path="/path/to/cert.pfx", cert_password="secret")
+
+        with (
+            patch.object(signer, "_load_certificate") as mock_load,
+            patch.object(
+                signer, "_sign_loaded", side_effect=lambda xml: b"<s>" + xml + b"</s>"
+            ) as mock_sign,
+        ):
+            result = signer.sign_batch(["<a/>", "<ç/>"])
+
+        assert result == ["<s><a/></s>", "<s><ç/></s>"]
+        mock_load.assert_called_once()
+        assert mock_sign.call_count == 2
+
+    def test_sign_batch_raises_without_signxml(self):
+        """sign_batch should fail before signing anything without signxml."""
+        signer = XMLSignerService(cert_path="/path/to/cert.pfx", cert_password="secret")
+
+        with (
+            patch("pynfse_nacional.xml_signer.SIGNXML_AVAILABLE", False),
+            patch.object(signer, "_sign_loaded") as mock_sign,
+        ):
+            with pytest.raises(NFSeCertificateError) as exc_info:
+                signer.sign_batch([SAMPLE_XML])
+
+        assert exc_info.value.code == ErrorCode.CERTIFICATE_DEPENDENCY_MISSING
+        mock_sign.assert_not_called()
+
+    def test_sign_wraps_sign_bytes(self):
+        """sign should encode its input and decode the signed bytes."""
+        signer = XMLSignerService(cert_path="/path/to/cert.pfx", cert_password="secret")
+
+        with patch.object(
+            signer, "sign_bytes", return_value="<signed>ç</signed>".encode()
+        ) as mock_sign_bytes:
+            assert signer.sign(SAMPLE_XML) == "<signed>ç</signed>"
+
+        mock_sign_bytes.assert_called_once_with(SAMPLE_XML.encode("utf-8"))
+
 
 class TestXMLSignerServiceIntegration:
     """Integration tests for XMLSignerService with real certificate (if available)."""